@@ -0,0 +1,111 @@
+# src/services/content_router.py
+"""
+内容提取路由
+
+将现有的几种提取方式注册为 URLRouter 后端：调用方只需传入链接，路由按链接类型选择当前
+成功率最高、耗时最短的后端，失败时自动换下一个。后端依赖的模块按需导入，未安装的依赖
+（Spider_XHS、TikTokDownloader、yt-dlp）只会让对应后端不可用，不影响其他后端。
+"""
+import json
+import importlib.util
+from pathlib import Path
+from typing import Any, Optional
+
+from loguru import logger
+
+from src.utils.url_router import (
+    DOUYIN_SHORT,
+    DOUYIN_USER,
+    DOUYIN_VIDEO,
+    TIKTOK,
+    XHS_NOTE,
+    XHS_SHORT,
+    URLRouter,
+)
+
+BASE_DIR = Path(__file__).parent.parent
+DOUYIN_KINDS = (DOUYIN_VIDEO, DOUYIN_SHORT, TIKTOK)
+
+
+def _load_extractor_module():
+    """xhs_service-1.py 的文件名不能直接导入，按文件路径加载"""
+    spec = importlib.util.spec_from_file_location("xhs_content_extractor", BASE_DIR / "services" / "xhs_service-1.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _register_optional(router: URLRouter, name: str, factory, kinds):
+    """factory 返回后端函数，导入失败时跳过该后端"""
+    try:
+        router.register(name, factory(), kinds)
+    except ImportError as e:
+        logger.warning(f"后端 {name} 不可用: {e}")
+
+
+def build_content_router(
+    xhs_service=None,
+    xhs_downloader=None,
+    tiktok_service=None,
+    yt_dlp_cookies: Optional[str] = None,
+    use_yt_dlp: bool = True,
+    **router_kwargs: Any,
+) -> URLRouter:
+    """
+    创建注册了全部提取后端的路由
+
+    后端的注册顺序即尚无统计数据时的试用顺序：专用接口在前，页面解析其次，yt-dlp 兜底。
+
+    Args:
+        xhs_service: XHSService 或 AsyncXHSService 实例，None 表示不使用接口提取
+        xhs_downloader: XHSDownloader 实例，None 表示不使用
+        tiktok_service: 提供 async get_video_info(url) 的实例（如 tk_329 的 TikTokService），
+            None 表示使用 tiktok_service 模块的共享下载器
+        yt_dlp_cookies: yt-dlp 使用的 cookies 文件
+        use_yt_dlp: 是否注册 yt-dlp 后端
+        **router_kwargs: 传给 URLRouter 的参数
+
+    Returns:
+        URLRouter 实例，通过 ``await router.route(url)`` 提取内容
+    """
+    router = URLRouter(**router_kwargs)
+
+    # 小红书
+    if xhs_service is not None:
+        router.register("xhs_service", xhs_service.get_note_info, (XHS_NOTE,))
+    _register_optional(
+        router, "xhs_extractor", lambda: _load_extractor_module().XHSContentExtractor.extract_content,
+        (XHS_NOTE, XHS_SHORT),
+    )
+    if xhs_downloader is not None:
+        router.register("xhs_downloader", xhs_downloader.extract_note_info, (XHS_NOTE, XHS_SHORT))
+
+    # 抖音 / TikTok
+    if tiktok_service is not None:
+        router.register("tiktok_service", tiktok_service.get_video_info, DOUYIN_KINDS)
+    else:
+        def tiktok_extractor():
+            from src.services.tiktok_service import TikTokContentExtractor
+            return TikTokContentExtractor.extract_video_info
+        _register_optional(router, "tiktok_service", tiktok_extractor, DOUYIN_KINDS)
+
+    if use_yt_dlp:
+        def yt_dlp_douyin():
+            from src.tests.yt_test_dy import extract_douyin_info
+            return lambda url: extract_douyin_info(url, yt_dlp_cookies)
+
+        def yt_dlp_xhs():
+            from src.tests.yt_test_xhs import get_xhs_stats
+
+            def extract(url):
+                # get_xhs_stats 成功时返回 JSON 文本，失败时返回错误说明
+                text = get_xhs_stats(url, yt_dlp_cookies or "cookies.txt")
+                try:
+                    return json.loads(text)
+                except json.JSONDecodeError:
+                    return False, text, None
+            return extract
+
+        _register_optional(router, "yt_dlp_douyin", yt_dlp_douyin, DOUYIN_KINDS + (DOUYIN_USER,))
+        _register_optional(router, "yt_dlp_xhs", yt_dlp_xhs, (XHS_NOTE, XHS_SHORT))
+    return router
@@ -0,0 +1,185 @@
+# src/services/jobs.py
+"""
+耗时任务的处理函数
+
+视频下载、媒体打包与语音转写耗时数十秒，不适合在同步接口中等待：调用方提交任务后拿到任务ID，
+再通过 JobQueue.get 轮询或 JobQueue.watch 跟踪状态。各处理函数的依赖按需导入，
+未安装的依赖只影响对应任务类型。
+
+用法::
+
+    async with JobQueue("jobs.db") as queue:
+        runner = build_job_runner(queue, tiktok_service=SyncTikTokService())
+        async with runner:
+            job_id = await queue.enqueue(TIKTOK_DOWNLOAD, {"url": url}, priority=10)
+            async for job in queue.watch(job_id):
+                print(job.status, job.progress)
+"""
+import os
+import asyncio
+import threading
+from typing import Any, Dict, Optional
+
+from src.utils.exceptions import ContentNotFoundError
+from src.utils.job_queue import JobContext, JobQueue, JobRunner
+from src.utils.tiktok_exceptions import VideoNotFoundError
+
+# 任务类型
+TIKTOK_DOWNLOAD = "tiktok_download"
+XHS_MEDIA = "xhs_media"
+TRANSCRIBE = "transcribe"
+
+
+class TikTokDownloadHandler:
+    """
+    下载抖音视频
+
+    payload: {"url": 视频链接, "save_path": 保存目录（可选）, "connections": 并发连接数（可选）}
+
+    通过 tk_329 的 SyncTikTokService.download_video 下载（多连接分段、断点续传）。tk_329 依赖
+    TikTokDownloader 自身的 src 包，无法在本项目的包内导入，因此服务实例由调用方在独立的
+    导入环境中创建后传入；下载在服务的后台事件循环中执行，这里只等待其结果。
+    """
+
+    def __init__(self, service):
+        """
+        :param service: tk_329 的 SyncTikTokService 实例
+        """
+        self.service = service
+
+    async def __call__(self, payload: Dict[str, Any], context: JobContext) -> Dict[str, Any]:
+        future = self.service.submit_download(
+            payload["url"], payload.get("save_path", "./downloads"), payload.get("connections", 4),
+        )
+        path = await asyncio.wrap_future(future)
+        if not path:
+            raise VideoNotFoundError(payload["url"])
+        return {"path": path}
+
+
+class XHSMediaHandler:
+    """
+    下载小红书笔记的全部图片与视频
+
+    payload: {"url": 笔记链接, "save_path": 保存目录（可选）, "max_concurrent": 并发数（可选）}
+
+    同一执行器中的任务共用一个 XHSDownloader，连接池与媒体存储在任务间复用。
+    """
+
+    def __init__(self, downloader=None):
+        """
+        :param downloader: XHSDownloader 实例，None 表示首次执行时创建
+        """
+        self.downloader = downloader
+
+    async def __call__(self, payload: Dict[str, Any], context: JobContext) -> Dict[str, Any]:
+        if self.downloader is None:
+            from src.tests.xhs_downloader import XHSDownloader
+            self.downloader = XHSDownloader()
+
+        note_info = await self.downloader.extract_note_info(payload["url"])
+        if not note_info:
+            raise ContentNotFoundError(payload["url"])
+        await context.progress(0.1)
+        media = await self.downloader.download_note_media(
+            note_info,
+            payload.get("save_path", "./downloads"),
+            payload.get("max_concurrent", 5),
+        )
+        return {"note_id": note_info.get("id"), "media": media}
+
+    async def aclose(self):
+        if self.downloader is not None:
+            await self.downloader.aclose()
+
+
+class TranscribeHandler:
+    """
+    使用 faster-whisper 转写音频/视频
+
+    payload: {"path": 文件路径, "language": 语言（可选，默认自动识别）}
+
+    模型在首次执行时加载并在任务间复用；转写在线程中执行，不阻塞事件循环。
+    """
+
+    def __init__(self, model_size: str = "base", device: str = "cpu", compute_type: str = "float32",
+                 cpu_threads: int = 0):
+        """
+        :param model_size: 模型大小，如 tiny、base、small
+        :param device: cpu 或 cuda
+        :param compute_type: 计算精度，CPU 上 float32 最稳定
+        :param cpu_threads: CPU 线程数，0 表示由 CTranslate2 决定
+        """
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self._model = None
+        self._model_lock = threading.Lock()
+
+    def _get_model(self):
+        with self._model_lock:
+            if self._model is None:
+                from faster_whisper import WhisperModel
+                self._model = WhisperModel(
+                    self.model_size, device=self.device, compute_type=self.compute_type,
+                    cpu_threads=self.cpu_threads,
+                )
+            return self._model
+
+    def _transcribe(self, path: str, language: Optional[str], report) -> Dict[str, Any]:
+        segments, info = self._get_model().transcribe(path, language=language)
+        result = []
+        # segments 为生成器，迭代时才真正转写
+        for segment in segments:
+            result.append({"start": segment.start, "end": segment.end, "text": segment.text})
+            if info.duration:
+                report(min(segment.end / info.duration, 0.99))
+        return {
+            "language": info.language,
+            "language_probability": info.language_probability,
+            "duration": info.duration,
+            "text": "".join(segment["text"] for segment in result).strip(),
+            "segments": result,
+        }
+
+    async def __call__(self, payload: Dict[str, Any], context: JobContext) -> Dict[str, Any]:
+        path = payload["path"]
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        loop = asyncio.get_running_loop()
+
+        def report(progress):
+            asyncio.run_coroutine_threadsafe(context.progress(round(progress, 3)), loop)
+
+        return await asyncio.to_thread(self._transcribe, path, payload.get("language"), report)
+
+
+def build_job_runner(
+    queue: JobQueue,
+    download_concurrency: int = 4,
+    media_concurrency: int = 4,
+    transcribe_concurrency: int = 1,
+    xhs_downloader=None,
+    tiktok_service=None,
+    whisper_options: Optional[Dict[str, Any]] = None,
+) -> JobRunner:
+    """
+    创建注册了下载、媒体打包与转写任务的执行器
+
+    :param queue: 任务队列
+    :param download_concurrency: 视频下载的并发数
+    :param media_concurrency: 小红书媒体下载的并发数
+    :param transcribe_concurrency: 转写的并发数，CPU 转写建议为 1
+    :param xhs_downloader: 可选的 XHSDownloader 实例
+    :param tiktok_service: tk_329 的 SyncTikTokService 实例，None 表示不注册视频下载任务
+    :param whisper_options: 传给 TranscribeHandler 的参数
+    """
+    runner = JobRunner(queue, permanent_errors=(ValueError, FileNotFoundError, ContentNotFoundError, VideoNotFoundError))
+    if tiktok_service is not None:
+        runner.register(TIKTOK_DOWNLOAD, TikTokDownloadHandler(tiktok_service), download_concurrency,
+                        visibility_timeout=300.0)
+    runner.register(XHS_MEDIA, XHSMediaHandler(xhs_downloader), media_concurrency, visibility_timeout=300.0)
+    runner.register(TRANSCRIBE, TranscribeHandler(**(whisper_options or {})), transcribe_concurrency,
+                    visibility_timeout=900.0)
+    return runner
@@ -1,6 +1,8 @@
 import os
 import sys
 import asyncio
+import threading
+from concurrent.futures import Future
 from typing import Optional, Dict, Any
 from pathlib import Path
 
@@ -11,14 +13,27 @@ TK_DOWN_PATH = BASE_DIR / "libs" / "tiktok_downloader"
 sys.path.append(str(TK_DOWN_PATH))
 
 
+from src.utils.loop_thread import get_background_loop
 from src.utils.tiktok_exceptions import TikTokDownloadError
 from TikTokDownloader import TikTokDownloader  # 假设的导入路径
 
 
 
 class TikTokContentExtractor:
-    @staticmethod
-    async def extract_video_info(url: str) -> Optional[Dict[str, Any]]:
+    # 进程内复用的下载器实例
+    _downloader = None
+    _downloader_lock = threading.Lock()
+
+    @classmethod
+    def get_downloader(cls) -> "TikTokDownloader":
+        """获取共享的 TikTokDownloader，首次调用时创建"""
+        with cls._downloader_lock:
+            if cls._downloader is None:
+                cls._downloader = TikTokDownloader()
+            return cls._downloader
+
+    @classmethod
+    async def extract_video_info(cls, url: str) -> Optional[Dict[str, Any]]:
         """
         异步提取 TikTok 视频信息
         
@@ -26,9 +41,10 @@ class TikTokContentExtractor:
         :return: 视频详细信息字典
         """
         try:
-            # 使用 TikTokDownloader 的同步方法
-            downloader = TikTokDownloader()
-            video_info = downloader.get_video_info(url)
+            # TikTokDownloader 的方法是同步阻塞的，放到线程中执行，
+            # 避免阻塞共享后台事件循环，submit_extract 提交的任务才能真正并发
+            downloader = cls.get_downloader()
+            video_info = await asyncio.to_thread(downloader.get_video_info, url)
             
             return {
                 '视频ID': video_info.get('video_id', ''),
@@ -46,14 +62,21 @@ class TikTokContentExtractor:
             raise TikTokDownloadError(f"提取 TikTok 视频信息失败: {e}")
 
     @classmethod
-    def sync_extract(cls, url: str) -> Optional[Dict[str, Any]]:
+    def sync_extract(cls, url: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
-        同步提取方法
+        同步提取方法，在共享的后台事件循环中执行
         """
-        return asyncio.run(cls.extract_video_info(url))
+        return get_background_loop().run(cls.extract_video_info(url), timeout)
 
-    @staticmethod
-    async def download_video(url: str, save_path: str = './downloads') -> str:
+    @classmethod
+    def submit_extract(cls, url: str) -> Future:
+        """
+        提交提取任务，立即返回 Future，可用于同步代码中的并发提取（阻塞调用在线程池中执行）
+        """
+        return get_background_loop().submit(cls.extract_video_info(url))
+
+    @classmethod
+    async def download_video(cls, url: str, save_path: str = './downloads') -> str:
         """
         异步下载 TikTok 视频
         
@@ -62,8 +85,8 @@ class TikTokContentExtractor:
         :return: 下载后的文件路径
         """
         try:
-            downloader = TikTokDownloader()
-            return downloader.download_video(url, save_path)
+            downloader = cls.get_downloader()
+            return await asyncio.to_thread(downloader.download_video, url, save_path)
         
         except Exception as e:
             raise TikTokDownloadError(f"下载 TikTok 视频失败: {e}")
@@ -73,4 +96,4 @@ def extract_tiktok_content(url: str) -> Optional[Dict[str, Any]]:
     return TikTokContentExtractor.sync_extract(url)
 
 def download_tiktok_video(url: str, save_path: str = './downloads') -> str:
-    return TikTokContentExtractor.download_video(url, save_path)
\ No newline at end of file
+    return get_background_loop().run(TikTokContentExtractor.download_video(url, save_path))
\ No newline at end of file
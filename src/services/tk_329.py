@@ -1,8 +1,13 @@
 import asyncio
+import importlib.util
 import sys
 import os
+import time
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Dict, Any, Optional, Union, List
+
+import httpx
+from typing import Dict, Any, Iterable, Optional, Tuple, Union, List
 
 # 获取项目根目录路径
 current_dir = Path(__file__).resolve().parent
@@ -22,7 +27,7 @@ from src.config import Settings, Parameter
 from src.custom import PROJECT_ROOT
 from src.tools import ColorfulConsole
 from src.module import Cookie
-from src.interface import Detail, User
+from src.interface import Account, Detail, User
 from src.link import Extractor
 from src.extract import Extractor as DataExtractor
 from src.record import BaseLogger
@@ -44,29 +49,126 @@ class DummyRecorder:
 os.chdir(original_dir)
 
 
+def _load_project_module(name: str, relative_path: str):
+    """
+    按文件路径加载本项目的工具模块
+
+    本模块中的 src 包指向 TikTokDownloader，无法再通过 src.utils 导入项目自身的工具，
+    被加载的模块只能依赖第三方库，不能再导入 src 下的其他模块。
+
+    同一文件只加载一次：已导入的副本（无论以何种名称导入）直接复用，新加载的模块登记到
+    sys.modules，异常类与进程内共享的状态（如熔断器注册表）因此只有一份。
+    """
+    path = (project_root / relative_path).resolve()
+    for module in list(sys.modules.values()):
+        module_file = getattr(module, "__file__", None)
+        if module_file and Path(module_file).resolve() == path:
+            return module
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(name, None)
+        raise
+    return module
+
+
+stream_download = _load_project_module("hot_seahorse_stream_download", "src/utils/stream_download.py")
+tk_incremental = _load_project_module("hot_seahorse_tk_incremental", "src/services/tk_incremental.py")
+tk_recorder = _load_project_module("hot_seahorse_tk_recorder", "src/services/tk_recorder.py")
+SQLiteRecorder = tk_recorder.SQLiteRecorder
+loop_thread = _load_project_module("hot_seahorse_loop_thread", "src/utils/loop_thread.py")
+hedge = _load_project_module("hot_seahorse_hedge", "src/utils/hedge.py")
+singleflight = _load_project_module("hot_seahorse_singleflight", "src/utils/singleflight.py")
+circuit_breaker = _load_project_module("hot_seahorse_circuit_breaker", "src/utils/circuit_breaker.py")
+tiktok_exceptions = _load_project_module("hot_seahorse_tiktok_exceptions", "src/utils/tiktok_exceptions.py")
+TikTokCircuitOpenError = tiktok_exceptions.TikTokCircuitOpenError
+tk_link_cache = _load_project_module("hot_seahorse_tk_link_cache", "src/services/tk_link_cache.py")
+normalize_share_url = tk_link_cache.normalize_share_url
+LinkResolutionCache = tk_link_cache.LinkResolutionCache
+tk_profile_cache = _load_project_module("hot_seahorse_tk_profile_cache", "src/services/tk_profile_cache.py")
+ProfileCache = tk_profile_cache.ProfileCache
+tk_session_pool = _load_project_module("hot_seahorse_tk_session_pool", "src/services/tk_session_pool.py")
+SessionPool = tk_session_pool.SessionPool
+tk_batch = _load_project_module("hot_seahorse_tk_batch", "src/services/tk_batch.py")
+
+# 熔断器名称
+PLATFORM = "douyin"
+
+
+# 进程内共享的链接解析缓存
+shared_link_cache = LinkResolutionCache()
+
+
+# 进程内共享的用户资料缓存
+shared_profile_cache = ProfileCache()
+
+# 进程内共享的视频详情请求合并，stats 中的 coalesced 为被合并的请求数
+shared_video_flights = singleflight.AsyncSingleFlight()
+
+
 class TikTokService:
     """
     TikTokDownloader服务类，提供简化的API来获取抖音视频详细信息
     不使用数据库功能，适用于直接运行测试
     """
     
-    def __init__(self, cookie: Optional[str] = None):
+    def __init__(
+        self,
+        cookie: Optional[str] = None,
+        proxy_pool=None,
+        link_cache: Optional[LinkResolutionCache] = None,
+        recorder=None,
+        profile_cache: Optional[ProfileCache] = None,
+        flights=None,
+        breakers=None,
+    ):
         """
         初始化TikTokService
         
         Args:
             cookie: 抖音cookie字符串，可选
+            proxy_pool: 可选的代理池（src.utils.proxy_pool.ProxyPool），
+                Parameter 在初始化时创建客户端，因此每个会话固定使用进入时选出的代理
+            link_cache: 链接解析缓存，默认使用进程内共享的缓存
+            recorder: 可选的记录器（如 SQLiteRecorder），保存每条处理后的数据；
+                不提供时使用 DummyRecorder，不保存任何记录
+            profile_cache: 用户资料缓存，默认使用进程内共享的缓存
+            flights: 合并同一视频并发请求的 AsyncSingleFlight，默认使用进程内共享的实例，
+                会话池中的所有会话因此共同合并请求
+            breakers: 熔断器注册表，默认使用进程内共享的注册表；详情接口失败或超时过多时熔断，
+                熔断期间 get_video_info 与 get_user_info 直接抛出 TikTokCircuitOpenError
         """
         self.console = ColorfulConsole()
         self.settings = Settings(PROJECT_ROOT, self.console)
         self.cookie_object = Cookie(self.settings, self.console)
         self.parameters = None
         self.cookie = cookie
+        self.proxy_pool = proxy_pool
+        self.proxy = None
+        self.last_refresh = 0.0
+        self._download_client = None
+        self.recorder = recorder
+        # 由会话池创建时指向所属会话池，后台刷新从中借用会话
+        self.session_pool = None
+        self.profile_cache = profile_cache if profile_cache is not None else shared_profile_cache
+        self.link_cache = link_cache if link_cache is not None else shared_link_cache
+        self.flights = flights if flights is not None else shared_video_flights
+        self.breakers = breakers if breakers is not None else circuit_breaker.shared_breakers
+        self.breaker = self.breakers.get(PLATFORM, error_factory=TikTokCircuitOpenError)
         
     async def __aenter__(self):
         """
         异步上下文管理器入口，初始化参数
         """
+        return await self.open()
+
+    async def open(self) -> "TikTokService":
+        """
+        初始化参数并创建客户端，供会话池在 async with 之外长期持有
+        """
         # 获取设置
         settings_data = self.settings.read()
         
@@ -74,6 +176,14 @@ class TikTokService:
         if self.cookie:
             cookie_dict = self.cookie_object.extract(self.cookie, write=False)
             settings_data["cookie"] = cookie_dict
+
+        # 从代理池选择当前最快的代理，未配置代理池时沿用设置文件中的代理
+        if self.proxy_pool is not None:
+            self.proxy = self.proxy_pool.pick()
+            settings_data["proxy"] = self.proxy
+        else:
+            proxy = settings_data.get("proxy")
+            self.proxy = proxy if isinstance(proxy, str) and proxy else None
         
         # 初始化参数
         self.parameters = Parameter(
@@ -87,22 +197,73 @@ class TikTokService:
         
         # 设置headers和cookie
         self.parameters.set_headers_cookie()
+        self.last_refresh = time.monotonic()
         
         return self
+
+    def refresh(self, cookie: Optional[str] = None):
+        """
+        原地刷新cookie和请求头，不重建 Parameter 与客户端
+
+        Args:
+            cookie: 新的cookie字符串，不提供时重新应用当前cookie
+        """
+        if not self.parameters:
+            raise RuntimeError("服务未正确初始化，请先调用 open")
+        if cookie is not None:
+            self.cookie = cookie
+        if self.cookie:
+            cookie_dict = self.cookie_object.extract(self.cookie, write=False)
+            # 不同版本的 Parameter 使用的字段名不同，只更新实际存在的字段
+            for name in ("cookie", "cookie_dict"):
+                if hasattr(self.parameters, name):
+                    setattr(self.parameters, name, cookie_dict)
+        self.parameters.set_headers_cookie()
+        self.last_refresh = time.monotonic()
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """
         异步上下文管理器退出，关闭客户端
         """
+        await self.close()
+
+    async def close(self):
+        """关闭客户端"""
+        if self._download_client is not None:
+            await self._download_client.aclose()
+            self._download_client = None
         if self.parameters:
             await self.parameters.close_client()
+            self.parameters = None
+
+    def _get_recorder(self):
+        """未配置记录器时使用伪记录器，避免 DataExtractor 中的 NoneType 错误"""
+        return self.recorder if self.recorder is not None else DummyRecorder()
+
+    async def _resolve_ids(self, extractor, url: str, type_: str = "detail") -> List[str]:
+        """通过链接解析缓存提取作品ID或sec_user_id，解析异常不写入缓存"""
+        ids = self.link_cache.get(url, type_)
+        if ids is None:
+            ids = await extractor.run(url, type_=type_) or []
+            self.link_cache.set(url, ids, type_)
+        return ids
+
+    def breaker_stats(self) -> Dict[str, Any]:
+        """抖音平台熔断器状态，用于监控"""
+        return self.breaker.snapshot()
+
+    def _record_proxy(self, success: bool, start: float):
+        """向代理池上报本次请求的结果与耗时"""
+        if self.proxy_pool is not None and self.proxy:
+            self.proxy_pool.record(self.proxy, success, time.monotonic() - start if success else None)
     
-    async def get_video_info(self, url: str) -> Optional[Dict[str, Any]]:
+    async def get_video_info(self, url: str, coalesce: bool = True) -> Optional[Dict[str, Any]]:
         """
         获取抖音视频的详细信息
         
         Args:
             url: 抖音视频链接
+            coalesce: 是否与同一视频进行中的请求合并；对冲请求需要绕过合并
             
         Returns:
             包含视频详细信息的字典，如果获取失败则返回None
@@ -113,7 +274,7 @@ class TikTokService:
         try:
             # 提取视频ID
             extractor = Extractor(self.parameters)
-            video_ids = await extractor.run(url)
+            video_ids = await self._resolve_ids(extractor, url)
             
             if not video_ids:
                 self.console.warning(f"无法从链接提取视频ID: {url}")
@@ -122,48 +283,145 @@ class TikTokService:
             video_id = video_ids[0]
             self.console.info(f"成功提取视频ID: {video_id}")
             
+            if not coalesce:
+                return await self._fetch_video_info(video_id)
+            # 同一视频的并发请求合并为一次上游请求
+            return await self.flights.do(f"video:{video_id}", lambda: self._fetch_video_info(video_id))
+            
+        except TikTokCircuitOpenError:
+            raise
+        except Exception as e:
+            self.console.error(f"获取视频信息时发生异常: {str(e)}")
+            return None
+
+    async def _fetch_video_info(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """请求视频详情并处理数据，不经过请求合并"""
+        start = time.monotonic()
+        video_data = None
+        try:
             # 获取视频详情
             detail = Detail(
                 self.parameters,
                 detail_id=video_id
             )
             
-            video_data = await detail.run()
+            with self.breaker.guard() as guard:
+                video_data = await detail.run()
+                if not video_data:
+                    guard.fail()
+            self._record_proxy(bool(video_data), start)
             if not video_data:
                 self.console.warning(f"无法获取视频ID为 {video_id} 的详细信息")
                 return None
             
             # 处理获取到的数据
             data_extractor = DataExtractor(self.parameters)
-            # 使用伪记录器代替None
-            dummy_recorder = DummyRecorder()
             processed_data = await data_extractor.run(
                 [video_data], 
-                dummy_recorder,  # 使用伪记录器
+                self._get_recorder(),
                 tiktok=False
             )
             
             return processed_data[0] if processed_data else None
+        except TikTokCircuitOpenError:
+            raise
+        except Exception:
+            if not video_data:
+                self._record_proxy(False, start)
+            raise
             
-        except Exception as e:
-            self.console.error(f"获取视频信息时发生异常: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return None
-            
-    async def get_user_info(self, sec_user_id: str) -> Optional[Dict[str, Any]]:
+    async def get_video_info_batch(
+        self,
+        urls: Iterable[str],
+        concurrency: int = 8,
+    ) -> List[Tuple[str, bool, str, Optional[Dict[str, Any]]]]:
+        """
+        批量获取抖音视频的详细信息
+
+        先并发解析全部链接得到作品ID并去重，再以有限并发获取详情，
+        最后对所有详情只调用一次 DataExtractor.run，参见 tk_batch.run_video_batch。
+
+        Args:
+            urls: 抖音视频链接
+            concurrency: 链接解析与详情请求的最大并发数
+
+        Returns:
+            与输入顺序一致的 (url, success, msg, video_info) 列表，重复链接共享同一次请求
+        """
+        if not self.parameters:
+            raise RuntimeError("服务未正确初始化，请使用async with语句")
+
+        extractor = Extractor(self.parameters)
+
+        async def resolve(url):
+            try:
+                video_ids = await self._resolve_ids(extractor, url)
+                return video_ids[0] if video_ids else None
+            except Exception as e:
+                self.console.warning(f"解析链接失败 {url}: {e}")
+                return None
+
+        async def fetch(video_id):
+            start = time.monotonic()
+            try:
+                with self.breaker.guard() as guard:
+                    video_data = await Detail(self.parameters, detail_id=video_id).run()
+                    if not video_data:
+                        guard.fail()
+            except TikTokCircuitOpenError as e:
+                self.console.warning(f"跳过视频ID为 {video_id} 的详情请求: {e}")
+                return None
+            except Exception as e:
+                self.console.warning(f"获取视频ID为 {video_id} 的详情失败: {e}")
+                video_data = None
+            self._record_proxy(bool(video_data), start)
+            return video_data
+
+        async def process(fetched):
+            try:
+                items = await DataExtractor(self.parameters).run(fetched, self._get_recorder(), tiktok=False)
+                return {str(item.get("id")): item for item in items or []}
+            except Exception as e:
+                self.console.error(f"处理视频详情时发生异常: {str(e)}")
+                return {}
+
+        return await tk_batch.run_video_batch(urls, resolve, fetch, process, concurrency)
+
+    async def get_user_info(self, sec_user_id: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """
         获取抖音用户的详细信息
         
         Args:
             sec_user_id: 抖音用户的sec_user_id
+            use_cache: 是否使用用户资料缓存，过期不久的资料会先返回旧值并在后台刷新
             
         Returns:
             包含用户详细信息的字典，如果获取失败则返回None
         """
+        if not self.parameters:
+            raise RuntimeError("服务未正确初始化，请使用async with语句")
+        if not use_cache:
+            return await self._fetch_user_info(sec_user_id)
+
+        async def refresh():
+            # 后台刷新时本会话可能已归还甚至关闭，另外借用一个会话
+            pool = self.session_pool
+            if pool is None or pool.closed:
+                pool = get_session_pool()
+            async with pool.session(self.cookie) as service:
+                return await service._fetch_user_info(sec_user_id)
+
+        return await self.profile_cache.get_or_fetch(
+            sec_user_id, lambda: self._fetch_user_info(sec_user_id), refresh,
+        )
+
+    async def _fetch_user_info(self, sec_user_id: str) -> Optional[Dict[str, Any]]:
+        """请求用户详情并处理，不经过缓存"""
         if not self.parameters:
             raise RuntimeError("服务未正确初始化，请使用async with语句")
         
+        start = time.monotonic()
+        user_data = None
         try:
             # 获取用户详情
             user = User(
@@ -171,56 +429,303 @@ class TikTokService:
                 sec_user_id=sec_user_id
             )
             
-            user_data = await user.run()
+            with self.breaker.guard() as guard:
+                user_data = await user.run()
+                if not user_data:
+                    guard.fail()
+            self._record_proxy(bool(user_data), start)
             if not user_data:
                 self.console.warning(f"无法获取用户ID为 {sec_user_id} 的详细信息")
                 return None
                 
-            # 使用伪记录器代替None
-            dummy_recorder = DummyRecorder()
             data_extractor = DataExtractor(self.parameters)
+            # 记录器的字段按作品数据定义，用户数据不写入
             processed_data = await data_extractor.run(
                 [user_data], 
-                dummy_recorder,
+                DummyRecorder(),
                 type_="user"
             )
             
             return processed_data[0] if processed_data else None
             
+        except TikTokCircuitOpenError:
+            raise
         except Exception as e:
+            if not user_data:
+                self._record_proxy(False, start)
             self.console.error(f"获取用户信息时发生异常: {str(e)}")
-            import traceback
-            traceback.print_exc()
             return None
     
-    async def download_video(self, url: str, output_path: Optional[str] = None) -> Optional[str]:
+    def _get_download_client(self, connections: int):
+        """获取下载用的共享客户端，与 Parameter 使用相同的请求头和代理"""
+        if self._download_client is None or self._download_client.is_closed:
+            self._download_client = httpx.AsyncClient(
+                headers=dict(getattr(self.parameters, "headers", None) or {}),
+                proxy=self.proxy,
+                timeout=httpx.Timeout(30.0, connect=10.0),
+                limits=httpx.Limits(max_connections=max(connections, 4) * 2),
+                follow_redirects=True,
+            )
+        return self._download_client
+
+    def _progress_printer(self, filename: str):
+        """每完成 10% 输出一次进度与速度"""
+        reported = {"step": -1}
+
+        def report(progress):
+            percent = progress.percent
+            step = int(percent // 10) if percent is not None else progress.downloaded // (10 * 1024 * 1024)
+            if step > reported["step"]:
+                reported["step"] = step
+                done = f"{percent:.0f}%" if percent is not None else f"{progress.downloaded / 1024 / 1024:.1f} MB"
+                self.console.info(f"下载 {filename}: {done}，{progress.speed / 1024 / 1024:.2f} MB/s")
+
+        return report
+
+    async def get_new_posts(
+        self,
+        sec_user_id: str,
+        store,
+        count: int = 18,
+        max_pages: Optional[int] = None,
+        initial_pages: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        增量抓取账号作品，只返回上次抓取之后发布的新作品
+
+        Args:
+            sec_user_id: 抖音用户的sec_user_id
+            store: tk_incremental.CursorStore，持久化每个账号已见过的最新作品
+            count: 每页作品数
+            max_pages: 每次最多翻页数，None 表示直到遇到已知作品
+            initial_pages: 首次抓取时最多翻页数，None 表示与 max_pages 相同
+
+        Returns:
+            处理后的新作品列表，没有新作品时为空列表
+        """
+        if not self.parameters:
+            raise RuntimeError("服务未正确初始化，请使用async with语句")
+
+        crawler = tk_incremental.IncrementalCrawler(store, max_pages, initial_pages)
+        fetch_page = tk_incremental.account_page_fetcher(Account, self.parameters, sec_user_id, count)
+        items = await crawler.crawl(sec_user_id, fetch_page)
+        self.console.info(f"账号 {sec_user_id} 翻页 {crawler.last_pages} 次，新作品 {len(items)} 个")
+        if not items:
+            return []
+        processed_data = await DataExtractor(self.parameters).run(items, self._get_recorder(), tiktok=False)
+        return processed_data or []
+
+    async def download_video(
+        self,
+        url: str,
+        output_path: Optional[str] = None,
+        connections: int = 4,
+        on_progress=None,
+    ) -> Optional[str]:
         """
         下载抖音视频
         
+        取处理后数据中 downloads 字段的无水印地址，大文件按字节范围多连接并发下载，
+        支持断点续传，完成后原子重命名为最终文件。
+        
         Args:
             url: 抖音视频链接
             output_path: 输出路径，可选，默认使用设置中的路径
+            connections: 最大并发连接数
+            on_progress: 进度回调，参数为 DownloadProgress（含已下载字节数、总大小、速度），
+                默认每完成 10% 输出一次
             
         Returns:
             下载的文件路径，如果下载失败则返回None
         """
-        # 该功能在后续实现
-        raise NotImplementedError("下载功能尚未实现")
+        if not self.parameters:
+            raise RuntimeError("服务未正确初始化，请使用async with语句")
+
+        info = await self.get_video_info(url)
+        if not info:
+            return None
+        download_url = info.get("downloads")
+        if not download_url or not isinstance(download_url, str):
+            # 图集作品的 downloads 为图片地址列表
+            self.console.warning(f"作品不是视频或缺少下载地址: {url}")
+            return None
+
+        save_dir = Path(output_path or getattr(self.parameters, "root", None) or "./downloads")
+        save_dir.mkdir(parents=True, exist_ok=True)
+        filename = f"{info.get('id') or int(time.time())}.mp4"
+        filepath = str(save_dir / filename)
 
+        try:
+            size = await stream_download.ranged_download(
+                self._get_download_client(connections),
+                download_url,
+                filepath,
+                connections=connections,
+                on_progress=on_progress or self._progress_printer(filename),
+            )
+            self.console.info(f"下载完成: {filepath}（{size / 1024 / 1024:.2f} MB）")
+            return filepath
+        except Exception as e:
+            self.console.error(f"下载视频时发生异常: {str(e)}")
+            return None
+
+
+class TikTokSessionPool(SessionPool):
+    """
+    常驻的 TikTokService 会话池，按cookie分组，参见 tk_session_pool.SessionPool
 
-async def get_video_info(url: str, cookie: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    会话内的 httpx 客户端绑定创建时的事件循环，会话池只能在同一个事件循环中使用，
+    跨事件循环请使用 get_session_pool() 获取当前循环对应的共享池。
+    """
+
+    def __init__(
+        self,
+        max_sessions_per_cookie: int = 4,
+        refresh_interval: float = 1800.0,
+        proxy_pool=None,
+        recorder=None,
+    ):
+        """
+        Args:
+            max_sessions_per_cookie: 每个cookie最多同时存在的会话数，超出时借出方等待归还
+            refresh_interval: 会话距上次刷新超过该秒数时，借出前原地刷新cookie与请求头
+            proxy_pool: 可选的代理池，新建会话时使用
+            recorder: 可选的记录器，所有会话共用
+        """
+        super().__init__(self._create_session, max_sessions_per_cookie, refresh_interval)
+        self.proxy_pool = proxy_pool
+        self.recorder = recorder
+
+    async def _create_session(self, cookie: Optional[str]) -> TikTokService:
+        return await TikTokService(cookie, self.proxy_pool, recorder=self.recorder).open()
+
+
+# 每个事件循环对应一个共享会话池，事件循环结束时关闭
+_shared_pools = tk_session_pool.LoopPools(TikTokSessionPool, loop_thread.close_on_shutdown)
+
+
+def get_session_pool() -> TikTokSessionPool:
+    """获取当前事件循环的共享会话池，asyncio.run 结束时自动关闭"""
+    return _shared_pools.get()
+
+
+async def _close_session_pool():
+    await _shared_pools.close_current()
+
+
+class SyncTikTokService:
+    """
+    供同步代码调用的 TikTok 服务
+
+    所有请求提交到同一个常驻后台事件循环，并借用该循环的共享会话池，
+    同步调用方也能像异步调用方一样复用已初始化的会话与连接。
+    submit_* 方法立即返回 concurrent.futures.Future，可在同步代码中并发提交。
+    """
+
+    _registered_loops = set()
+
+    def __init__(self, cookie: Optional[str] = None, background_loop=None, hedger=None):
+        """
+        Args:
+            cookie: 抖音cookie字符串，可选
+            background_loop: 使用的 BackgroundLoop，默认为进程内共享的后台事件循环
+            hedger: 可选的 Hedger，用于 get_video_info 的对冲请求
+        """
+        self.cookie = cookie
+        self.hedger = hedger
+        self.background = background_loop or loop_thread.get_background_loop()
+        if id(self.background) not in self._registered_loops:
+            # 后台事件循环关闭时关闭其共享会话池
+            self._registered_loops.add(id(self.background))
+            self.background.add_cleanup(_close_session_pool)
+
+    def submit_video_info(self, url: str) -> Future:
+        return self.background.submit(get_video_info(url, self.cookie, hedger=self.hedger))
+
+    def get_video_info(self, url: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """获取抖音视频的详细信息，参见 TikTokService.get_video_info"""
+        return self.background.run(get_video_info(url, self.cookie, hedger=self.hedger), timeout)
+
+    def get_video_info_batch(
+        self,
+        urls: Iterable[str],
+        concurrency: int = 8,
+        timeout: Optional[float] = None,
+    ) -> List[Tuple[str, bool, str, Optional[Dict[str, Any]]]]:
+        """批量获取抖音视频的详细信息，参见 TikTokService.get_video_info_batch"""
+        return self.background.run(get_video_info_batch(list(urls), self.cookie, concurrency), timeout)
+
+    def get_user_info(self, sec_user_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """获取抖音用户的详细信息，参见 TikTokService.get_user_info"""
+        return self.background.run(get_user_info(sec_user_id, self.cookie), timeout)
+
+    def submit_download(self, url: str, output_path: Optional[str] = None, connections: int = 4) -> Future:
+        async def download():
+            async with get_session_pool().session(self.cookie) as service:
+                return await service.download_video(url, output_path, connections)
+
+        return self.background.submit(download())
+
+    def download_video(
+        self,
+        url: str,
+        output_path: Optional[str] = None,
+        connections: int = 4,
+        timeout: Optional[float] = None,
+    ) -> Optional[str]:
+        """下载抖音视频，参见 TikTokService.download_video"""
+        return self.submit_download(url, output_path, connections).result(timeout)
+
+
+async def get_video_info(
+    url: str,
+    cookie: Optional[str] = None,
+    proxy_pool=None,
+    hedger=None,
+) -> Optional[Dict[str, Any]]:
     """
     获取抖音视频的详细信息的便捷函数
     
     Args:
         url: 抖音视频链接
         cookie: 抖音cookie字符串，可选
+        proxy_pool: 可选的代理池，提供时使用独立会话，否则从共享会话池借用
+        hedger: 可选的 Hedger，慢请求时再发起一次请求，参见 TikTokSessionPool.get_video_info
         
     Returns:
         包含视频详细信息的字典，如果获取失败则返回None
     """
-    async with TikTokService(cookie) as service:
-        return await service.get_video_info(url)
+    if proxy_pool is not None:
+        attempts = 0
+
+        async def attempt():
+            nonlocal attempts
+            attempts += 1
+            async with TikTokService(cookie, proxy_pool) as service:
+                return await service.get_video_info(url, coalesce=attempts == 1)
+
+        return await hedger.run(attempt) if hedger is not None else await attempt()
+    return await get_session_pool().get_video_info(url, cookie, hedger)
+
+
+async def get_video_info_batch(
+    urls: Iterable[str],
+    cookie: Optional[str] = None,
+    concurrency: int = 8,
+) -> List[Tuple[str, bool, str, Optional[Dict[str, Any]]]]:
+    """
+    批量获取抖音视频详细信息的便捷函数
+
+    Args:
+        urls: 抖音视频链接
+        cookie: 抖音cookie字符串，可选
+        concurrency: 最大并发数
+
+    Returns:
+        与输入顺序一致的 (url, success, msg, video_info) 列表
+    """
+    async with get_session_pool().session(cookie) as service:
+        return await service.get_video_info_batch(urls, concurrency)
 
 
 async def get_user_info(sec_user_id: str, cookie: Optional[str] = None) -> Optional[Dict[str, Any]]:
@@ -234,7 +739,7 @@ async def get_user_info(sec_user_id: str, cookie: Optional[str] = None) -> Optio
     Returns:
         包含用户详细信息的字典，如果获取失败则返回None
     """
-    async with TikTokService(cookie) as service:
+    async with get_session_pool().session(cookie) as service:
         return await service.get_user_info(sec_user_id)
 
 
@@ -0,0 +1,61 @@
+# src/services/tk_batch.py
+"""
+抖音视频详情的批量获取流程
+
+先并发解析全部链接得到作品ID并去重，再以有限并发获取详情，最后对全部详情只处理一次，
+结果按输入顺序映射回每个链接，重复的链接或指向同一作品的链接共享同一次请求。
+
+本模块只依赖标准库，tk_329 通过文件路径加载，不能导入 src 下的其他模块。
+解析、请求与处理由 tk_329 以协程函数的形式传入。
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+async def run_video_batch(
+    urls: Iterable[str],
+    resolve: Callable[[str], Awaitable[Optional[str]]],
+    fetch: Callable[[str], Awaitable[Optional[Dict[str, Any]]]],
+    process: Callable[[List[Dict[str, Any]]], Awaitable[Dict[str, Dict[str, Any]]]],
+    concurrency: int = 8,
+) -> List[Tuple[str, bool, str, Optional[Dict[str, Any]]]]:
+    """
+    批量获取视频详情
+
+    Args:
+        urls: 抖音视频链接
+        resolve: 接收链接、返回作品ID的协程函数，无法解析时返回 None
+        fetch: 接收作品ID、返回原始详情的协程函数，失败时返回 None
+        process: 接收全部原始详情、返回 作品ID -> 处理后详情 的协程函数
+        concurrency: 链接解析与详情请求共用的最大并发数
+
+    Returns:
+        与输入顺序一致的 (url, success, msg, video_info) 列表
+    """
+    urls = list(urls)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(func, arg):
+        async with semaphore:
+            return await func(arg)
+
+    unique_urls = list(dict.fromkeys(urls))
+    url_ids = dict(zip(unique_urls, await asyncio.gather(*(limited(resolve, url) for url in unique_urls))))
+    video_ids = list(dict.fromkeys(video_id for video_id in url_ids.values() if video_id))
+    details = dict(zip(video_ids, await asyncio.gather(*(limited(fetch, video_id) for video_id in video_ids))))
+
+    fetched = [data for data in details.values() if data]
+    processed = await process(fetched) if fetched else {}
+
+    results = []
+    for url in urls:
+        video_id = url_ids[url]
+        if not video_id:
+            results.append((url, False, "无法从链接提取视频ID", None))
+        elif not details.get(video_id):
+            results.append((url, False, f"无法获取视频ID为 {video_id} 的详细信息", None))
+        elif str(video_id) not in processed:
+            results.append((url, False, f"处理视频ID为 {video_id} 的详情失败", None))
+        else:
+            results.append((url, True, "获取视频信息成功", processed[str(video_id)]))
+    return results
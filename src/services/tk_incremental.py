@@ -0,0 +1,256 @@
+# src/services/tk_incremental.py
+"""
+抖音账号增量抓取
+
+为每个 sec_user_id 持久化已见过的最新作品（ID 与发布时间），再次抓取时从最新一页开始翻页，
+遇到已知作品即停止，只返回新增作品；稳定状态下的抓取成本与新作品数量成正比，与账号作品总数无关。
+
+本模块只依赖标准库与 aiosqlite，tk_329 通过文件路径加载，不能导入 src 下的其他模块。
+"""
+import time
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiosqlite
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS account_cursor (
+    sec_user_id TEXT PRIMARY KEY,
+    newest_id TEXT NOT NULL,
+    newest_time INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    resume_cursor INTEGER,
+    pending_id TEXT,
+    pending_time INTEGER
+)
+"""
+
+# 早期版本的表没有断点续抓字段，打开时补齐
+_RESUME_COLUMNS = (("resume_cursor", "INTEGER"), ("pending_id", "TEXT"), ("pending_time", "INTEGER"))
+
+# fetch_page(cursor) -> (作品列表, 下一页游标, 是否还有更多)
+PageFetcher = Callable[[int], Awaitable[Tuple[List[Dict[str, Any]], int, bool]]]
+
+
+@dataclass
+class AccountCursor:
+    """账号已见过的最新作品，newest_id 为空表示尚未完成过一次抓取"""
+    sec_user_id: str
+    newest_id: str
+    newest_time: int
+    updated_at: float
+    # 上次抓取因翻页数上限在 newest 之前中断时，记录中断处的游标与那次抓取见到的最新作品
+    resume_cursor: Optional[int] = None
+    pending_id: Optional[str] = None
+    pending_time: Optional[int] = None
+
+
+def aweme_id(item: Dict[str, Any]) -> str:
+    return str(item.get("aweme_id") or item.get("id") or "")
+
+
+def aweme_time(item: Dict[str, Any]) -> int:
+    return int(item.get("create_time") or 0)
+
+
+def is_pinned(item: Dict[str, Any]) -> bool:
+    """置顶作品不按时间排序，不能作为停止翻页的依据"""
+    return bool(item.get("is_top"))
+
+
+class CursorStore:
+    """基于 aiosqlite 的增量游标存储"""
+
+    def __init__(self, db_path: str):
+        """
+        :param db_path: SQLite 文件路径
+        """
+        self.db_path = db_path
+        self._db: Optional[aiosqlite.Connection] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _conn(self) -> aiosqlite.Connection:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._db is None:
+                self._db = await aiosqlite.connect(self.db_path)
+                await self._db.execute("PRAGMA journal_mode=WAL")
+                await self._db.execute(_SCHEMA)
+                async with self._db.execute("PRAGMA table_info(account_cursor)") as cursor:
+                    columns = {row[1] for row in await cursor.fetchall()}
+                for name, type_ in _RESUME_COLUMNS:
+                    if name not in columns:
+                        await self._db.execute(f"ALTER TABLE account_cursor ADD COLUMN {name} {type_}")
+                await self._db.commit()
+        return self._db
+
+    async def get(self, sec_user_id: str) -> Optional[AccountCursor]:
+        db = await self._conn()
+        async with db.execute(
+            "SELECT sec_user_id, newest_id, newest_time, updated_at, resume_cursor, pending_id, pending_time "
+            "FROM account_cursor WHERE sec_user_id = ?",
+            (sec_user_id,),
+        ) as cursor:
+            row = await cursor.fetchone()
+        return AccountCursor(*row) if row else None
+
+    async def set(
+        self,
+        sec_user_id: str,
+        newest_id: str,
+        newest_time: int,
+        resume_cursor: Optional[int] = None,
+        pending_id: Optional[str] = None,
+        pending_time: Optional[int] = None,
+    ):
+        db = await self._conn()
+        await db.execute(
+            "INSERT OR REPLACE INTO account_cursor (sec_user_id, newest_id, newest_time, updated_at, "
+            "resume_cursor, pending_id, pending_time) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (sec_user_id, newest_id, newest_time, time.time(), resume_cursor, pending_id, pending_time),
+        )
+        await db.commit()
+
+    async def reset(self, sec_user_id: str):
+        """清除账号的游标，下次抓取时重新全量抓取"""
+        db = await self._conn()
+        await db.execute("DELETE FROM account_cursor WHERE sec_user_id = ?", (sec_user_id,))
+        await db.commit()
+
+    async def close(self):
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+
+class IncrementalCrawler:
+    """
+    增量抓取器
+
+    翻页由调用方提供的 fetch_page 完成，抓取器只负责判断何时停止与更新游标：
+    - 遇到已知作品ID，或发布时间不晚于已知最新时间的非置顶作品时停止翻页；
+    - 翻到已知作品或账号没有更多作品时才推进游标，中途失败时下次会重新抓取这部分新作品；
+    - 达到 max_pages 时游标不动，记录中断处的位置，下次抓取先从中断处继续翻到已知作品，
+      补齐后才推进游标，再从首页抓取期间新发布的作品，中间的作品不会被跳过。
+    initial_pages 有意只抓取首次抓取时最近的几页，此时没有已知作品，不记录中断位置。
+    """
+
+    def __init__(self, store: CursorStore, max_pages: Optional[int] = None, initial_pages: Optional[int] = None):
+        """
+        :param store: 游标存储
+        :param max_pages: 每次抓取最多翻页数，None 表示不限
+        :param initial_pages: 首次抓取（没有游标）时最多翻页数，None 表示与 max_pages 相同
+        """
+        self.store = store
+        self.max_pages = max_pages
+        self.initial_pages = initial_pages
+        self.last_pages = 0
+
+    async def _scan(
+        self,
+        fetch_page: PageFetcher,
+        cursor: int,
+        bound_id: str,
+        bound_time: int,
+        page_limit: Optional[int],
+        seen: set,
+    ) -> Tuple[List[Dict[str, Any]], bool, int]:
+        """
+        从 cursor 开始翻页，直到遇到已知作品（bound_id 为空表示没有）、没有更多作品或达到翻页数上限
+
+        :return: (新作品列表, 是否翻到了已知作品或末页, 下一页游标)
+        """
+        new_items: List[Dict[str, Any]] = []
+        pages = 0
+        while page_limit is None or pages < page_limit:
+            items, next_cursor, has_more = await fetch_page(cursor)
+            pages += 1
+            self.last_pages += 1
+            reached_known = False
+            for item in items:
+                item_id = aweme_id(item)
+                if not item_id or item_id in seen:
+                    continue
+                seen.add(item_id)
+                if bound_id and (item_id == bound_id or aweme_time(item) <= bound_time):
+                    if not is_pinned(item):
+                        reached_known = True
+                    continue
+                new_items.append(item)
+            if reached_known or not has_more or not items:
+                return new_items, True, next_cursor
+            cursor = next_cursor
+        return new_items, False, cursor
+
+    async def crawl(self, sec_user_id: str, fetch_page: PageFetcher) -> List[Dict[str, Any]]:
+        """
+        抓取账号的新作品
+
+        :param sec_user_id: 账号 sec_user_id
+        :param fetch_page: 翻页函数，接收游标（首页为 0），返回 (作品列表, 下一页游标, 是否还有更多)
+        :return: 新作品列表（原始作品数据），补齐上次中断的部分在前，其余按接口返回顺序排列
+        """
+        known = await self.store.get(sec_user_id)
+        newest_id, newest_time = (known.newest_id, known.newest_time) if known else ("", 0)
+        first_crawl = not newest_id and not (known and known.resume_cursor is not None)
+        page_limit = self.initial_pages if first_crawl and self.initial_pages is not None else self.max_pages
+
+        self.last_pages = 0
+        new_items: List[Dict[str, Any]] = []
+        seen = set()
+
+        if known and known.resume_cursor is not None:
+            # 先补齐上次中断处到已知作品之间的作品
+            items, done, next_cursor = await self._scan(
+                fetch_page, known.resume_cursor, newest_id, newest_time, page_limit, seen,
+            )
+            new_items.extend(items)
+            if not done:
+                await self.store.set(
+                    sec_user_id, newest_id, newest_time, next_cursor, known.pending_id, known.pending_time,
+                )
+                return new_items
+            newest_id, newest_time = known.pending_id or "", known.pending_time or 0
+            await self.store.set(sec_user_id, newest_id, newest_time)
+            if page_limit is not None and self.last_pages >= page_limit:
+                return new_items
+
+        remaining = None if page_limit is None else page_limit - self.last_pages
+        items, done, next_cursor = await self._scan(fetch_page, 0, newest_id, newest_time, remaining, seen)
+        new_items.extend(items)
+        newest = max(items, key=aweme_time) if items else None
+        if done or (first_crawl and self.initial_pages is not None):
+            if newest is not None and aweme_time(newest) > newest_time:
+                await self.store.set(sec_user_id, aweme_id(newest), aweme_time(newest))
+        else:
+            # 在已知作品之前中断：游标不动，记录中断位置与本次见到的最新作品
+            pending_id, pending_time = (aweme_id(newest), aweme_time(newest)) if newest else (newest_id, newest_time)
+            await self.store.set(sec_user_id, newest_id, newest_time, next_cursor, pending_id, pending_time)
+        return new_items
+
+
+def account_page_fetcher(account_cls, parameter, sec_user_id: str, count: int = 18, **kwargs) -> PageFetcher:
+    """
+    基于 TikTokDownloader 的 Account 接口构造翻页函数
+
+    每次只请求一页：以 pages=1 和指定游标创建 Account。下一页游标优先取 Account 更新后的
+    cursor 属性，否则按抖音的约定取本页最早作品的发布时间（毫秒）。
+
+    :param account_cls: TikTokDownloader 的 Account 类
+    :param parameter: TikTokDownloader 的 Parameter
+    :param sec_user_id: 账号 sec_user_id
+    :param count: 每页作品数
+    """
+    async def fetch_page(cursor: int):
+        account = account_cls(parameter, sec_user_id=sec_user_id, pages=1, cursor=cursor, count=count, **kwargs)
+        items, _, _ = await account.run()
+        items = items or []
+        next_cursor = getattr(account, "cursor", None)
+        if not next_cursor or next_cursor == cursor:
+            next_cursor = min((aweme_time(item) for item in items), default=0) * 1000
+        has_more = not getattr(account, "finished", False) and bool(items)
+        return items, next_cursor, has_more
+
+    return fetch_page
@@ -0,0 +1,98 @@
+# src/services/tk_link_cache.py
+"""
+抖音/TikTok 分享链接的解析结果缓存
+
+短链接（v.douyin.com）需要跟随一次重定向才能拿到真实ID，同一分享链接会被反复提交；
+缓存命中时完全跳过网络请求。
+
+本模块只依赖标准库，tk_329 通过文件路径加载，不能导入 src 下的其他模块。
+"""
+import re
+import time
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 分享文本中的链接
+SHARE_URL_PATTERN = re.compile(r"https?://[^\s\u4e00-\u9fff，。！]+")
+
+# 短链接的路径本身就是唯一标识，查询参数只是分享来源等统计信息
+SHORT_LINK_HOSTS = frozenset({"v.douyin.com", "vm.tiktok.com", "vt.tiktok.com"})
+
+# 长链接中携带作品或用户ID的查询参数，如 douyin.com/discover?modal_id=作品ID，
+# 必须保留在缓存键中；其余参数（分享来源、时间戳等）不影响解析结果
+ID_QUERY_PARAMS = frozenset({"modal_id", "aweme_id", "item_id", "vid", "sec_uid", "sec_user_id"})
+
+
+def normalize_share_url(text: str) -> str:
+    """
+    规范化分享链接作为缓存键
+
+    从分享文本中取出链接，主机名转小写，去掉锚点和末尾的斜杠。短链接去掉全部查询参数；
+    长链接只保留携带ID的参数（按参数名排序），避免 ``/discover?modal_id=A`` 与
+    ``/discover?modal_id=B`` 落到同一个键上。
+    """
+    match = SHARE_URL_PATTERN.search(text or "")
+    url = match.group(0) if match else (text or "").strip()
+    parts = urlsplit(url)
+    netloc = parts.netloc.lower()
+    query = ""
+    if netloc not in SHORT_LINK_HOSTS:
+        query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query) if k in ID_QUERY_PARAMS))
+    return urlunsplit((parts.scheme.lower() or "https", netloc, parts.path.rstrip("/"), query, ""))
+
+
+class LinkResolutionCache:
+    """
+    链接解析结果缓存：规范化链接 -> 作品ID 或 sec_user_id 列表
+
+    无法解析的链接写入负缓存，有效期更短。
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 24 * 3600.0, negative_ttl: float = 600.0):
+        """
+        Args:
+            maxsize: 最多缓存的链接数，超出时淘汰最久未使用的条目
+            ttl: 解析成功的条目有效期（秒）
+            negative_ttl: 无法解析的链接的有效期（秒）
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        # (类型, 规范化链接) -> (ID列表, 过期时间)
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0}
+
+    def get(self, url: str, type_: str = "detail") -> Optional[List[str]]:
+        """
+        查找缓存
+
+        Returns:
+            命中时返回ID列表（负缓存命中时为空列表），未命中返回 None
+        """
+        key = (type_, normalize_share_url(url))
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or time.monotonic() >= entry[1]:
+                self._data.pop(key, None)
+                self.stats["misses"] += 1
+                return None
+            self._data.move_to_end(key)
+            self.stats["hits" if entry[0] else "negative_hits"] += 1
+            return list(entry[0])
+
+    def set(self, url: str, ids: List[str], type_: str = "detail"):
+        """写入解析结果，ids 为空表示链接无效"""
+        ttl = self.ttl if ids else self.negative_ttl
+        key = (type_, normalize_share_url(url))
+        with self._lock:
+            self._data[key] = (list(ids), time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,119 @@
+# src/services/tk_profile_cache.py
+"""
+抖音用户资料缓存（stale-while-revalidate）
+
+用户资料变化不频繁，但 get_user_info 每次都要请求上游；缓存新鲜期内直接返回，
+过期不久的资料先返回旧值并在后台刷新，调用方不再等待上游。
+
+本模块只依赖标准库，tk_329 通过文件路径加载，不能导入 src 下的其他模块。
+"""
+import time
+import asyncio
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class ProfileCache:
+    """
+    抖音用户资料缓存，按 sec_user_id 索引
+
+    - 存入不足 soft_ttl 秒的资料直接返回；
+    - 超过 soft_ttl 但不足 hard_ttl 的资料先返回旧值，同时在后台刷新；
+    - 超过 hard_ttl 视为未命中，等待回源。
+    同一用户的并发未命中与刷新合并为一次上游请求；回源结果为空时不写入缓存。
+    缓存在进程内共享，进行中的请求按事件循环分别记录，不同事件循环之间不合并。
+    """
+
+    def __init__(self, maxsize: int = 5000, soft_ttl: float = 600.0, hard_ttl: float = 24 * 3600.0):
+        """
+        Args:
+            maxsize: 最多缓存的用户数，超出时淘汰最久未使用的条目
+            soft_ttl: 新鲜期（秒）
+            hard_ttl: 可返回旧值的最长期限（秒），不小于 soft_ttl
+        """
+        self.maxsize = maxsize
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = max(hard_ttl, soft_ttl)
+        # sec_user_id -> (资料, 存入时间)
+        self._data: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "refreshes": 0, "refresh_errors": 0}
+
+    def _get(self, sec_user_id: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """返回 (资料, 已存入秒数)，超过 hard_ttl 时删除并返回 None"""
+        with self._lock:
+            entry = self._data.get(sec_user_id)
+            if entry is None:
+                return None
+            age = time.monotonic() - entry[1]
+            if age >= self.hard_ttl:
+                del self._data[sec_user_id]
+                return None
+            self._data.move_to_end(sec_user_id)
+            return entry[0], age
+
+    def set(self, sec_user_id: str, value: Dict[str, Any]):
+        with self._lock:
+            self._data[sec_user_id] = (value, time.monotonic())
+            self._data.move_to_end(sec_user_id)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    async def get_or_fetch(self, sec_user_id: str, fetch, refresh=None) -> Optional[Dict[str, Any]]:
+        """
+        读取资料，未命中时 await fetch() 回源
+
+        Args:
+            sec_user_id: 抖音用户的sec_user_id
+            fetch: 无参数的协程函数，返回用户资料或 None
+            refresh: 后台刷新使用的协程函数，默认与 fetch 相同；后台刷新在调用方返回后
+                仍在执行，不能使用调用方借出后会归还的资源（如会话池中的会话）
+        """
+        inflight = self._inflight.setdefault(asyncio.get_running_loop(), {})
+        entry = self._get(sec_user_id)
+        if entry is not None and entry[1] < self.soft_ttl:
+            self.stats["hits"] += 1
+            return entry[0]
+        if entry is not None:
+            self.stats["stale_hits"] += 1
+            if sec_user_id not in inflight:
+                self.stats["refreshes"] += 1
+                task = self._start_fetch(inflight, sec_user_id, refresh or fetch)
+                task.add_done_callback(self._log_refresh_error)
+            return entry[0]
+
+        self.stats["misses"] += 1
+        task = inflight.get(sec_user_id)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            task = self._start_fetch(inflight, sec_user_id, fetch)
+        # shield：单个调用方被取消时不影响其他等待者
+        return await asyncio.shield(task)
+
+    def _start_fetch(self, inflight: Dict[str, asyncio.Task], sec_user_id: str, fetch) -> asyncio.Task:
+        async def run():
+            try:
+                value = await fetch()
+                if value:
+                    self.set(sec_user_id, value)
+                return value
+            finally:
+                inflight.pop(sec_user_id, None)
+
+        task = asyncio.create_task(run())
+        inflight[sec_user_id] = task
+        return task
+
+    def _log_refresh_error(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            self.stats["refresh_errors"] += 1
+
+    def invalidate(self, sec_user_id: str):
+        with self._lock:
+            self._data.pop(sec_user_id, None)
@@ -0,0 +1,229 @@
+# src/services/tk_recorder.py
+"""
+批量写入的异步 SQLite 记录器
+
+与 TikTokDownloader 记录器接口一致（field_keys 属性与 async save 方法），可直接传给
+DataExtractor.run 替代 DummyRecorder。save 只把记录放入内存队列，由后台任务按数量或时间
+触发，以单个事务 executemany 批量写入，提取流程不再等待每条记录的提交。
+
+本模块只依赖标准库与第三方库，tk_329 通过文件路径加载，不能导入 src 下的其他模块。
+"""
+import json
+import time
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import aiosqlite
+from loguru import logger
+
+# 默认保存的作品字段，顺序即 DataExtractor 传入 save 的值的顺序
+DEFAULT_FIELD_KEYS = (
+    "id",
+    "type",
+    "desc",
+    "create_time",
+    "uid",
+    "sec_uid",
+    "nickname",
+    "digg_count",
+    "comment_count",
+    "collect_count",
+    "share_count",
+    "downloads",
+)
+
+
+def _column_value(value: Any) -> Any:
+    """列表、字典等非标量值序列化为 JSON 文本"""
+    if value is None or isinstance(value, (str, int, float, bytes)):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+class SQLiteRecorder:
+    """
+    批量写入的异步 SQLite 记录器
+
+    - 队列达到 batch_size 条或距上次写入超过 flush_interval 秒时写入一批；
+    - 使用 WAL 模式，读取历史数据不阻塞写入；
+    - 字段包含 id 时以 id 为主键，重复抓取的作品覆盖旧记录；
+    - 队列超过 max_pending 条时 save 等待写入完成，避免内存无限增长；
+    - 写入失败的记录放回队列重试，累计失败 max_retries 次后逐条写入一次，
+      仍然失败的记录记入日志后丢弃，避免个别无法写入的记录永久堵塞队列。
+
+    建议通过 ``async with`` 使用，退出时写入剩余记录并关闭连接。
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        field_keys: Sequence[str] = DEFAULT_FIELD_KEYS,
+        table: str = "douyin_records",
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        max_pending: int = 10000,
+        max_retries: int = 3,
+    ):
+        """
+        :param db_path: SQLite 文件路径
+        :param field_keys: 保存的字段名
+        :param table: 表名
+        :param batch_size: 每批写入的记录数
+        :param flush_interval: 最长写入间隔（秒）
+        :param max_pending: 内存中最多排队的记录数
+        :param max_retries: 每条记录最多随批量写入失败的次数
+        """
+        self.db_path = db_path
+        self.field_keys = list(field_keys)
+        self.table = table
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.stats = {"saved": 0, "batches": 0, "flush_seconds": 0.0, "retried": 0, "dropped": 0}
+
+        self._pending: List[tuple] = []
+        # 写入失败待重试的 (记录, 已失败次数)
+        self._retries: List[Tuple[tuple, int]] = []
+        self._db: Optional[aiosqlite.Connection] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._closed = False
+
+        columns = ", ".join(f'"{key}"' for key in self.field_keys)
+        placeholders = ", ".join("?" for _ in self.field_keys)
+        self._insert_sql = (
+            f'INSERT OR REPLACE INTO "{table}" ({columns}, recorded_at) VALUES ({placeholders}, ?)'
+        )
+
+    async def __aenter__(self) -> "SQLiteRecorder":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def open(self):
+        """打开数据库并启动后台写入任务"""
+        if self._db is not None:
+            return
+        self._db = await aiosqlite.connect(self.db_path)
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.execute("PRAGMA synchronous=NORMAL")
+        definitions = ", ".join(
+            f'"{key}" TEXT PRIMARY KEY' if key == "id" else f'"{key}"' for key in self.field_keys
+        )
+        await self._db.execute(f'CREATE TABLE IF NOT EXISTS "{self.table}" ({definitions}, recorded_at REAL)')
+        await self._db.commit()
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._closed = False
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def save(self, data: Sequence[Any], *args, **kwargs):
+        """
+        保存一条记录，只放入内存队列
+
+        :param data: 与 field_keys 顺序一致的字段值
+        """
+        if self._db is None:
+            await self.open()
+        self._pending.append((*(_column_value(value) for value in data), time.time()))
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+        if len(self._pending) + len(self._retries) >= self.max_pending:
+            await self.flush()
+
+    async def save_item(self, item: Dict[str, Any]):
+        """按 field_keys 从字典中取值保存，缺失字段记为空"""
+        await self.save([item.get(key) for key in self.field_keys])
+
+    async def _flush_loop(self):
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                # 写入失败的记录已放回队列，下一轮重试或已丢弃
+                logger.warning(f"记录写入失败: {e}")
+
+    async def flush(self):
+        """
+        将队列中的记录以单个事务写入
+
+        写入失败时抛出异常；未达到重试上限的记录放回队列，达到上限的记录逐条写入一次，
+        仍然失败的记录记入日志后丢弃。
+        """
+        async with self._flush_lock:
+            if (not self._pending and not self._retries) or self._db is None:
+                return
+            batch = self._retries + [(row, 0) for row in self._pending]
+            self._retries, self._pending = [], []
+            start = time.monotonic()
+            try:
+                await self._db.executemany(self._insert_sql, [row for row, _ in batch])
+                await self._db.commit()
+            except Exception as e:
+                await self._rollback()
+                expired = []
+                for row, failures in batch:
+                    if failures + 1 >= self.max_retries:
+                        expired.append(row)
+                    else:
+                        self._retries.append((row, failures + 1))
+                self.stats["retried"] += len(self._retries)
+                if expired:
+                    await self._write_one_by_one(expired, e)
+                raise
+            self.stats["saved"] += len(batch)
+            self.stats["batches"] += 1
+            self.stats["flush_seconds"] += time.monotonic() - start
+
+    async def _rollback(self):
+        try:
+            await self._db.rollback()
+        except Exception as e:
+            logger.warning(f"记录写入回滚失败: {e}")
+
+    async def _write_one_by_one(self, rows: List[tuple], error: Exception):
+        """逐条写入达到重试上限的记录，仍然失败的记录记入日志后丢弃"""
+        for row in rows:
+            try:
+                await self._db.execute(self._insert_sql, row)
+                await self._db.commit()
+                self.stats["saved"] += 1
+            except Exception as e:
+                await self._rollback()
+                self._drop([row], e)
+        logger.info(f"{len(rows)} 条记录批量写入失败 {self.max_retries} 次（{error}），已逐条写入")
+
+    def _drop(self, rows: List[tuple], error: Exception):
+        self.stats["dropped"] += len(rows)
+        for row in rows:
+            logger.error(f"记录写入失败，已丢弃（{error}）: {json.dumps(row, ensure_ascii=False, default=str)}")
+
+    async def close(self):
+        """写入剩余记录并关闭数据库，无法写入的剩余记录记入日志后丢弃"""
+        if self._db is None:
+            return
+        self._closed = True
+        self._wake.set()
+        try:
+            if self._flusher is not None:
+                await self._flusher
+                self._flusher = None
+            try:
+                await self.flush()
+            except Exception as e:
+                rows = [row for row, _ in self._retries] + self._pending
+                self._retries, self._pending = [], []
+                self._drop(rows, e)
+                raise
+        finally:
+            await self._db.close()
+            self._db = None
@@ -0,0 +1,218 @@
+# src/services/tk_session_pool.py
+"""
+常驻的抖音会话池
+
+每次查询都新建 TikTokService 需要重新读取设置、构造 Parameter、生成请求头并新建客户端；
+会话池保留已初始化的会话，调用方借出后归还，查询本身不再承担初始化开销。
+
+本模块只依赖标准库，tk_329 通过文件路径加载，不能导入 src 下的其他模块。
+会话由 tk_329 提供的工厂函数创建，需具备 last_refresh 属性与 refresh()、async close() 方法。
+"""
+import time
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class SessionPool:
+    """
+    会话池，按cookie分组
+
+    闲置超过 refresh_interval 的会话在借出时原地刷新cookie与请求头。
+    会话内的 httpx 客户端绑定创建时的事件循环，会话池只能在同一个事件循环中使用，
+    跨事件循环请使用 LoopPools 获取当前循环对应的共享池。
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[Optional[str]], Awaitable[Any]],
+        max_sessions_per_cookie: int = 4,
+        refresh_interval: float = 1800.0,
+    ):
+        """
+        Args:
+            factory: 接收cookie、返回已初始化会话的协程函数
+            max_sessions_per_cookie: 每个cookie最多同时存在的会话数，超出时借出方等待归还
+            refresh_interval: 会话距上次刷新超过该秒数时，借出前原地刷新cookie与请求头
+        """
+        self.factory = factory
+        self.max_sessions_per_cookie = max_sessions_per_cookie
+        self.refresh_interval = refresh_interval
+        self._idle: Dict[Optional[str], List[Any]] = {}
+        self._sizes: Dict[Optional[str], int] = {}
+        self._keys: Dict[int, Optional[str]] = {}
+        self._condition = asyncio.Condition()
+        self._closed = False
+        # LoopPools 创建的共享池在事件循环结束时关闭
+        self._shutdown_hook = None
+        self.stats = {"created": 0, "reused": 0, "refreshed": 0, "discarded": 0}
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def acquire(self, cookie: Optional[str] = None) -> Any:
+        """
+        借出一个已初始化的会话
+
+        Args:
+            cookie: 抖音cookie字符串，None 表示使用设置文件中的cookie
+
+        Returns:
+            会话实例，使用完毕后必须调用 release 归还
+        """
+        async with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("会话池已关闭")
+                idle = self._idle.get(cookie)
+                if idle:
+                    session = idle.pop()
+                    break
+                if self._sizes.get(cookie, 0) < self.max_sessions_per_cookie:
+                    self._sizes[cookie] = self._sizes.get(cookie, 0) + 1
+                    session = None
+                    break
+                await self._condition.wait()
+
+        if session is not None:
+            self.stats["reused"] += 1
+            if time.monotonic() - session.last_refresh >= self.refresh_interval:
+                session.refresh()
+                self.stats["refreshed"] += 1
+            return session
+
+        try:
+            session = await self.factory(cookie)
+        except Exception:
+            async with self._condition:
+                self._sizes[cookie] -= 1
+                self._condition.notify()
+            raise
+        session.session_pool = self
+        self._keys[id(session)] = cookie
+        self.stats["created"] += 1
+        return session
+
+    async def release(self, session: Any, discard: bool = False):
+        """
+        归还会话
+
+        Args:
+            session: acquire 返回的会话
+            discard: 为 True 时关闭该会话而不放回池中（如会话出现异常）
+        """
+        cookie = self._keys.get(id(session))
+        if discard or self._closed:
+            self._keys.pop(id(session), None)
+            await session.close()
+            self.stats["discarded"] += 1
+            async with self._condition:
+                self._sizes[cookie] = self._sizes.get(cookie, 1) - 1
+                self._condition.notify()
+            return
+        async with self._condition:
+            self._idle.setdefault(cookie, []).append(session)
+            self._condition.notify()
+
+    @asynccontextmanager
+    async def session(self, cookie: Optional[str] = None):
+        """借出会话的上下文管理器，块内抛出异常时丢弃该会话"""
+        session = await self.acquire(cookie)
+        try:
+            yield session
+        except asyncio.CancelledError:
+            # 被取消（如落败的对冲请求）不代表会话异常，放回池中
+            await self.release(session)
+            raise
+        except BaseException:
+            await self.release(session, discard=True)
+            raise
+        else:
+            await self.release(session)
+
+    async def get_video_info(self, url: str, cookie: Optional[str] = None, hedger=None) -> Optional[Dict[str, Any]]:
+        """
+        借用会话获取抖音视频的详细信息
+
+        Args:
+            url: 抖音视频链接
+            cookie: 抖音cookie字符串，可选
+            hedger: 可选的 Hedger，请求超过近期耗时分位仍未返回时借用另一个会话（配置了代理池时
+                通常是另一个代理）再请求一次，取先返回的结果并取消另一个
+
+        Returns:
+            包含视频详细信息的字典，如果获取失败则返回None
+        """
+        attempts = 0
+
+        async def attempt():
+            nonlocal attempts
+            attempts += 1
+            async with self.session(cookie) as service:
+                # 对冲请求绕过请求合并，否则会加入仍未返回的主请求
+                return await service.get_video_info(url, coalesce=attempts == 1)
+
+        if hedger is None:
+            return await attempt()
+        return await hedger.run(attempt)
+
+    async def refresh(self, cookie: Optional[str] = None, new_cookie: Optional[str] = None):
+        """
+        原地刷新某个cookie分组下所有闲置会话
+
+        Args:
+            cookie: 会话分组使用的cookie
+            new_cookie: 替换用的新cookie，不提供时只重新生成请求头
+        """
+        async with self._condition:
+            for session in self._idle.get(cookie, []):
+                session.refresh(new_cookie)
+                self.stats["refreshed"] += 1
+
+    async def close(self):
+        """关闭全部闲置会话，借出中的会话在归还时关闭"""
+        async with self._condition:
+            self._closed = True
+            sessions = [session for idle in self._idle.values() for session in idle]
+            self._idle.clear()
+            self._condition.notify_all()
+        for session in sessions:
+            self._keys.pop(id(session), None)
+            await session.close()
+
+
+class LoopPools:
+    """
+    每个事件循环对应一个共享会话池
+
+    事件循环结束（如每次调用都使用 asyncio.run）时关闭该循环的会话池，避免遗留客户端。
+    """
+
+    def __init__(self, create: Callable[[], SessionPool], on_loop_shutdown: Callable[[Callable[[], Awaitable[Any]]], Any]):
+        """
+        Args:
+            create: 创建会话池的函数
+            on_loop_shutdown: 在当前事件循环关闭前执行清理协程函数的注册函数，
+                如 loop_thread.close_on_shutdown，返回值由会话池持有
+        """
+        self.create = create
+        self.on_loop_shutdown = on_loop_shutdown
+        self._pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, SessionPool]" = weakref.WeakKeyDictionary()
+
+    def get(self) -> SessionPool:
+        """获取当前事件循环的共享会话池，已关闭时重新创建"""
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None or pool.closed:
+            pool = self.create()
+            pool._shutdown_hook = self.on_loop_shutdown(pool.close)
+            self._pools[loop] = pool
+        return pool
+
+    async def close_current(self):
+        """关闭当前事件循环的共享会话池"""
+        pool = self._pools.get(asyncio.get_running_loop())
+        if pool is not None:
+            await pool.close()
@@ -0,0 +1,643 @@
+# src/services/xhs_async_service.py
+import time
+import random
+import asyncio
+import urllib.parse
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Tuple
+
+import httpx
+from loguru import logger
+
+from src.services.xhs_service import (
+    PLATFORM, initial_cookies, load_cookie_pool, setup_sign_backend, teardown_sign_backend,
+)
+from src.utils.batch import BatchStats, note_id_from_url
+from src.utils.circuit_breaker import shared_breakers
+from src.utils.cookie_pool import is_risk_error
+from src.utils.exceptions import CircuitOpenError, XHSExtractError
+from src.utils.pagination import Page, iter_items, iter_pages
+from src.utils.proxy_pool import is_proxy_error
+from src.utils.rate_limit import HostRateLimiter
+from src.utils.singleflight import AsyncSingleFlight
+
+# xhs_service 已将 Spider_XHS 加入 sys.path
+from xhs_utils.xhs_util import generate_request_params
+from xhs_utils.data_util import handle_note_info
+
+
+BASE_URL = "https://edith.xiaohongshu.com"
+IMAGE_FORMATS = ["jpg", "webp", "avif"]
+
+Result = Tuple[bool, str, Any]
+
+
+def _splice_api(api: str, params: Dict[str, Any]) -> str:
+    """拼接查询参数，签名与实际请求必须使用完全相同的路径"""
+    query = "&".join(f"{key}={'' if value is None else value}" for key, value in params.items())
+    return f"{api}?{query}" if query else api
+
+
+def _url_query(url: str) -> Dict[str, str]:
+    parsed = urllib.parse.urlparse(url)
+    return {key: values[0] for key, values in urllib.parse.parse_qs(parsed.query).items()}
+
+
+def _url_id(url: str) -> str:
+    return urllib.parse.urlparse(url).path.rstrip("/").split("/")[-1]
+
+
+def _proxy_url(proxies: Optional[Dict[str, str]]) -> Optional[str]:
+    """兼容 requests 风格的 proxies 字典"""
+    if not proxies:
+        return None
+    if isinstance(proxies, str):
+        return proxies
+    return proxies.get("https") or proxies.get("http")
+
+
+def _generate_search_id() -> str:
+    value = (int(time.time() * 1000) << 64) + int(random.uniform(0, 2147483646))
+    alphabet = "0123456789abcdefghijklmnopqrstuvwxyz"
+    digits = ""
+    while value:
+        value, remainder = divmod(value, 36)
+        digits = alphabet[remainder] + digits
+    return digits or "0"
+
+
+class AsyncXHSService:
+    """
+    基于 httpx 的异步小红书服务
+
+    方法与 XHSService 一一对应并保持 (success, msg, data) 的返回约定，
+    所有请求共享同一组长连接，适合在单个事件循环中并发大量查询。
+    """
+
+    def __init__(
+        self,
+        cookies_file=None,
+        sign_backend="execjs",
+        sign_workers=4,
+        timeout=10,
+        max_connections=100,
+        max_keepalive_connections=20,
+        http2=False,
+        cache=None,
+        cookie_pool=None,
+        proxy_pool=None,
+        hedger=None,
+        flights=None,
+        breakers=None,
+    ):
+        """
+        初始化异步小红书服务
+
+        Args:
+            cookies_file: Cookie文件路径，如不提供则使用环境变量中的配置
+            sign_backend: 签名后端，execjs 或 node_pool
+            sign_workers: node_pool 后端的常驻进程数量
+            timeout: 请求超时（秒）
+            max_connections: 连接池最大连接数
+            max_keepalive_connections: 最大保活连接数
+            http2: 是否启用 HTTP/2（需安装 h2）
+            cache: 可选的 NoteCache，按 note_id 缓存 get_note_info 的结果
+            cookie_pool: 可选的多账号Cookie池（CookiePool 或账号文件/目录路径），
+                可与 XHSService 共用同一个实例
+            proxy_pool: 可选的 ProxyPool，未显式传入 proxies 的请求从池中选择最快的代理
+            hedger: 可选的 Hedger，get_note_info 超过近期耗时分位仍未返回时，
+                换一个账号/代理再请求一次，取先成功的结果并取消另一个
+            flights: 可选的 AsyncSingleFlight，多个服务实例共用时跨实例合并请求，默认每个实例独立
+            breakers: 熔断器注册表，默认使用进程内共享的注册表，与 XHSService 共用同一个平台熔断器
+        """
+        self.cache = cache
+        self.hedger = hedger
+        self.flights = flights or AsyncSingleFlight()
+        self.breakers = breakers or shared_breakers
+        self.breaker = self.breakers.get(PLATFORM, error_factory=CircuitOpenError)
+        self.sign_pool = setup_sign_backend(sign_backend, sign_workers)
+        self.cookie_pool = load_cookie_pool(cookie_pool)
+        self.cookies_str = initial_cookies(cookies_file, self.cookie_pool)
+        self.proxy_pool = proxy_pool
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self.http2 = http2
+        # 按代理地址区分的共享客户端，None 表示直连
+        self._clients: Dict[Optional[str], httpx.AsyncClient] = {}
+        self.last_batch_stats = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """关闭所有共享客户端，撤销 node_pool 后端对签名上下文的替换"""
+        pool, self.sign_pool = self.sign_pool, None
+        teardown_sign_backend(pool)
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    def _client(self, proxies=None) -> httpx.AsyncClient:
+        proxy = _proxy_url(proxies)
+        client = self._clients.get(proxy)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=BASE_URL,
+                proxy=proxy,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+            )
+            self._clients[proxy] = client
+        return client
+
+    def cookie_stats(self):
+        """各账号的请求数与错误率，未配置Cookie池时返回 None"""
+        return self.cookie_pool.stats() if self.cookie_pool else None
+
+    def breaker_stats(self):
+        """熔断器状态，用于监控"""
+        return self.breaker.snapshot()
+
+    def flight_stats(self):
+        """请求合并统计：总请求数、实际执行数与被合并的请求数"""
+        return dict(self.flights.stats)
+
+    async def _request(self, method, api, params=None, data=None, proxies=None) -> Result:
+        """签名并发送请求，返回 (success, msg, res_json)；平台熔断中时抛出 CircuitOpenError"""
+        with self.breaker.guard() as guard:
+            success, msg, res_json = await self._request_with_proxy(method, api, params, data, proxies)
+            code = res_json.get("code")
+            if not success and (is_risk_error(msg, code) or is_proxy_error(f"{msg} {code}")):
+                guard.fail()
+            return success, msg, res_json
+
+    async def _request_with_proxy(self, method, api, params=None, data=None, proxies=None) -> Result:
+        if proxies is None and self.proxy_pool is not None:
+            with self.proxy_pool.track() as tracker:
+                success, msg, res_json = await self._request_with_cookies(method, api, params, data, tracker.proxy)
+                if not success and is_proxy_error(f"{msg} {res_json.get('code')}"):
+                    tracker.fail()
+                return success, msg, res_json
+        return await self._request_with_cookies(method, api, params, data, proxies)
+
+    async def _request_with_cookies(self, method, api, params=None, data=None, proxies=None) -> Result:
+        if self.cookie_pool is None:
+            return await self._signed_request(self.cookies_str, method, api, params, data, proxies)
+        with self.cookie_pool.lease() as lease:
+            success, msg, res_json = await self._signed_request(lease.cookies, method, api, params, data, proxies)
+            lease.report(success, msg, res_json.get("code"))
+            return success, msg, res_json
+
+    async def _signed_request(self, cookies_str, method, api, params=None, data=None, proxies=None) -> Result:
+        if params:
+            api = _splice_api(api, params)
+        # 签名为阻塞调用，放到线程中执行避免卡住事件循环
+        headers, _, body = await asyncio.to_thread(
+            generate_request_params, cookies_str, api, data or ""
+        )
+        headers = dict(headers)
+        headers["cookie"] = cookies_str
+        response = await self._client(proxies).request(
+            method, api, headers=headers, content=body.encode("utf-8") if body else None
+        )
+        res_json = response.json()
+        return res_json["success"], res_json["msg"], res_json
+
+    async def _note_feed(self, note_url, proxies=None) -> Result:
+        query = _url_query(note_url)
+        data = {
+            "source_note_id": _url_id(note_url),
+            "image_formats": IMAGE_FORMATS,
+            "extra": {"need_body_topic": "1"},
+            "xsec_source": query.get("xsec_source", "pc_search"),
+            "xsec_token": query.get("xsec_token", ""),
+        }
+        return await self._request("POST", "/api/sns/web/v1/feed", data=data, proxies=proxies)
+
+    async def _user_notes_page(self, user_url, cursor="", proxies=None) -> Result:
+        query = _url_query(user_url)
+        params = {
+            "num": "30",
+            "cursor": cursor,
+            "user_id": _url_id(user_url),
+            "image_formats": ",".join(IMAGE_FORMATS),
+            "xsec_token": query.get("xsec_token", ""),
+            "xsec_source": query.get("xsec_source", "pc_feed"),
+        }
+        return await self._request("GET", "/api/sns/web/v1/user_posted", params=params, proxies=proxies)
+
+    async def _comment_page(self, note_url, cursor="", proxies=None) -> Result:
+        params = {
+            "note_id": _url_id(note_url),
+            "cursor": cursor,
+            "top_comment_id": "",
+            "image_formats": ",".join(IMAGE_FORMATS),
+            "xsec_token": _url_query(note_url).get("xsec_token", ""),
+        }
+        return await self._request("GET", "/api/sns/web/v2/comment/page", params=params, proxies=proxies)
+
+    async def _sub_comment_page(self, note_url, root_comment_id, cursor="", proxies=None) -> Result:
+        params = {
+            "note_id": _url_id(note_url),
+            "root_comment_id": root_comment_id,
+            "num": "10",
+            "cursor": cursor,
+            "image_formats": ",".join(IMAGE_FORMATS),
+            "top_comment_id": "",
+            "xsec_token": _url_query(note_url).get("xsec_token", ""),
+        }
+        return await self._request("GET", "/api/sns/web/v2/comment/sub/page", params=params, proxies=proxies)
+
+    async def _search_page(self, keyword, page, search_id, sort="general", note_type=0, proxies=None) -> Result:
+        data = {
+            "keyword": keyword,
+            "page": page,
+            "page_size": 20,
+            "search_id": search_id,
+            "sort": sort,
+            "note_type": note_type,
+            "ext_flags": [],
+            "image_formats": IMAGE_FORMATS,
+        }
+        return await self._request("POST", "/api/sns/web/v1/search/notes", data=data, proxies=proxies)
+
+    async def _expand_sub_comments(self, note_url, comment, proxies=None):
+        """补全单条一级评论下未展开的子评论"""
+        if not comment.get("sub_comment_has_more"):
+            return
+        pages = self.iter_sub_comments(note_url, comment["id"], comment.get("sub_comment_cursor", ""), proxies=proxies)
+        async for page in pages:
+            comment.setdefault("sub_comments", []).extend(page.items)
+
+    def iter_user_notes(self, user_url, cursor="", limit=None, proxies=None) -> AsyncIterator[Page]:
+        """
+        逐页获取用户笔记
+
+        Args:
+            user_url: 用户主页URL
+            cursor: 续传令牌，从上次中断的位置继续
+            limit: 最多返回的笔记数量
+            proxies: 代理配置
+
+        Yields:
+            Page: 每页笔记及续传令牌；接口失败时抛出 XHSExtractError
+        """
+        async def fetch(cursor):
+            success, msg, res_json = await self._user_notes_page(user_url, cursor, proxies)
+            if not success:
+                raise XHSExtractError(f"获取用户笔记失败: {msg}")
+            data = res_json["data"]
+            return data.get("notes", []), str(data.get("cursor", "")), bool(data.get("has_more"))
+
+        return iter_pages(fetch, cursor, limit)
+
+    def iter_note_comments(self, note_url, cursor="", limit=None, expand_sub_comments=True, proxies=None) -> AsyncIterator[Page]:
+        """
+        逐页获取笔记的一级评论
+
+        Args:
+            note_url: 笔记URL
+            cursor: 续传令牌，从上次中断的位置继续
+            limit: 最多返回的一级评论数量
+            expand_sub_comments: 是否补全每条评论下未展开的子评论
+            proxies: 代理配置
+
+        Yields:
+            Page: 每页评论及续传令牌；接口失败时抛出 XHSExtractError
+        """
+        async def fetch(cursor):
+            success, msg, res_json = await self._comment_page(note_url, cursor, proxies)
+            if not success:
+                raise XHSExtractError(f"获取评论失败: {msg}")
+            data = res_json["data"]
+            comments = data.get("comments", [])
+            if expand_sub_comments:
+                for comment in comments:
+                    await self._expand_sub_comments(note_url, comment, proxies)
+            return comments, str(data.get("cursor", "")), bool(data.get("has_more"))
+
+        return iter_pages(fetch, cursor, limit)
+
+    def iter_sub_comments(self, note_url, root_comment_id, cursor="", limit=None, proxies=None) -> AsyncIterator[Page]:
+        """
+        逐页获取一级评论下的子评论
+
+        Args:
+            note_url: 笔记URL
+            root_comment_id: 一级评论ID
+            cursor: 续传令牌，一般取一级评论的 sub_comment_cursor
+            limit: 最多返回的子评论数量
+            proxies: 代理配置
+
+        Yields:
+            Page: 每页子评论及续传令牌；接口失败时抛出 XHSExtractError
+        """
+        async def fetch(cursor):
+            success, msg, res_json = await self._sub_comment_page(note_url, root_comment_id, cursor, proxies)
+            if not success:
+                raise XHSExtractError(f"获取子评论失败: {msg}")
+            data = res_json["data"]
+            return data.get("comments", []), str(data.get("cursor", "")), bool(data.get("has_more"))
+
+        return iter_pages(fetch, cursor, limit)
+
+    def iter_search_notes(self, keyword, cursor="", limit=None, sort="general", note_type=0, proxies=None) -> AsyncIterator[Page]:
+        """
+        逐页获取搜索结果
+
+        Args:
+            keyword: 搜索关键词
+            cursor: 续传令牌，从上次中断的位置继续
+            limit: 最多返回的笔记数量
+            sort: 排序方式，general、time_descending、popularity_descending
+            note_type: 笔记类型，0(全部)、1(视频)、2(图文)
+            proxies: 代理配置
+
+        Yields:
+            Page: 每页笔记及续传令牌；接口失败时抛出 XHSExtractError
+        """
+        async def fetch(cursor):
+            # 搜索接口按页码翻页，令牌格式为 "search_id:页码"
+            search_id, _, page = cursor.partition(":") if cursor else (_generate_search_id(), "", "1")
+            page = int(page or 1)
+            success, msg, res_json = await self._search_page(keyword, page, search_id, sort, note_type, proxies)
+            if not success:
+                raise XHSExtractError(f"搜索失败: {msg}")
+            data = res_json["data"]
+            return data.get("items", []), f"{search_id}:{page + 1}", bool(data.get("has_more"))
+
+        return iter_pages(fetch, cursor, limit)
+
+    async def get_note_info(self, note_url, proxies=None):
+        """
+        获取小红书笔记信息
+
+        Args:
+            note_url: 笔记URL
+            proxies: 代理配置
+
+        Returns:
+            (success, msg, note_info): 成功状态、消息和笔记数据
+        """
+        # 同一笔记的并发请求合并为一次上游请求
+        return await self.flights.do(
+            f"note:{note_id_from_url(note_url)}",
+            lambda: self._get_note_info(note_url, proxies),
+        )
+
+    async def _get_note_info(self, note_url, proxies=None):
+        """经过缓存获取笔记信息"""
+        if self.cache is None:
+            return await self._fetch_note_info(note_url, proxies)
+
+        failure = []
+
+        async def fetch():
+            success, msg, note_info = await self._fetch_note_info(note_url, proxies)
+            if not success:
+                failure.append((success, msg, note_info))
+            return note_info
+
+        note_info = await self.cache.aget_or_fetch(f"service:{note_id_from_url(note_url)}", fetch)
+        if note_info:
+            return True, "获取笔记成功", note_info
+        return failure[0] if failure else (False, "获取笔记失败", None)
+
+    async def _fetch_note_info(self, note_url, proxies=None):
+        """请求接口获取笔记信息，不经过缓存"""
+        try:
+            if self.hedger is not None:
+                success, msg, note_info = await self.hedger.run(lambda: self._note_feed(note_url, proxies))
+            else:
+                success, msg, note_info = await self._note_feed(note_url, proxies)
+            if success:
+                note_info = note_info['data']['items'][0]
+                note_info['url'] = note_url
+                note_info = handle_note_info(note_info)
+                return True, "获取笔记成功", note_info
+            return False, f"API调用失败: {msg}", None
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.exception(f"获取笔记信息异常: {e}")
+            return False, f"获取笔记异常: {str(e)}", None
+
+    async def get_note_info_batch(
+        self,
+        note_urls: Iterable[str],
+        concurrency=32,
+        rate_per_host=None,
+        ordered=False,
+        proxies=None,
+    ) -> AsyncIterator[Tuple[str, bool, str, Any]]:
+        """
+        批量获取笔记信息，按 note_id 去重后并发请求
+
+        Args:
+            note_urls: 笔记URL的可迭代对象
+            concurrency: 最大并发请求数
+            rate_per_host: 每个主机每秒最多请求数，None 表示不限速
+            ordered: 为 True 时按输入顺序返回，否则按完成顺序返回
+            proxies: 代理配置
+
+        Yields:
+            (url, success, msg, note_info): 每个输入链接对应一条结果，重复链接共享同一次请求
+        """
+        urls = list(note_urls)
+        groups = OrderedDict()
+        for url in urls:
+            groups.setdefault(note_id_from_url(url), []).append(url)
+
+        stats = BatchStats(total=len(urls), unique=len(groups))
+        limiter = HostRateLimiter(rate_per_host)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(note_id, url):
+            async with semaphore:
+                await limiter.wait_async(urllib.parse.urlparse(url).netloc)
+                try:
+                    return note_id, await self.get_note_info(url, proxies)
+                except CircuitOpenError as e:
+                    return note_id, (False, e.message, None)
+
+        tasks = {note_id: asyncio.create_task(fetch(note_id, group[0])) for note_id, group in groups.items()}
+        try:
+            if ordered:
+                done = {}
+                for url in urls:
+                    note_id = note_id_from_url(url)
+                    if note_id not in done:
+                        _, done[note_id] = await tasks[note_id]
+                        stats.record(done[note_id][0])
+                    yield (url, *done[note_id])
+            else:
+                for next_done in asyncio.as_completed(tasks.values()):
+                    note_id, (success, msg, note_info) = await next_done
+                    stats.record(success)
+                    for url in groups[note_id]:
+                        yield url, success, msg, note_info
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            self.last_batch_stats = stats.finish()
+            logger.info(f"批量获取笔记完成: {stats.summary()}")
+
+    async def search_notes(self, keyword, limit=10, sort="general", note_type=0, proxies=None):
+        """
+        搜索小红书笔记
+
+        Args:
+            keyword: 搜索关键词
+            limit: 获取数量限制
+            sort: 排序方式，general(综合排序)、time_descending(时间排序)、popularity_descending(热度排序)
+            note_type: 笔记类型，0(全部)、1(视频)、2(图文)
+            proxies: 代理配置
+
+        Returns:
+            (success, msg, notes): 成功状态、消息和笔记列表
+        """
+        try:
+            notes = [note async for note in iter_items(
+                self.iter_search_notes(keyword, limit=limit, sort=sort, note_type=note_type, proxies=proxies)
+            )]
+            return True, f"搜索成功，获取到{len(notes)}条结果", notes
+        except CircuitOpenError:
+            raise
+        except XHSExtractError as e:
+            return False, e.message, None
+        except Exception as e:
+            logger.exception(f"搜索笔记异常: {e}")
+            return False, f"搜索异常: {str(e)}", None
+
+    async def get_user_info(self, user_url, proxies=None):
+        """
+        获取用户信息
+
+        Args:
+            user_url: 用户主页URL
+            proxies: 代理配置
+
+        Returns:
+            (success, msg, user_info): 成功状态、消息和用户信息
+        """
+        try:
+            params = {"target_user_id": _url_id(user_url)}
+            success, msg, user_info = await self._request(
+                "GET", "/api/sns/web/v2/user/otherinfo", params=params, proxies=proxies
+            )
+            if success:
+                return True, "获取用户信息成功", user_info['data']
+            return False, f"获取用户信息失败: {msg}", None
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.exception(f"获取用户信息异常: {e}")
+            return False, f"获取异常: {str(e)}", None
+
+    async def get_note_comments(self, note_url, proxies=None):
+        """
+        获取笔记的所有评论
+
+        Args:
+            note_url: 笔记URL
+            proxies: 代理配置
+
+        Returns:
+            (success, msg, comments): 成功状态、消息和评论列表
+        """
+        try:
+            comments = [comment async for comment in iter_items(self.iter_note_comments(note_url, proxies=proxies))]
+            return True, f"获取评论成功，共{len(comments)}条", comments
+        except CircuitOpenError:
+            raise
+        except XHSExtractError as e:
+            return False, e.message, None
+        except Exception as e:
+            logger.exception(f"获取笔记评论异常: {e}")
+            return False, f"获取异常: {str(e)}", None
+
+    async def get_note_comment_tree(self, note_url, concurrency=8, limit=None, proxies=None):
+        """
+        获取笔记的精简评论树，子评论线程并发展开
+
+        Args:
+            note_url: 笔记URL
+            concurrency: 同时展开的子评论线程数
+            limit: 最多获取的一级评论数量
+            proxies: 代理配置
+
+        Returns:
+            (success, msg, comments): 成功状态、消息和评论节点列表
+            (id、parent_id、user_id、content、like_count、time)
+        """
+        from src.services.xhs_comments import CommentFetcher
+
+        fetcher = CommentFetcher(self, concurrency=concurrency, proxies=proxies)
+        try:
+            nodes = await fetcher.fetch(note_url, limit=limit)
+            msg = f"获取评论成功，共{len(nodes)}条"
+            if fetcher.errors:
+                msg += f"，{len(fetcher.errors)}条评论的回复获取失败"
+            return True, msg, [node.as_dict() for node in nodes]
+        except CircuitOpenError:
+            raise
+        except XHSExtractError as e:
+            return False, e.message, None
+        except Exception as e:
+            logger.exception(f"获取笔记评论异常: {e}")
+            return False, f"获取异常: {str(e)}", None
+
+    async def get_search_keywords(self, keyword, proxies=None):
+        """
+        获取搜索关键词推荐
+
+        Args:
+            keyword: 搜索关键词
+            proxies: 代理配置
+
+        Returns:
+            (success, msg, keywords): 成功状态、消息和关键词列表
+        """
+        try:
+            params = {"keyword": urllib.parse.quote(keyword)}
+            success, msg, keywords = await self._request(
+                "GET", "/api/sns/web/v1/search/recommend", params=params, proxies=proxies
+            )
+            if success:
+                keywords_list = keywords['data']['keyword_list']
+                return True, f"获取搜索关键词成功，共{len(keywords_list)}条", keywords_list
+            return False, f"获取搜索关键词失败: {msg}", None
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.exception(f"获取搜索关键词异常: {e}")
+            return False, f"获取异常: {str(e)}", None
+
+    async def get_user_notes(self, user_url, proxies=None):
+        """
+        获取用户的所有笔记
+
+        Args:
+            user_url: 用户主页URL
+            proxies: 代理配置
+
+        Returns:
+            (success, msg, notes): 成功状态、消息和笔记列表
+        """
+        try:
+            notes = [note async for note in iter_items(self.iter_user_notes(user_url, proxies=proxies))]
+            return True, f"获取成功，该用户共有{len(notes)}条笔记", notes
+        except CircuitOpenError:
+            raise
+        except XHSExtractError as e:
+            return False, e.message, None
+        except Exception as e:
+            logger.exception(f"获取用户笔记异常: {e}")
+            return False, f"获取异常: {str(e)}", None
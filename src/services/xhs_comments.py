@@ -0,0 +1,147 @@
+# src/services/xhs_comments.py
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass, asdict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from loguru import logger
+
+from src.utils.exceptions import CircuitOpenError
+
+if TYPE_CHECKING:
+    from src.services.xhs_async_service import AsyncXHSService
+
+
+@dataclass
+class CommentNode:
+    """精简后的评论节点，一级评论的 parent_id 为 None"""
+    id: str
+    parent_id: Optional[str]
+    user_id: str
+    content: str
+    like_count: int
+    time: int
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def parse_count(value) -> int:
+    """解析点赞数，兼容 "1.2万" 这类展示文本"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value or "").strip()
+    if not text:
+        return 0
+    try:
+        if text.endswith("万"):
+            return int(float(text[:-1]) * 10000)
+        return int(float(text))
+    except ValueError:
+        return 0
+
+
+def compact_comment(raw: Dict[str, Any], root_id: Optional[str] = None) -> CommentNode:
+    """
+    将接口返回的评论转换为精简节点
+
+    子评论的 parent_id 优先取其回复的评论，否则挂在所属一级评论下。
+    """
+    parent_id = None
+    if root_id is not None:
+        parent_id = (raw.get("target_comment") or {}).get("id") or root_id
+    return CommentNode(
+        id=str(raw.get("id", "")),
+        parent_id=parent_id,
+        user_id=str((raw.get("user_info") or {}).get("user_id", "")),
+        content=raw.get("content", ""),
+        like_count=parse_count(raw.get("like_count")),
+        time=int(raw.get("create_time") or 0),
+    )
+
+
+def build_tree(nodes: List[CommentNode]) -> Dict[Optional[str], List[CommentNode]]:
+    """按 parent_id 分组，children[None] 为一级评论"""
+    children: Dict[Optional[str], List[CommentNode]] = defaultdict(list)
+    for node in nodes:
+        children[node.parent_id].append(node)
+    return children
+
+
+class CommentFetcher:
+    """
+    评论抓取引擎
+
+    按顺序遍历一级评论分页，同时用有界信号量并发展开各条一级评论下的子评论分页，
+    大量子评论的热门笔记不再逐条串行等待。
+    """
+
+    def __init__(self, service: "AsyncXHSService", concurrency: int = 8, proxies=None):
+        """
+        :param service: 异步小红书服务
+        :param concurrency: 同时展开的子评论线程数
+        :param proxies: 代理配置
+        """
+        self.service = service
+        self.concurrency = concurrency
+        self.proxies = proxies
+        self.errors: List[str] = []
+
+    async def _expand(self, semaphore, note_url, root: Dict[str, Any]) -> List[CommentNode]:
+        async with semaphore:
+            nodes = []
+            pages = self.service.iter_sub_comments(
+                note_url, root["id"], root.get("sub_comment_cursor", ""), proxies=self.proxies
+            )
+            try:
+                async for page in pages:
+                    nodes.extend(compact_comment(sub, root["id"]) for sub in page.items)
+            except CircuitOpenError:
+                # 平台熔断时其余线程同样会失败，直接交给调用方
+                raise
+            except Exception as e:
+                # 单条线程失败只影响该线程，保留已获取的部分
+                self.errors.append(f"{root['id']}: {e}")
+                logger.warning(f"展开子评论失败 {root['id']}: {e}")
+            return nodes
+
+    async def fetch(self, note_url: str, limit: Optional[int] = None) -> List[CommentNode]:
+        """
+        获取笔记的全部评论
+
+        :param note_url: 笔记URL
+        :param limit: 最多获取的一级评论数量
+        :return: 评论节点列表，每条一级评论后紧跟其子评论
+        """
+        self.errors = []
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # (一级评论节点, 随页面返回的子评论, 展开任务)
+        threads = []
+        try:
+            pages = self.service.iter_note_comments(
+                note_url, limit=limit, expand_sub_comments=False, proxies=self.proxies
+            )
+            async for page in pages:
+                for root in page.items:
+                    inline = [compact_comment(sub, root["id"]) for sub in root.get("sub_comments") or []]
+                    task = None
+                    if root.get("sub_comment_has_more"):
+                        task = asyncio.create_task(self._expand(semaphore, note_url, root))
+                    threads.append((compact_comment(root), inline, task))
+
+            nodes: List[CommentNode] = []
+            for root_node, inline, task in threads:
+                nodes.append(root_node)
+                nodes.extend(inline)
+                if task is not None:
+                    nodes.extend(await task)
+            return nodes
+        finally:
+            for _, _, task in threads:
+                if task is None:
+                    continue
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # 提前退出时取走其余线程的异常（如熔断），避免未读取异常的警告
+                    task.exception()
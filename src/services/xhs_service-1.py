@@ -1,17 +1,31 @@
 import requests
-import re
 import json
 from typing import Optional, Dict, Any
 
+from src.utils.batch import note_id_from_url
+from src.utils.initial_state import extract_initial_state, first_note_detail
+from src.utils.note_cache import NoteCache
+
 class XHSContentExtractor:
     @staticmethod
-    def extract_content(url: str) -> Optional[Dict[str, Any]]:
+    def extract_content(url: str, cache: Optional[NoteCache] = None) -> Optional[Dict[str, Any]]:
         """
         提取小红书作品内容
         
         :param url: 小红书作品链接
+        :param cache: 可选的笔记缓存，按 note_id 复用提取结果
         :return: 作品详细信息字典
         """
+        if cache is not None:
+            return cache.get_or_fetch(
+                f"extractor:{note_id_from_url(url)}",
+                lambda: XHSContentExtractor._extract_content(url),
+            )
+        return XHSContentExtractor._extract_content(url)
+
+    @staticmethod
+    def _extract_content(url: str) -> Optional[Dict[str, Any]]:
+        """请求页面并提取作品内容，不经过缓存"""
         try:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36',
@@ -22,33 +36,19 @@ class XHSContentExtractor:
             response = requests.get(url, headers=headers)
             html = response.text
             
-            # 使用更健壮的正则提取
-            pattern = r'window\.__INITIAL_STATE__\s*=\s*({.*?})\s*(?:;|$)'
-            match = re.search(pattern, html, re.DOTALL | re.MULTILINE)
+            # 线性扫描提取状态数据，避免正则回溯与截断
+            try:
+                initial_state = extract_initial_state(html)
+            except json.JSONDecodeError as e:
+                print(f"JSON解析错误: {e}")
+                return None
             
-            if match:
-                # 尝试更安全的 JSON 解析
-                initial_state_str = match.group(1)
-                
-                # 移除 JavaScript 特殊字符和转义
-                initial_state_str = initial_state_str.replace('\n', '').replace('\r', '')
-                
-                try:
-                    initial_state = json.loads(initial_state_str)
-                except json.JSONDecodeError as e:
-                    print(f"JSON解析错误: {e}")
-                    print(f"出错的JSON片段: {initial_state_str[:500]}...")  # 打印前500字符
-                    return None
-                
-                # 深度提取数据的更健壮方法
-                note_map = initial_state.get('noteDetailMap', {})
-                if not note_map:
+            if initial_state is not None:
+                note_detail = first_note_detail(initial_state)
+                if not note_detail:
                     print("未找到作品详细信息")
                     return None
                 
-                # 获取第一个作品的详细信息
-                note_key = list(note_map.keys())[0]
-                note_detail = note_map[note_key].get('note', {})
                 user = note_detail.get('user', {})
                 interact_info = note_detail.get('interactInfo', {})
                 
@@ -74,5 +74,5 @@ class XHSContentExtractor:
             return None
 
 # 便捷函数
-def extract_xhs_content(url: str) -> Optional[Dict[str, Any]]:
-    return XHSContentExtractor.extract_content(url)
\ No newline at end of file
+def extract_xhs_content(url: str, cache: Optional[NoteCache] = None) -> Optional[Dict[str, Any]]:
+    return XHSContentExtractor.extract_content(url, cache)
\ No newline at end of file
@@ -1,7 +1,10 @@
 # src/services/xhs_service.py
 import os
 import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from urllib.parse import urlparse
 from loguru import logger
 
 
@@ -15,27 +18,163 @@ from apis.pc_apis import XHS_Apis
 from xhs_utils.data_util import handle_note_info, download_note
 from xhs_utils.common_utils import init as xhs_init
 
+from src.services.xhs_signer import get_shared_sign_pool, install_sign_pool, uninstall_sign_pool
+from src.utils.batch import BatchStats, note_id_from_url
+from src.utils.circuit_breaker import shared_breakers
+from src.utils.cookie_pool import CookiePool, is_risk_error
+from src.utils.exceptions import CircuitOpenError
+from src.utils.proxy_pool import is_proxy_error
+from src.utils.rate_limit import HostRateLimiter
+from src.utils.singleflight import SingleFlight
+
+# 可选的签名后端：execjs 为 Spider_XHS 默认实现，node_pool 为常驻 Node 进程池
+SIGN_BACKENDS = ("execjs", "node_pool")
+
+# 熔断器名称，XHSService 与 AsyncXHSService 共用
+PLATFORM = "xhs"
+
+
+def setup_sign_backend(sign_backend="execjs", sign_workers=4):
+    """
+    按名称启用签名后端
+
+    Returns:
+        node_pool 后端返回共享的签名进程池，execjs 返回 None
+    """
+    if sign_backend not in SIGN_BACKENDS:
+        raise ValueError(f"不支持的签名后端: {sign_backend}，可选: {SIGN_BACKENDS}")
+    if sign_backend == "node_pool":
+        pool = get_shared_sign_pool(sign_workers)
+        install_sign_pool(pool)
+        return pool
+    return None
+
+
+def teardown_sign_backend(pool):
+    """撤销 setup_sign_backend 对签名上下文的替换，pool 为其返回值"""
+    if pool is not None:
+        uninstall_sign_pool(pool)
+
+
+def load_cookies(cookies_file=None):
+    """从文件加载Cookie，文件不存在时使用环境变量中的配置"""
+    if cookies_file and os.path.exists(cookies_file):
+        with open(cookies_file, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    else:
+        # 从环境变量加载Cookie
+        from src.libs.spider_xhs.xhs_utils.common_utils import load_env
+        return load_env()
+
+
+def load_cookie_pool(cookie_pool=None):
+    """cookie_pool 可以是 CookiePool 实例或账号文件/目录路径，None 表示不使用Cookie池"""
+    if cookie_pool is None or isinstance(cookie_pool, CookiePool):
+        return cookie_pool
+    return CookiePool.from_path(cookie_pool)
+
+
+def initial_cookies(cookies_file=None, cookie_pool=None):
+    """未提供Cookie文件且配置了Cookie池时，以池中第一个账号作为默认Cookie"""
+    if cookie_pool is not None and not (cookies_file and os.path.exists(cookies_file)):
+        return cookie_pool.accounts[0].cookies
+    return load_cookies(cookies_file)
+
+
 class XHSService:
-    def __init__(self, cookies_file=None):
+    def __init__(self, cookies_file=None, sign_backend="execjs", sign_workers=4, cache=None, cookie_pool=None,
+                 proxy_pool=None, hedger=None, flights=None, breakers=None):
         """
         初始化小红书服务
         
         Args:
             cookies_file: Cookie文件路径，如不提供则使用环境变量中的配置
+            sign_backend: 签名后端，execjs(每次签名启动新进程) 或 node_pool(常驻进程池)
+            sign_workers: node_pool 后端的常驻进程数量
+            cache: 可选的 NoteCache，按 note_id 缓存 get_note_info 的结果
+            cookie_pool: 可选的多账号Cookie池（CookiePool 或账号文件/目录路径），
+                配置后每次请求从池中选取账号
+            proxy_pool: 可选的 ProxyPool，调用时未显式传入 proxies 的请求从池中选择最快的代理
+            hedger: 可选的 Hedger，get_note_info 超过近期耗时分位仍未返回时，
+                换一个账号/代理再请求一次，取先成功的结果
+            flights: 可选的 SingleFlight，多个服务实例共用时跨实例合并请求，默认每个实例独立
+            breakers: 熔断器注册表，默认使用进程内共享的注册表；出现风控、代理错误或异常过多时
+                熔断，熔断期间所有接口直接抛出 CircuitOpenError
         """
+        self.cache = cache
+        self.hedger = hedger
+        self.flights = flights or SingleFlight()
+        self.breakers = breakers or shared_breakers
+        self.breaker = self.breakers.get(PLATFORM, error_factory=CircuitOpenError)
+        self.sign_pool = setup_sign_backend(sign_backend, sign_workers)
         self.xhs_apis = XHS_Apis()
-        self.cookies_str = self._load_cookies(cookies_file)
+        self.cookie_pool = load_cookie_pool(cookie_pool)
+        self.cookies_str = initial_cookies(cookies_file, self.cookie_pool)
+        self.proxy_pool = proxy_pool
         _, self.base_path = xhs_init()
+        self.last_batch_stats = None
+
+    def sign_stats(self):
+        """签名耗时统计，仅 node_pool 后端可用"""
+        return self.sign_pool.stats() if self.sign_pool else None
+
+    def close(self):
+        """撤销 node_pool 后端对签名上下文的替换，共享的签名进程池继续保留"""
+        pool, self.sign_pool = self.sign_pool, None
+        teardown_sign_backend(pool)
         
+    def cookie_stats(self):
+        """各账号的请求数与错误率，未配置Cookie池时返回 None"""
+        return self.cookie_pool.stats() if self.cookie_pool else None
+
+    def breaker_stats(self):
+        """熔断器状态，用于监控"""
+        return self.breaker.snapshot()
+
+    def flight_stats(self):
+        """请求合并统计：总请求数、实际执行数与被合并的请求数"""
+        return dict(self.flights.stats)
+
     def _load_cookies(self, cookies_file):
         """加载Cookie"""
-        if cookies_file and os.path.exists(cookies_file):
-            with open(cookies_file, 'r', encoding='utf-8') as f:
-                return f.read().strip()
-        else:
-            # 从环境变量加载Cookie
-            from src.libs.spider_xhs.xhs_utils.common_utils import load_env
-            return load_env()
+        return load_cookies(cookies_file)
+
+    def _call_api(self, call, proxies=None):
+        """
+        使用一个账号的Cookie和一个代理调用 Spider_XHS 接口
+
+        Args:
+            call: 接收 (cookie字符串, proxies)、返回 (success, msg, data) 的函数
+            proxies: 显式指定的代理配置；为空且配置了代理池时从池中选择
+
+        Returns:
+            call 的返回值；配置了Cookie池/代理池时按结果更新账号与代理的统计
+
+        Raises:
+            CircuitOpenError: 平台熔断中
+        """
+        with self.breaker.guard() as guard:
+            success, msg, data = self._call_with_proxy(call, proxies)
+            if not success and (is_risk_error(msg) or is_proxy_error(msg)):
+                guard.fail()
+            return success, msg, data
+
+    def _call_with_proxy(self, call, proxies):
+        if proxies is not None or self.proxy_pool is None:
+            return self._call_with_cookies(call, proxies)
+        with self.proxy_pool.track() as tracker:
+            success, msg, data = self._call_with_cookies(call, tracker.proxies)
+            if not success and is_proxy_error(msg):
+                tracker.fail()
+            return success, msg, data
+
+    def _call_with_cookies(self, call, proxies):
+        if self.cookie_pool is None:
+            return call(self.cookies_str, proxies)
+        with self.cookie_pool.lease() as lease:
+            success, msg, data = call(lease.cookies, proxies)
+            lease.report(success, msg)
+            return success, msg, data
     
     def get_note_info(self, note_url, proxies=None):
         """
@@ -48,18 +187,105 @@ class XHSService:
         Returns:
             (success, msg, note_info): 成功状态、消息和笔记数据
         """
+        # 同一笔记的并发请求合并为一次上游请求
+        return self.flights.do(
+            f"note:{note_id_from_url(note_url)}",
+            lambda: self._get_note_info(note_url, proxies),
+        )
+
+    def _get_note_info(self, note_url, proxies=None):
+        """经过缓存获取笔记信息"""
+        if self.cache is None:
+            return self._fetch_note_info(note_url, proxies)
+
+        failure = []
+
+        def fetch():
+            success, msg, note_info = self._fetch_note_info(note_url, proxies)
+            if not success:
+                failure.append((success, msg, note_info))
+            return note_info
+
+        note_info = self.cache.get_or_fetch(f"service:{note_id_from_url(note_url)}", fetch)
+        if note_info:
+            return True, "获取笔记成功", note_info
+        return failure[0] if failure else (False, "获取笔记失败", None)
+
+    def _fetch_note_info(self, note_url, proxies=None):
+        """请求接口获取笔记信息，不经过缓存"""
         try:
-            success, msg, note_info = self.xhs_apis.get_note_info(note_url, self.cookies_str, proxies)
+            def fetch():
+                return self._call_api(
+                    lambda cookies, proxies: self.xhs_apis.get_note_info(note_url, cookies, proxies),
+                    proxies,
+                )
+
+            # 每次 fetch 重新借用账号与代理，对冲请求自然落在另一组账号/代理上
+            success, msg, note_info = self.hedger.run_sync(fetch) if self.hedger else fetch()
             if success:
                 note_info = note_info['data']['items'][0]
                 note_info['url'] = note_url
                 note_info = handle_note_info(note_info)
                 return True, "获取笔记成功", note_info
             return False, f"API调用失败: {msg}", None
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.exception(f"获取笔记信息异常: {e}")
             return False, f"获取笔记异常: {str(e)}", None
     
+    def get_note_info_batch(self, note_urls, concurrency=8, rate_per_host=None, ordered=False, proxies=None):
+        """
+        批量获取笔记信息，按 note_id 去重后并发请求
+
+        Args:
+            note_urls: 笔记URL的可迭代对象
+            concurrency: 并发线程数
+            rate_per_host: 每个主机每秒最多请求数，None 表示不限速
+            ordered: 为 True 时按输入顺序返回，否则按完成顺序返回
+            proxies: 代理配置
+
+        Yields:
+            (url, success, msg, note_info): 每个输入链接对应一条结果，重复链接共享同一次请求
+        """
+        urls = list(note_urls)
+        groups = OrderedDict()
+        for url in urls:
+            groups.setdefault(note_id_from_url(url), []).append(url)
+
+        stats = BatchStats(total=len(urls), unique=len(groups))
+        limiter = HostRateLimiter(rate_per_host)
+
+        def fetch(url):
+            limiter.wait(urlparse(url).netloc)
+            try:
+                return self.get_note_info(url, proxies)
+            except CircuitOpenError as e:
+                return False, e.message, None
+
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        try:
+            futures = {note_id: executor.submit(fetch, group[0]) for note_id, group in groups.items()}
+            if ordered:
+                done = {}
+                for url in urls:
+                    note_id = note_id_from_url(url)
+                    if note_id not in done:
+                        done[note_id] = futures[note_id].result()
+                        stats.record(done[note_id][0])
+                    yield (url, *done[note_id])
+            else:
+                owners = {future: note_id for note_id, future in futures.items()}
+                for future in as_completed(owners):
+                    success, msg, note_info = future.result()
+                    stats.record(success)
+                    for url in groups[owners[future]]:
+                        yield url, success, msg, note_info
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.last_batch_stats = stats.finish()
+            logger.info(f"批量获取笔记完成: {stats.summary()}")
+
     def download_note_media(self, note_url, save_path=None, proxies=None):
         """
         下载笔记的媒体文件(图片/视频)
@@ -80,6 +306,8 @@ class XHSService:
             media_path = save_path if save_path else self.base_path['media']
             result_path = download_note(note_info, media_path)
             return True, "下载成功", result_path
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.exception(f"下载笔记媒体异常: {e}")
             return False, f"下载异常: {str(e)}", None
@@ -99,12 +327,17 @@ class XHSService:
             (success, msg, notes): 成功状态、消息和笔记列表
         """
         try:
-            success, msg, notes = self.xhs_apis.search_some_note(
-                keyword, limit, self.cookies_str, sort, note_type, proxies
+            success, msg, notes = self._call_api(
+                lambda cookies, proxies: self.xhs_apis.search_some_note(
+                    keyword, limit, cookies, sort, note_type, proxies
+                ),
+                proxies,
             )
             if success:
                 return True, f"搜索成功，获取到{len(notes)}条结果", notes
             return False, f"搜索失败: {msg}", None
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.exception(f"搜索笔记异常: {e}")
             return False, f"搜索异常: {str(e)}", None
@@ -128,11 +361,16 @@ class XHSService:
             urlParse = urllib.parse.urlparse(user_url)
             user_id = urlParse.path.split("/")[-1]
             
-            success, msg, user_info = self.xhs_apis.get_user_info(user_id, self.cookies_str, proxies)
+            success, msg, user_info = self._call_api(
+                lambda cookies, proxies: self.xhs_apis.get_user_info(user_id, cookies, proxies),
+                proxies,
+            )
             if success:
                 user_info = user_info['data']
                 return True, "获取用户信息成功", user_info
             return False, f"获取用户信息失败: {msg}", None
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.exception(f"获取用户信息异常: {e}")
             return False, f"获取异常: {str(e)}", None
@@ -149,10 +387,15 @@ class XHSService:
             (success, msg, comments): 成功状态、消息和评论列表
         """
         try:
-            success, msg, comments = self.xhs_apis.get_note_all_comment(note_url, self.cookies_str, proxies)
+            success, msg, comments = self._call_api(
+                lambda cookies, proxies: self.xhs_apis.get_note_all_comment(note_url, cookies, proxies),
+                proxies,
+            )
             if success:
                 return True, f"获取评论成功，共{len(comments)}条", comments
             return False, f"获取评论失败: {msg}", None
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.exception(f"获取笔记评论异常: {e}")
             return False, f"获取异常: {str(e)}", None
@@ -169,11 +412,16 @@ class XHSService:
             (success, msg, keywords): 成功状态、消息和关键词列表
         """
         try:
-            success, msg, keywords = self.xhs_apis.get_search_keyword(keyword, self.cookies_str, proxies)
+            success, msg, keywords = self._call_api(
+                lambda cookies, proxies: self.xhs_apis.get_search_keyword(keyword, cookies, proxies),
+                proxies,
+            )
             if success:
                 keywords_list = keywords['data']['keyword_list']
                 return True, f"获取搜索关键词成功，共{len(keywords_list)}条", keywords_list
             return False, f"获取搜索关键词失败: {msg}", None
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.exception(f"获取搜索关键词异常: {e}")
             return False, f"获取异常: {str(e)}", None
@@ -190,10 +438,15 @@ class XHSService:
             (success, msg, notes): 成功状态、消息和笔记列表
         """
         try:
-            success, msg, notes = self.xhs_apis.get_user_all_notes(user_url, self.cookies_str, proxies)
+            success, msg, notes = self._call_api(
+                lambda cookies, proxies: self.xhs_apis.get_user_all_notes(user_url, cookies, proxies),
+                proxies,
+            )
             if success:
                 return True, f"获取成功，该用户共有{len(notes)}条笔记", notes
             return False, f"获取用户笔记失败: {msg}", None
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.exception(f"获取用户笔记异常: {e}")
             return False, f"获取异常: {str(e)}", None
\ No newline at end of file
@@ -0,0 +1,49 @@
+// 常驻签名进程：预加载签名脚本后，按行读取 JSON 请求并返回结果
+// 请求: {"id": 1, "fn": "get_request_headers_params", "args": [...]}
+// 响应: {"id": 1, "result": ...} 或 {"id": 1, "error": "..."}
+const fs = require('fs');
+const vm = require('vm');
+const util = require('util');
+const readline = require('readline');
+
+// stdout 专用于协议输出，签名脚本中的日志改写到 stderr
+const write = (obj) => process.stdout.write(JSON.stringify(obj) + '\n');
+console.log = console.info = console.debug = (...args) => process.stderr.write(util.format(...args) + '\n');
+
+const bundlePath = process.argv[2];
+globalThis.require = require;
+globalThis.module = { exports: {} };
+globalThis.exports = globalThis.module.exports;
+vm.runInThisContext(fs.readFileSync(bundlePath, 'utf-8'), { filename: bundlePath });
+
+const IDENTIFIER = /^[A-Za-z_$][\w$]*$/;
+const functions = new Map();
+
+function lookup(name) {
+    if (!functions.has(name)) {
+        if (!IDENTIFIER.test(name)) {
+            throw new Error(`非法函数名: ${name}`);
+        }
+        const fn = vm.runInThisContext(name);
+        if (typeof fn !== 'function') {
+            throw new Error(`${name} 不是函数`);
+        }
+        functions.set(name, fn);
+    }
+    return functions.get(name);
+}
+
+const rl = readline.createInterface({ input: process.stdin, terminal: false });
+rl.on('line', (line) => {
+    let request;
+    try {
+        request = JSON.parse(line);
+        const result = lookup(request.fn)(...(request.args || []));
+        write({ id: request.id, result: result === undefined ? null : result });
+    } catch (e) {
+        write({ id: request ? request.id : null, error: String(e && e.stack || e) });
+    }
+});
+rl.on('close', () => process.exit(0));
+
+write({ ready: true });
@@ -0,0 +1,262 @@
+# src/services/xhs_signer.py
+import os
+import json
+import time
+import queue
+import threading
+import subprocess
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+
+BASE_DIR = Path(__file__).parent.parent
+SPIDER_XHS_PATH = BASE_DIR / "libs" / "spider_xhs"
+DEFAULT_BUNDLE = SPIDER_XHS_PATH / "static" / "xhs_xs_xsc_56.js"
+WORKER_SCRIPT = Path(__file__).parent / "xhs_sign_worker.js"
+
+
+class SignWorkerError(RuntimeError):
+    """签名进程异常（崩溃、超时或脚本报错）"""
+
+
+class NodeSignWorker:
+    """单个常驻 Node 签名进程，通过 stdin/stdout 按行传输 JSON"""
+
+    def __init__(self, bundle_path=DEFAULT_BUNDLE, node="node", timeout=10.0):
+        self.bundle_path = str(bundle_path)
+        self.node = node
+        self.timeout = timeout
+        self.restarts = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._next_id = 0
+        self.start()
+
+    def start(self):
+        """启动 Node 进程并等待签名脚本加载完成"""
+        env = dict(os.environ)
+        env.setdefault("NODE_PATH", str(SPIDER_XHS_PATH / "node_modules"))
+        self._lines = queue.Queue()
+        self._process = subprocess.Popen(
+            [self.node, str(WORKER_SCRIPT), self.bundle_path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=str(SPIDER_XHS_PATH) if SPIDER_XHS_PATH.exists() else None,
+            env=env,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        threading.Thread(target=self._read_stdout, args=(self._process, self._lines), daemon=True).start()
+        message = self._read_message()
+        if not message.get("ready"):
+            raise SignWorkerError(f"签名进程启动失败: {message}")
+
+    @staticmethod
+    def _read_stdout(process: subprocess.Popen, lines: "queue.Queue[Optional[str]]"):
+        for line in process.stdout:
+            lines.put(line)
+        # 进程退出
+        lines.put(None)
+
+    def _read_message(self) -> Dict[str, Any]:
+        """读取下一条 JSON 消息，跳过签名脚本或 Node 自身输出的非 JSON 行"""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                line = self._lines.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                self.stop()
+                raise SignWorkerError(f"签名进程响应超时({self.timeout}s)")
+            if line is None:
+                raise SignWorkerError(f"签名进程已退出，返回码: {self._process.wait()}")
+            try:
+                message = json.loads(line)
+            except ValueError:
+                message = None
+            if isinstance(message, dict):
+                return message
+            logger.warning(f"忽略签名进程的非 JSON 输出: {line.strip()[:200]}")
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def restart(self):
+        self.stop()
+        self.restarts += 1
+        logger.warning(f"重启签名进程({self.restarts}): {self.bundle_path}")
+        self.start()
+
+    def stop(self):
+        if self._process is None:
+            return
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.wait()
+        self._process.stdin.close()
+
+    def call(self, name: str, *args) -> Any:
+        """
+        调用签名脚本中的函数，进程崩溃时自动重启并重试一次
+
+        Args:
+            name: 函数名
+            args: 函数参数（需可 JSON 序列化）
+
+        Returns:
+            函数返回值
+        """
+        for attempt in range(2):
+            if not self.alive:
+                self.restart()
+            try:
+                return self._call_once(name, args)
+            except (SignWorkerError, OSError) as e:
+                if attempt or self.alive:
+                    raise SignWorkerError(str(e)) from e
+                logger.warning(f"签名进程异常，准备重试: {e}")
+
+    def _call_once(self, name: str, args) -> Any:
+        self._next_id += 1
+        request_id = self._next_id
+        self._process.stdin.write(json.dumps({"id": request_id, "fn": name, "args": list(args)}) + "\n")
+        self._process.stdin.flush()
+        message = self._read_message()
+        if message.get("id") != request_id:
+            # 协议错乱，重启进程丢弃残留输出
+            self.restart()
+            raise SignWorkerError(f"签名响应序号不匹配: {message.get('id')} != {request_id}")
+        if "error" in message:
+            raise SignWorkerError(message["error"])
+        return message.get("result")
+
+
+class NodeSignPool:
+    """
+    常驻 Node 签名进程池
+
+    接口与 ``execjs.compile(...)`` 返回的上下文一致（``call(name, *args)``），
+    可以直接替换 Spider_XHS 中的 ``xhs_util.js``。
+    """
+
+    def __init__(self, size=4, bundle_path=DEFAULT_BUNDLE, node="node", timeout=10.0, history=1000):
+        self.size = size
+        self._workers = [NodeSignWorker(bundle_path, node, timeout) for _ in range(size)]
+        self._idle: "queue.Queue[NodeSignWorker]" = queue.Queue()
+        for worker in self._workers:
+            self._idle.put(worker)
+        self._latencies = deque(maxlen=history)
+        self._count = 0
+        self._errors = 0
+        self._lock = threading.Lock()
+
+    def call(self, name: str, *args) -> Any:
+        worker = self._idle.get()
+        start = time.perf_counter()
+        try:
+            return worker.call(name, *args)
+        except SignWorkerError:
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self._count += 1
+                self._latencies.append(elapsed_ms)
+            logger.debug(f"签名 {name} 耗时 {elapsed_ms:.1f}ms")
+            self._idle.put(worker)
+
+    def stats(self) -> Dict[str, Any]:
+        """签名耗时统计（毫秒），基于最近的调用记录"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            count, errors = self._count, self._errors
+
+        def percentile(p):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+
+        return {
+            "workers": self.size,
+            "count": count,
+            "errors": errors,
+            "restarts": sum(worker.restarts for worker in self._workers),
+            "avg_ms": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p50_ms": percentile(0.5),
+            "p99_ms": percentile(0.99),
+            "max_ms": latencies[-1] if latencies else 0.0,
+        }
+
+    def close(self):
+        for worker in self._workers:
+            worker.stop()
+
+
+_shared_pool: Optional[NodeSignPool] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_sign_pool(size=4) -> NodeSignPool:
+    """获取进程内共享的签名进程池，首次调用时创建"""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = NodeSignPool(size=size)
+        return _shared_pool
+
+
+# 已安装的签名进程池（按安装顺序，同一进程池可出现多次）与被替换前的签名上下文
+_installed = []
+_original_js = None
+
+
+def _xhs_util(module=None):
+    if module is not None:
+        return module
+    from xhs_utils import xhs_util
+    return xhs_util
+
+
+def install_sign_pool(pool: NodeSignPool, module=None):
+    """
+    用签名进程池替换 Spider_XHS 中基于 PyExecJS 的签名上下文
+
+    ``xhs_util.js`` 是进程内全局的绑定，每次安装都需对应一次 uninstall_sign_pool，
+    全部卸载后恢复原来的签名上下文。
+
+    Args:
+        pool: 签名进程池
+        module: 被替换的模块，默认为 xhs_utils.xhs_util
+    """
+    global _original_js
+    xhs_util = _xhs_util(module)
+    with _shared_lock:
+        if not _installed:
+            _original_js = xhs_util.js
+        _installed.append(pool)
+        xhs_util.js = pool
+
+
+def uninstall_sign_pool(pool: NodeSignPool, module=None):
+    """
+    撤销一次 install_sign_pool
+
+    仍有其他安装时使用最近安装的进程池，全部卸载后恢复原来的签名上下文。
+    """
+    global _original_js
+    xhs_util = _xhs_util(module)
+    with _shared_lock:
+        if pool not in _installed:
+            return
+        # 移除最近一次安装
+        del _installed[len(_installed) - 1 - _installed[::-1].index(pool)]
+        if _installed:
+            xhs_util.js = _installed[-1]
+        else:
+            xhs_util.js, _original_js = _original_js, None
@@ -0,0 +1,72 @@
+"""
+__INITIAL_STATE__ 提取性能对比
+
+对比旧的惰性正则与线性扫描器在保存的页面样本上的耗时与解析结果。
+使用方法: python src/tests/bench_initial_state.py
+"""
+import re
+import sys
+import json
+import timeit
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.initial_state import extract_initial_state
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# 旧实现中使用的两条正则
+LEGACY_PATTERNS = {
+    "downloader_regex": re.compile(r'window\.__INITIAL_STATE__=({.*?});', re.DOTALL),
+    "extractor_regex": re.compile(r'window\.__INITIAL_STATE__\s*=\s*({.*?})\s*(?:;|$)', re.DOTALL | re.MULTILINE),
+}
+
+
+def legacy_extract(pattern, html):
+    match = pattern.search(html)
+    if not match:
+        return None
+    return json.loads(match.group(1))
+
+
+def check(func):
+    """返回解析结果状态：ok / 未找到 / 解析失败"""
+    try:
+        return "ok" if func() is not None else "未找到"
+    except json.JSONDecodeError:
+        return "解析失败"
+
+
+def inflate(html, times):
+    """在 </body> 前插入大段无关脚本，模拟体积更大的页面"""
+    filler = "<script>var chunk={\"k\":\"" + "x" * 4096 + "\"};</script>\n"
+    return html.replace("</body>", filler * times + "</body>")
+
+
+def bench(name, html, number=20):
+    print(f"\n== {name} ({len(html) / 1024:.0f} KB) ==")
+    cases = {"scanner": lambda: extract_initial_state(html)}
+    for label, pattern in LEGACY_PATTERNS.items():
+        cases[label] = lambda pattern=pattern: legacy_extract(pattern, html)
+
+    for label, func in cases.items():
+        status = check(func)
+        seconds = min(timeit.repeat(lambda: check(func), number=number, repeat=3)) / number
+        print(f"{label:<18} {seconds * 1000:8.3f} ms/次  结果: {status}")
+
+
+def main():
+    fixtures = sorted(FIXTURES_DIR.glob("*.html"))
+    if not fixtures:
+        print(f"未找到页面样本: {FIXTURES_DIR}")
+        return
+    for path in fixtures:
+        html = path.read_text(encoding="utf-8")
+        bench(path.name, html)
+        bench(f"{path.name} x256 填充", inflate(html, 256), number=5)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+TikTokService 会话池性能对比
+
+对比每次查询新建 TikTokService（读取设置、构造 Parameter、生成请求头、新建客户端）
+与从会话池借用已初始化会话的准备耗时；提供 --url 时额外对比真实查询的总耗时。
+使用方法: python src/tests/bench_tk_session_pool.py [--rounds 50] [--url 抖音视频链接]
+"""
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from pathlib import Path
+
+# tk_329 依赖 TikTokDownloader 自身的 src 包，需以顶层模块方式导入
+sys.path.insert(0, str(Path(__file__).parent.parent / "services"))
+
+import tk_329
+from tk_329 import TikTokService, TikTokSessionPool
+
+
+def report(name, samples):
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"{name:<12} 平均 {statistics.mean(samples) * 1000:8.2f} ms"
+          f"  p50 {statistics.median(samples) * 1000:8.2f} ms  p99 {p99 * 1000:8.2f} ms")
+
+
+async def bench_setup(rounds):
+    print(f"\n== 会话准备耗时（{rounds} 次）==")
+    cold = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        async with TikTokService():
+            pass
+        cold.append(time.perf_counter() - start)
+    report("每次新建", cold)
+
+    pool = TikTokSessionPool()
+    warm = []
+    try:
+        # 第一次借出时创建会话，不计入统计
+        async with pool.session():
+            pass
+        for _ in range(rounds):
+            start = time.perf_counter()
+            async with pool.session():
+                pass
+            warm.append(time.perf_counter() - start)
+    finally:
+        await pool.close()
+    report("会话池", warm)
+    print(f"会话池统计: {pool.stats}")
+
+
+async def bench_lookup(url, rounds):
+    print(f"\n== 真实查询耗时（{rounds} 次）==")
+    cold = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        async with TikTokService() as service:
+            await service.get_video_info(url)
+        cold.append(time.perf_counter() - start)
+    report("每次新建", cold)
+
+    warm = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await tk_329.get_video_info(url)
+        warm.append(time.perf_counter() - start)
+    report("共享会话池", warm)
+    await tk_329.get_session_pool().close()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--url", help="可选：用于真实查询对比的抖音视频链接")
+    args = parser.parse_args()
+
+    await bench_setup(args.rounds)
+    if args.url:
+        await bench_lookup(args.url, min(args.rounds, 10))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
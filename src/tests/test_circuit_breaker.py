@@ -0,0 +1,114 @@
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.circuit_breaker import (
+    CLOSED,
+    DEFAULT_SLOW_CALL_SECONDS,
+    HALF_OPEN,
+    OPEN,
+    BreakerRegistry,
+    CircuitBreaker,
+)
+from src.utils.exceptions import CircuitOpenError, XHSExtractError
+from src.utils.url_router import URLRouter
+
+
+def _breaker(**kwargs):
+    options = {"window": 4, "min_calls": 4, "failure_threshold": 0.5, "open_seconds": 0.05,
+               "error_factory": CircuitOpenError}
+    return CircuitBreaker("xhs", **{**options, **kwargs})
+
+
+def test_opens_on_error_rate_and_fails_fast_with_typed_error():
+    breaker = _breaker()
+    for success in (True, False, True, False):
+        breaker.record(success)
+    assert breaker.state == OPEN
+
+    with pytest.raises(XHSExtractError) as exc_info:
+        with breaker.guard():
+            pytest.fail("熔断中不应执行调用")
+    assert isinstance(exc_info.value, CircuitOpenError)
+    assert exc_info.value.error_code == 10004
+    assert breaker.snapshot()["rejected"] == 1
+
+
+def test_half_open_probe_closes_or_reopens():
+    breaker = _breaker()
+    for _ in range(4):
+        breaker.record(False)
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+
+    with breaker.guard() as call:
+        call.fail()
+    assert breaker.state == OPEN
+
+    time.sleep(0.06)
+    with breaker.guard():
+        # 半开状态只放行一次试探
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+    assert breaker.state == CLOSED
+    assert breaker.failure_rate == 0.0
+
+
+def test_slow_calls_count_as_failures():
+    breaker = _breaker(slow_call_seconds=0.1)
+    for _ in range(4):
+        breaker.record(True, elapsed=0.5)
+    assert breaker.state == OPEN
+    assert breaker.stats["slow_calls"] == 4 and breaker.stats["failures"] == 0
+
+
+def test_platform_breakers_detect_slow_calls_by_default():
+    breaker = BreakerRegistry(window=2, min_calls=2).get("douyin")
+    assert breaker.slow_call_seconds == DEFAULT_SLOW_CALL_SECONDS
+    breaker.record(True, elapsed=DEFAULT_SLOW_CALL_SECONDS + 1)
+    breaker.record(True, elapsed=DEFAULT_SLOW_CALL_SECONDS + 1)
+    assert breaker.state == OPEN
+
+
+def test_cancelled_probe_is_released():
+    breaker = _breaker(min_calls=1, window=1)
+    breaker.record(False)
+    time.sleep(0.06)
+
+    async def probe():
+        with breaker.guard():
+            await asyncio.sleep(1)
+
+    async def run():
+        task = asyncio.create_task(probe())
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+    assert breaker.state == HALF_OPEN
+    breaker.allow()
+
+
+def test_router_skips_backend_with_open_breaker():
+    registry = BreakerRegistry(window=2, min_calls=2, open_seconds=60)
+    calls = []
+
+    def broken(url):
+        calls.append("broken")
+        raise RuntimeError("风控")
+
+    router = URLRouter(max_consecutive_failures=100, breakers=registry)
+    router.register("broken", broken, ["xhs_note"])
+
+    url = "https://www.xiaohongshu.com/explore/64674a91000000001301762e"
+    results = [asyncio.run(router.route(url)) for _ in range(3)]
+    assert calls == ["broken", "broken"]
+    assert not results[2][0] and "熔断中" in results[2][1]
+    assert router.stats()[0]["breaker"] == OPEN
@@ -0,0 +1,105 @@
+import sys
+import time
+import threading
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.cookie_pool import CookiePool, is_risk_error
+from src.utils.exceptions import NoCookieAvailableError
+
+
+def make_pool(count=3, **kwargs):
+    return CookiePool([(f"a{i}", f"web_session=s{i}; a1=x{i}") for i in range(count)], **kwargs)
+
+
+def test_round_robin_by_least_recently_used():
+    pool = make_pool()
+    names = []
+    for _ in range(6):
+        with pool.lease() as lease:
+            names.append(lease.account.name)
+    assert names == ["a0", "a1", "a2", "a0", "a1", "a2"]
+    assert [s["requests"] for s in pool.stats()] == [2, 2, 2]
+
+
+def test_risk_error_quarantines_with_backoff():
+    pool = make_pool(2, cooldown=0.05)
+    account = pool.acquire()
+    pool.report(account, False, "登录已过期")
+    assert pool.stats()[0]["quarantined"]
+    # 隔离期间只会选到其他账号
+    assert {pool.acquire().name for _ in range(3)} == {"a1"}
+
+    time.sleep(0.06)
+    assert not pool.stats()[0]["quarantined"]
+    pool.report(account, False, "", code=300013)
+    assert account.strikes == 2
+    assert account.quarantined_until - time.monotonic() > 0.05
+
+
+def test_plain_errors_lower_health_without_quarantine():
+    pool = make_pool(2, health_tolerance=0.1)
+    pool.report(pool.acquire(), False, "网络超时")
+    pool.report(pool.acquire(), True)
+    stats = pool.stats()
+    assert not stats[0]["quarantined"]
+    assert stats[0]["error_rate"] == 1.0
+    assert stats[0]["health"] < stats[1]["health"]
+    # 健康分明显低于其他账号时不再被选中
+    assert {pool.acquire().name for _ in range(3)} == {"a1"}
+
+
+def test_all_quarantined_raises():
+    pool = make_pool(1, cooldown=60)
+    pool.report(pool.acquire(), False, "账号存在异常")
+    with pytest.raises(NoCookieAvailableError):
+        pool.acquire()
+
+
+def test_lease_reports_exceptions():
+    pool = make_pool(1)
+    with pytest.raises(RuntimeError):
+        with pool.lease():
+            raise RuntimeError("boom")
+    assert pool.stats()[0]["errors"] == 1
+
+
+def test_thread_safety():
+    pool = make_pool(4)
+
+    def worker():
+        for _ in range(250):
+            with pool.lease() as lease:
+                lease.report(True)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(s["requests"] for s in pool.stats()) == 2000
+
+
+def test_from_path(tmp_path):
+    accounts = tmp_path / "cookies.txt"
+    accounts.write_text("# 账号列表\nmain|a1=x; web_session=1\na1=y; web_session=2\n\n", encoding="utf-8")
+    pool = CookiePool.from_path(str(accounts))
+    assert [(a.name, a.cookies) for a in pool.accounts] == [
+        ("main", "a1=x; web_session=1"),
+        ("account-2", "a1=y; web_session=2"),
+    ]
+
+    folder = tmp_path / "accounts"
+    folder.mkdir()
+    (folder / "alice.txt").write_text("a1=z; web_session=3\n", encoding="utf-8")
+    assert [a.name for a in CookiePool.from_path(str(folder)).accounts] == ["alice"]
+
+
+def test_is_risk_error():
+    assert is_risk_error("访问频次异常，请勿频繁操作")
+    assert is_risk_error(code="-100")
+    assert not is_risk_error("笔记不存在", 0)
@@ -0,0 +1,82 @@
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.hedge import HedgeBudget, Hedger
+
+
+def _warm(hedger, elapsed=0.01, count=20):
+    for _ in range(count):
+        hedger.record(elapsed)
+
+
+def test_no_hedge_without_samples():
+    hedger = Hedger(budget=HedgeBudget(ratio=1.0))
+    assert hedger.delay() is None
+    assert asyncio.run(hedger.run(lambda: asyncio.sleep(0, result=(True, "ok", 1)))) == (True, "ok", 1)
+    assert hedger.stats["hedged"] == 0
+
+
+def test_slow_primary_is_hedged_and_cancelled():
+    hedger = Hedger(percentile=0.9, budget=HedgeBudget(ratio=1.0))
+    _warm(hedger)
+    calls = []
+    cancelled = []
+
+    async def attempt():
+        index = len(calls)
+        calls.append(index)
+        try:
+            await asyncio.sleep(1.0 if index == 0 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+        return index
+
+    async def run():
+        start = time.monotonic()
+        result = await hedger.run(attempt)
+        await asyncio.sleep(0)
+        return result, time.monotonic() - start
+
+    result, elapsed = asyncio.run(run())
+    assert result == 1 and elapsed < 0.5
+    assert cancelled == [0]
+    assert hedger.stats["hedged"] == 1 and hedger.stats["hedge_wins"] == 1
+
+
+def test_failed_hedge_falls_back_to_primary():
+    hedger = Hedger(budget=HedgeBudget(ratio=1.0))
+    _warm(hedger)
+    calls = []
+
+    async def attempt():
+        calls.append(1)
+        if len(calls) == 1:
+            await asyncio.sleep(0.1)
+            return True, "ok", "primary"
+        return False, "风控", None
+
+    assert asyncio.run(hedger.run(attempt)) == (True, "ok", "primary")
+    assert hedger.stats["hedge_wins"] == 0
+
+
+def test_budget_limits_hedges():
+    budget = HedgeBudget(ratio=0.25, burst=1)
+    hedger = Hedger(budget=budget)
+    _warm(hedger, elapsed=0.001, count=200)
+
+    def attempt():
+        time.sleep(0.02)
+        return "done"
+
+    for _ in range(8):
+        assert hedger.run_sync(attempt) == "done"
+    hedger.close()
+    # 每 4 个主请求攒够 1 个令牌
+    assert hedger.stats["hedged"] == 2
+    assert hedger.stats["budget_denied"] == 6
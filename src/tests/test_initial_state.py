@@ -0,0 +1,68 @@
+import sys
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.initial_state import (
+    extract_initial_state,
+    find_initial_state,
+    first_note_detail,
+    normalize_js_literal,
+)
+
+FIXTURE = Path(__file__).parent / "fixtures" / "xhs_note_page.html"
+
+
+def test_brace_and_semicolon_inside_strings():
+    html = '<script>window.__INITIAL_STATE__={"a":"x};y","b":{"c":"}{\\"}"}};var z={};</script>'
+    assert find_initial_state(html) == '{"a":"x};y","b":{"c":"}{\\"}"}}'
+    assert extract_initial_state(html) == {"a": "x};y", "b": {"c": '}{"}'}}
+
+
+def test_whitespace_around_assignment():
+    html = "<script>window.__INITIAL_STATE__ =\n {\"a\":1}</script>"
+    assert extract_initial_state(html) == {"a": 1}
+
+
+def test_undefined_is_normalized_outside_strings_only():
+    literal = '{"a":undefined,"b":"undefined","c":[undefined,true],"undefinedKey":null}'
+    assert json.loads(normalize_js_literal(literal)) == {
+        "a": None, "b": "undefined", "c": [None, True], "undefinedKey": None,
+    }
+
+
+def test_missing_or_incomplete_state():
+    assert extract_initial_state("<html></html>") is None
+    assert find_initial_state('window.__INITIAL_STATE__={"a":"unterminated}') is None
+
+
+def test_truncated_state_fails_fast():
+    # 截断的页面没有闭合的大括号，扫描必须线性失败而不是回溯爆炸
+    truncated = [
+        'window.__INITIAL_STATE__={"a":1,' + " x" * 50000,
+        'window.__INITIAL_STATE__={"a":{"b":"' + " x" * 50000,
+        "window.__INITIAL_STATE__={" + '"k":"v",' * 20000,
+    ]
+    start = time.monotonic()
+    for html in truncated:
+        assert find_initial_state(html) is None
+    assert time.monotonic() - start < 1.0
+
+
+def test_invalid_state_raises():
+    with pytest.raises(json.JSONDecodeError):
+        extract_initial_state("window.__INITIAL_STATE__={a:1}")
+
+
+def test_fixture_page():
+    state = extract_initial_state(FIXTURE.read_text(encoding="utf-8"))
+    note = first_note_detail(state)
+    assert note["noteId"] == "64674a91000000001301762e"
+    assert "</script>" in note["desc"]
+    assert len(note["imageList"]) == 9
+    assert state["user"]["userInfo"] is None
@@ -0,0 +1,124 @@
+import sys
+import asyncio
+from concurrent.futures import Future
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.services.jobs import TIKTOK_DOWNLOAD, build_job_runner
+from src.utils.job_queue import FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueue, JobRunner
+
+
+def test_priority_order_and_persistence(tmp_path):
+    db_path = str(tmp_path / "jobs.db")
+
+    async def run():
+        async with JobQueue(db_path) as queue:
+            low = await queue.enqueue("download", {"url": "a"}, priority=0)
+            high = await queue.enqueue("download", {"url": "b"}, priority=10)
+            await queue.enqueue("transcribe", {"path": "c"})
+        # 重新打开后任务仍在
+        async with JobQueue(db_path) as queue:
+            first = await queue.claim("download", 60)
+            second = await queue.claim("download", 60)
+            assert await queue.claim("download", 60) is None
+            return low, high, first, second, await queue.counts()
+
+    low, high, first, second, counts = asyncio.run(run())
+    assert (first.id, second.id) == (high, low)
+    assert first.payload == {"url": "b"} and first.status == RUNNING and first.attempts == 1
+    assert counts == {"download": {RUNNING: 2}, "transcribe": {QUEUED: 1}}
+
+
+def test_expired_lease_is_reclaimed_and_stale_owner_rejected(tmp_path):
+    async def run():
+        async with JobQueue(str(tmp_path / "jobs.db")) as queue:
+            job_id = await queue.enqueue("download", {}, max_attempts=2)
+            stale = await queue.claim("download", 0.01)
+            await asyncio.sleep(0.02)
+            fresh = await queue.claim("download", 60)
+            assert fresh.id == job_id and fresh.attempts == 2
+            assert not await queue.complete(stale, {"path": "old"})
+            assert await queue.complete(fresh, {"path": "new"})
+            return await queue.get(job_id)
+
+    job = asyncio.run(run())
+    assert job.status == SUCCEEDED and job.result == {"path": "new"}
+
+
+def test_retry_with_backoff_then_fail(tmp_path):
+    async def run():
+        async with JobQueue(str(tmp_path / "jobs.db"), base_backoff=0.02) as queue:
+            job_id = await queue.enqueue("download", {}, max_attempts=2)
+            job = await queue.claim("download", 60)
+            assert await queue.fail(job, "timeout") == QUEUED
+            # 退避期间不可取出
+            assert await queue.claim("download", 60) is None
+            await asyncio.sleep(0.03)
+            job = await queue.claim("download", 60)
+            assert await queue.fail(job, "timeout") == FAILED
+            return await queue.get(job_id)
+
+    job = asyncio.run(run())
+    assert job.status == FAILED and job.attempts == 2 and job.error == "timeout"
+
+
+def test_runner_executes_and_streams_status(tmp_path):
+    async def handler(payload, context):
+        await context.progress(0.5)
+        if payload.get("bad"):
+            raise ValueError("invalid url")
+        return {"echo": payload["value"]}
+
+    async def run():
+        async with JobQueue(str(tmp_path / "jobs.db")) as queue:
+            runner = JobRunner(queue, poll_interval=0.01).register("echo", handler, concurrency=2)
+            async with runner:
+                ok = await queue.enqueue("echo", {"value": 1})
+                bad = await queue.enqueue("echo", {"bad": True})
+                statuses = [job.status async for job in queue.watch(ok, interval=0.01)]
+                async for _ in queue.watch(bad, interval=0.01):
+                    pass
+            return statuses, await queue.get(ok), await queue.get(bad), runner.stats
+
+    statuses, ok, bad, stats = asyncio.run(run())
+    assert statuses[-1] == SUCCEEDED and ok.result == {"echo": 1} and ok.progress == 1.0
+    # ValueError 不重试
+    assert bad.status == FAILED and bad.attempts == 1
+    assert stats["succeeded"] == 1 and stats["failed"] == 1
+
+
+class FakeSyncTikTokService:
+    """模拟 tk_329 的 SyncTikTokService：submit_download 立即返回已完成的 Future"""
+
+    def __init__(self):
+        self.calls = []
+
+    def submit_download(self, url, output_path=None, connections=4):
+        self.calls.append((url, output_path, connections))
+        future = Future()
+        future.set_result(f"{output_path}/1.mp4" if "ok" in url else None)
+        return future
+
+
+def test_tiktok_download_uses_service(tmp_path):
+    service = FakeSyncTikTokService()
+
+    async def run():
+        async with JobQueue(str(tmp_path / "jobs.db")) as queue:
+            runner = build_job_runner(queue, tiktok_service=service)
+            runner.poll_interval = 0.01
+            async with runner:
+                ok = await queue.enqueue(TIKTOK_DOWNLOAD, {"url": "https://v.douyin.com/ok", "save_path": "out"})
+                missing = await queue.enqueue(TIKTOK_DOWNLOAD, {"url": "https://v.douyin.com/gone"})
+                for job_id in (ok, missing):
+                    async for _ in queue.watch(job_id, interval=0.01):
+                        pass
+            return await queue.get(ok), await queue.get(missing)
+
+    ok, missing = asyncio.run(run())
+    assert ok.status == SUCCEEDED and ok.result == {"path": "out/1.mp4"}
+    # 下载失败（视频不存在）不重试
+    assert missing.status == FAILED and missing.attempts == 1
+    assert service.calls[0] == ("https://v.douyin.com/ok", "out", 4)
@@ -0,0 +1,89 @@
+import sys
+import time
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.loop_thread import BackgroundLoop, close_on_shutdown
+
+
+def test_calls_share_one_loop_and_thread():
+    background = BackgroundLoop()
+    try:
+        async def current():
+            return asyncio.get_running_loop(), threading.current_thread()
+
+        first = background.run(current())
+        second = background.run(current())
+        assert first == second
+        assert first[1] is not threading.current_thread()
+    finally:
+        background.close()
+
+
+def test_submit_returns_futures_that_run_concurrently():
+    background = BackgroundLoop()
+    try:
+        async def work(i):
+            await asyncio.sleep(0.1)
+            return i
+
+        start = time.monotonic()
+        futures = [background.submit(work(i)) for i in range(10)]
+        assert [future.result() for future in futures] == list(range(10))
+        assert time.monotonic() - start < 0.5
+    finally:
+        background.close()
+
+
+def test_timeout_cancels_and_cleanup_runs_on_close():
+    background = BackgroundLoop()
+    closed = []
+
+    async def cleanup():
+        closed.append(True)
+
+    background.add_cleanup(cleanup)
+    with pytest.raises(TimeoutError):
+        background.run(asyncio.sleep(10), timeout=0.05)
+    background.close()
+    assert closed == [True]
+
+
+def test_rejects_sync_submit_from_loop_thread():
+    background = BackgroundLoop()
+    try:
+        async def nested():
+            with pytest.raises(RuntimeError):
+                background.submit(asyncio.sleep(0))
+            return True
+
+        assert background.run(nested())
+    finally:
+        background.close()
+
+
+def test_close_on_shutdown_runs_when_asyncio_run_finishes():
+    events = []
+    hooks = []
+
+    async def close():
+        await asyncio.sleep(0)
+        events.append("closed")
+
+    async def main():
+        hooks.append(close_on_shutdown(close))
+        events.append("main")
+
+    asyncio.run(main())
+    assert events == ["main", "closed"]
+
+    background = BackgroundLoop()
+    background.run(main())
+    background.close()
+    assert events == ["main", "closed", "main", "closed"]
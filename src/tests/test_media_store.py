@@ -0,0 +1,91 @@
+import os
+import sys
+import asyncio
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.media_store import MediaStore, normalize_media_url, stable_name
+
+
+def make_download(content, calls):
+    async def download(path):
+        calls.append(path)
+        Path(path).write_bytes(content)
+    return download
+
+
+def test_normalize_media_url():
+    a = normalize_media_url("https://sns-webpic-qc.xhscdn.com/202405/abc!nd_dft?sign=0a1b&t=6650a1b2")
+    b = normalize_media_url("http://SNS-IMG-BD.xhscdn.com//202405/abc!nd_dft#frag")
+    assert a == b == "https://xhscdn.com/202405/abc!nd_dft"
+    # 图片处理指令决定返回的格式，必须保留在键中
+    png = normalize_media_url("https://sns-webpic-qc.xhscdn.com/202405/abc!nd_dft?imageView2/format/png&utm_source=x")
+    assert png == "https://xhscdn.com/202405/abc!nd_dft?imageView2/format/png"
+    assert stable_name("https://sns-webpic-qc.xhscdn.com/x") == stable_name("https://sns-img-qc.xhscdn.com/x")
+
+
+def test_fetch_hit_and_dedupe(tmp_path):
+    async def run():
+        store = MediaStore(str(tmp_path / "store"))
+        calls = []
+        first = await store.fetch("https://sns-webpic-qc.xhscdn.com/a.jpg", make_download(b"image-a", calls), ".png")
+        again = await store.fetch("https://sns-img-bd.xhscdn.com/a.jpg?sign=1&t=2", make_download(b"image-a", calls), ".png")
+        other = await store.fetch("https://sns-webpic-qc.xhscdn.com/copy.jpg", make_download(b"image-a", calls), ".png")
+        return first, again, other, calls
+
+    first, again, other, calls = asyncio.run(run())
+    assert not first.cache_hit and again.cache_hit
+    assert len(calls) == 2
+    # 不同URL相同内容只保存一份
+    assert first.path == again.path == other.path
+    assert first.size == len(b"image-a")
+
+
+def test_link_and_corrupted_object(tmp_path):
+    async def run():
+        store = MediaStore(str(tmp_path / "store"))
+        calls = []
+        url = "https://sns-video-bd.xhscdn.com/v.mp4"
+        asset = await store.fetch(url, make_download(b"video", calls), ".mp4")
+        dest = store.link(asset, str(tmp_path / "note1" / "v.mp4"))
+        assert os.path.samefile(dest, asset.path)
+
+        Path(asset.path).write_bytes(b"truncated-and-changed")
+        refetched = await store.fetch(url, make_download(b"video", calls), ".mp4")
+        return refetched, calls
+
+    refetched, calls = asyncio.run(run())
+    assert not refetched.cache_hit
+    assert len(calls) == 2
+
+
+def test_failed_download_releases_lock(tmp_path):
+    async def fail(path):
+        raise OSError("connection reset")
+
+    async def run():
+        store = MediaStore(str(tmp_path / "store"))
+        for i in range(3):
+            try:
+                await store.fetch(f"https://sns-video-bd.xhscdn.com/{i}.mp4", fail, ".mp4")
+            except OSError:
+                pass
+        return store
+
+    assert asyncio.run(run())._locks == {}
+
+
+def test_format_variants_are_cached_separately(tmp_path):
+    async def run():
+        store = MediaStore(str(tmp_path / "store"))
+        calls = []
+        url = "https://sns-webpic-qc.xhscdn.com/202405/abc!nd_dft"
+        default = await store.fetch(url, make_download(b"webp", calls), ".webp")
+        png = await store.fetch(url + "?imageView2/format/png", make_download(b"png", calls), ".png")
+        return default, png, calls
+
+    default, png, calls = asyncio.run(run())
+    assert not png.cache_hit and len(calls) == 2
+    assert Path(png.path).read_bytes() == b"png" and Path(default.path).read_bytes() == b"webp"
@@ -0,0 +1,83 @@
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.note_cache import NoteCache
+
+
+def test_memory_and_disk_tiers(tmp_path):
+    db_path = str(tmp_path / "notes.db")
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"note_id": "n1", "title": "标题"}
+
+    cache = NoteCache(db_path, ttl=60)
+    assert cache.get_or_fetch("n1", fetch)["title"] == "标题"
+    assert cache.get_or_fetch("n1", fetch)["title"] == "标题"
+    assert len(calls) == 1
+    assert cache.stats.memory_hits == 1 and cache.stats.misses == 1
+    cache.close()
+
+    # 新实例模拟进程重启，从 SQLite 读出
+    restarted = NoteCache(db_path, ttl=60)
+    assert restarted.get_or_fetch("n1", fetch)["note_id"] == "n1"
+    assert len(calls) == 1
+    assert restarted.stats.disk_hits == 1
+    restarted.close()
+
+
+def test_failed_fetch_is_not_cached():
+    cache = NoteCache(ttl=60)
+    assert cache.get_or_fetch("n1", lambda: None) is None
+    assert cache.get_or_fetch("n1", lambda: {"ok": 1}) == {"ok": 1}
+
+
+def test_stale_value_served_while_refreshing():
+    cache = NoteCache(ttl=0.05, stale_ttl=60)
+    cache.get_or_fetch("n1", lambda: {"version": 1})
+    time.sleep(0.06)
+    assert cache.get_or_fetch("n1", lambda: {"version": 2}) == {"version": 1}
+    cache.close()  # 等待后台刷新完成
+    assert cache.get_or_fetch("n1", lambda: {"version": 3}) == {"version": 2}
+    assert cache.stats.stale_hits == 1 and cache.stats.refreshes == 1
+    # 过期条目只计入 stale_hits，不计入命中
+    assert cache.stats.memory_hits == 1 and cache.stats.hits == 1
+
+
+def test_stale_disk_entry_is_not_counted_as_hit(tmp_path):
+    db_path = str(tmp_path / "notes.db")
+    cache = NoteCache(db_path, ttl=0.05, stale_ttl=60)
+    cache.get_or_fetch("n1", lambda: {"version": 1})
+    cache.close()
+    time.sleep(0.06)
+
+    restarted = NoteCache(db_path, ttl=0.05, stale_ttl=60)
+    assert restarted.get_or_fetch("n1", lambda: {"version": 2}) == {"version": 1}
+    restarted.close()
+    assert restarted.stats.as_dict()["hits"] == 0
+    assert restarted.stats.disk_hits == 0 and restarted.stats.stale_hits == 1
+
+
+def test_async_stale_while_revalidate(tmp_path):
+    async def run():
+        cache = NoteCache(str(tmp_path / "notes.db"), ttl=0.05, stale_ttl=60)
+        versions = iter(range(1, 10))
+
+        async def fetch():
+            return {"version": next(versions)}
+
+        assert await cache.aget_or_fetch("n1", fetch) == {"version": 1}
+        await asyncio.sleep(0.06)
+        assert await cache.aget_or_fetch("n1", fetch) == {"version": 1}
+        await asyncio.sleep(0.01)
+        assert await cache.aget_or_fetch("n1", fetch) == {"version": 2}
+        assert cache.stats.stale_hits == 1 and cache.stats.hits == 1
+        await cache.aclose()
+
+    asyncio.run(run())
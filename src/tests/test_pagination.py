@@ -0,0 +1,48 @@
+import sys
+import asyncio
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.pagination import iter_items, iter_pages
+
+# 模拟 3 页数据，游标为页码字符串
+PAGES = {"": (["a", "b"], "1", True), "1": (["c", "d"], "2", True), "2": (["e"], "", False)}
+
+
+def make_fetch(calls):
+    async def fetch(cursor):
+        calls.append(cursor)
+        return PAGES[cursor]
+    return fetch
+
+
+async def collect(pages):
+    return [page async for page in pages]
+
+
+def test_pages_until_exhausted():
+    calls = []
+    pages = asyncio.run(collect(iter_pages(make_fetch(calls), "", None)))
+    assert [page.items for page in pages] == [["a", "b"], ["c", "d"], ["e"]]
+    assert calls == ["", "1", "2"]
+    assert not pages[-1].has_more
+
+
+def test_limit_stops_early_and_resume_cursor():
+    calls = []
+    pages = asyncio.run(collect(iter_pages(make_fetch(calls), "", 3)))
+    assert [page.items for page in pages] == [["a", "b"], ["c"]]
+    assert calls == ["", "1"]
+    # 被截断的页面令牌指向自身，续传不会漏数据
+    assert pages[-1].cursor == "1" and pages[-1].has_more
+
+    resumed = asyncio.run(collect(iter_items(iter_pages(make_fetch([]), pages[-1].cursor, None))))
+    assert resumed == ["c", "d", "e"]
+
+
+def test_exact_limit_on_page_boundary():
+    pages = asyncio.run(collect(iter_pages(make_fetch([]), "", 2)))
+    assert pages[-1].items == ["a", "b"]
+    assert pages[-1].cursor == "1"
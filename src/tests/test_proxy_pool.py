@@ -0,0 +1,139 @@
+import sys
+import time
+import threading
+from pathlib import Path
+
+import httpx
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.proxy_pool import ProxyPool, is_proxy_error
+
+PROXIES = ["http://p1:8080", "http://p2:8080", "http://p3:8080"]
+
+
+def test_unmeasured_proxies_are_tried_then_fastest_wins():
+    pool = ProxyPool(PROXIES)
+    latencies = {"http://p1:8080": 0.3, "http://p2:8080": 0.05, "http://p3:8080": 0.2}
+    tried = []
+    for _ in range(3):
+        proxy = pool.pick()
+        tried.append(proxy)
+        pool.record(proxy, True, latencies[proxy])
+    assert sorted(tried) == sorted(PROXIES)
+    assert {pool.pick() for _ in range(5)} == {"http://p2:8080"}
+
+
+def test_failed_only_proxy_ranks_after_measured_one():
+    pool = ProxyPool(PROXIES[:2], max_consecutive_failures=3)
+    pool.record(PROXIES[0], False)
+    pool.record(PROXIES[0], False)
+    pool.record(PROXIES[1], True, 0.2)
+    assert not pool.stats()[0]["evicted"]
+    assert pool.pick() == PROXIES[1]
+    # 从未使用过的代理仍然优先试用
+    pool = ProxyPool(PROXIES[:2])
+    pool.record(PROXIES[1], True, 0.2)
+    assert pool.pick() == PROXIES[0]
+
+
+def test_in_flight_requests_spread_load():
+    pool = ProxyPool(PROXIES[:2])
+    pool.record(PROXIES[0], True, 0.1)
+    pool.record(PROXIES[1], True, 0.15)
+    with pool.track() as first:
+        with pool.track() as second:
+            assert first.proxy == PROXIES[0]
+            assert second.proxy == PROXIES[1]
+
+
+def test_concurrent_tracks_do_not_pile_onto_one_proxy():
+    pool = ProxyPool(PROXIES)
+    for proxy in PROXIES:
+        pool.record(proxy, True, 0.1)
+    barrier = threading.Barrier(len(PROXIES))
+    picked = []
+
+    def worker():
+        with pool.track() as tracker:
+            picked.append(tracker.proxy)
+            barrier.wait(timeout=5)
+
+    threads = [threading.Thread(target=worker) for _ in PROXIES]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(picked) == sorted(PROXIES)
+
+
+def test_consecutive_failures_evict():
+    pool = ProxyPool(PROXIES[:2], max_consecutive_failures=2)
+    pool.record(PROXIES[0], True, 0.01)
+    pool.record(PROXIES[1], True, 0.5)
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            with pool.track():
+                raise httpx.ConnectError("boom")
+    stats = {s["proxy"]: s for s in pool.stats()}
+    assert stats[PROXIES[0]]["evicted"]
+    assert stats[PROXIES[0]]["failures"] == 2
+    assert pool.pick() == PROXIES[1]
+
+
+def test_all_evicted_falls_back_to_least_failing():
+    pool = ProxyPool(PROXIES[:2], max_consecutive_failures=1)
+    pool.record(PROXIES[0], True, 0.1)
+    pool.record(PROXIES[0], False)
+    pool.record(PROXIES[1], False)
+    assert pool.pick() == PROXIES[0]
+
+
+def test_probe_restores_evicted(monkeypatch):
+    pool = ProxyPool(PROXIES[:1], max_consecutive_failures=1)
+    pool.record(PROXIES[0], False)
+    monkeypatch.setattr(httpx, "get", lambda *args, **kwargs: httpx.Response(200))
+    assert pool.probe_evicted() == 1
+    assert not pool.stats()[0]["evicted"]
+
+
+def test_background_prober(monkeypatch):
+    pool = ProxyPool(PROXIES[:1], max_consecutive_failures=1, probe_interval=0.01)
+    pool.record(PROXIES[0], False)
+    monkeypatch.setattr(httpx, "get", lambda *args, **kwargs: httpx.Response(204))
+    pool.start()
+    try:
+        deadline = time.monotonic() + 1
+        while pool.stats()[0]["evicted"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        pool.close()
+    assert not pool.stats()[0]["evicted"]
+
+
+def test_eviction_starts_prober(monkeypatch):
+    pool = ProxyPool(PROXIES[:1], max_consecutive_failures=1, probe_interval=0.01)
+    monkeypatch.setattr(httpx, "get", lambda *args, **kwargs: httpx.Response(200))
+    try:
+        pool.record(PROXIES[0], False)
+        deadline = time.monotonic() + 1
+        while pool.stats()[0]["evicted"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not pool.stats()[0]["evicted"]
+    finally:
+        pool.close()
+    # 关闭后不再自动启动
+    pool.record(PROXIES[0], False)
+    assert pool._prober is None
+
+
+def test_tracker_fail_and_requests_proxies():
+    pool = ProxyPool(PROXIES[:1])
+    with pool.track() as tracker:
+        assert tracker.proxies == {"http": PROXIES[0], "https": PROXIES[0]}
+        tracker.fail()
+    assert pool.stats()[0]["failures"] == 1
+    assert is_proxy_error("网络连接异常，请检查网络设置或重启试试")
+    assert not is_proxy_error("笔记不存在")
@@ -0,0 +1,38 @@
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.batch import BatchStats, note_id_from_url
+from src.utils.rate_limit import HostRateLimiter
+
+
+def test_rate_limit_is_per_host():
+    limiter = HostRateLimiter(rate=20)
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.wait_async("a.com") for _ in range(5)), limiter.wait_async("b.com"))
+        return time.monotonic() - start
+
+    # a.com 的 5 次请求至少间隔 4 个 50ms，b.com 不受影响
+    assert asyncio.run(run()) >= 0.19
+
+
+def test_unlimited_does_not_wait():
+    limiter = HostRateLimiter()
+    start = time.monotonic()
+    for _ in range(100):
+        limiter.wait("a.com")
+    assert time.monotonic() - start < 0.05
+
+
+def test_note_id_and_stats():
+    assert note_id_from_url(" https://www.xiaohongshu.com/explore/64674a91?xsec_token=a ") == "64674a91"
+    stats = BatchStats(total=3, unique=2)
+    stats.record(True)
+    stats.record(False)
+    assert "成功1，失败1" in stats.finish().summary()
@@ -0,0 +1,82 @@
+import sys
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_threads_share_one_call():
+    flights = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(1)
+        return {"note_id": "abc"}
+
+    with ThreadPoolExecutor(8) as executor:
+        futures = [executor.submit(flights.do, "note:abc", fetch) for _ in range(8)]
+        while flights.stats["calls"] < 8:
+            time.sleep(0.001)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flights.stats["coalesced"] == 7
+    assert flights.in_flight() == 0
+
+
+def test_exception_reaches_every_waiter_and_key_is_released():
+    flights = SingleFlight()
+    with pytest.raises(ValueError):
+        flights.do("k", lambda: (_ for _ in ()).throw(ValueError("风控")))
+    assert flights.do("k", lambda: 1) == 1
+    assert flights.stats == {"calls": 2, "executions": 2, "coalesced": 0, "errors": 1}
+
+
+def test_async_coalescing_survives_leader_cancellation():
+    flights = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "video"
+
+    async def run():
+        leader = asyncio.create_task(flights.do("video:1", fetch))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(flights.do("video:1", fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await asyncio.gather(*followers)
+
+    assert asyncio.run(run()) == ["video"] * 5
+    assert calls == [1]
+    assert flights.stats["coalesced"] == 5
+    assert flights.in_flight() == 0
+
+
+def test_async_exception_shared():
+    flights = AsyncSingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def run():
+        return await asyncio.gather(*(flights.do("k", fetch) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flights.stats["executions"] == 1 and flights.stats["errors"] == 1
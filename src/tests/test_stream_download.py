@@ -0,0 +1,154 @@
+import os
+import sys
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.stream_download import stream_download, ranged_download, DownloadSizeMismatch, PART_SUFFIX
+
+
+PAYLOAD = bytes(range(256)) * 64
+
+
+def make_client(payload=PAYLOAD, honour_range=True, length=None):
+    """构造一个支持 Range 请求的模拟客户端"""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        range_header = request.headers.get("Range")
+        if range_header and honour_range:
+            start = int(range_header.split("=")[1].rstrip("-"))
+            if start >= len(payload):
+                return httpx.Response(416, headers={"Content-Range": f"bytes */{len(payload)}"})
+            body = payload[start:]
+            return httpx.Response(206, content=body, headers={
+                "Content-Range": f"bytes {start}-{len(payload) - 1}/{len(payload)}",
+            })
+        headers = {"Content-Length": str(length if length is not None else len(payload))}
+        return httpx.Response(200, content=payload, headers=headers)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), requests
+
+
+def test_stream_download_writes_file(tmp_path):
+    async def run():
+        client, _ = make_client()
+        async with client:
+            target = str(tmp_path / "video.mp4")
+            size = await stream_download(client, "https://sns-video-bd.xhscdn.com/a", target, chunk_size=1024)
+            assert size == len(PAYLOAD)
+            assert Path(target).read_bytes() == PAYLOAD
+            assert not os.path.exists(target + PART_SUFFIX)
+
+    asyncio.run(run())
+
+
+def test_stream_download_resumes_partial_file(tmp_path):
+    async def run():
+        client, requests = make_client()
+        target = str(tmp_path / "video.mp4")
+        Path(target + PART_SUFFIX).write_bytes(PAYLOAD[:1000])
+        async with client:
+            await stream_download(client, "https://sns-video-bd.xhscdn.com/a", target)
+        assert requests[0].headers["Range"] == "bytes=1000-"
+        assert Path(target).read_bytes() == PAYLOAD
+
+    asyncio.run(run())
+
+
+def test_stream_download_restarts_when_range_ignored(tmp_path):
+    async def run():
+        client, _ = make_client(honour_range=False)
+        target = str(tmp_path / "video.mp4")
+        Path(target + PART_SUFFIX).write_bytes(b"garbage")
+        async with client:
+            await stream_download(client, "https://sns-video-bd.xhscdn.com/a", target)
+        assert Path(target).read_bytes() == PAYLOAD
+
+    asyncio.run(run())
+
+
+def test_stream_download_verifies_size(tmp_path):
+    async def run():
+        # 临时文件比服务器上的完整文件还大，说明内容已损坏
+        client, _ = make_client()
+        target = str(tmp_path / "video.mp4")
+        Path(target + PART_SUFFIX).write_bytes(PAYLOAD + b"extra")
+        async with client:
+            with pytest.raises(DownloadSizeMismatch):
+                await stream_download(client, "https://sns-video-bd.xhscdn.com/a", target)
+        assert not os.path.exists(target + PART_SUFFIX)
+
+    asyncio.run(run())
+
+
+def make_ranged_client(payload):
+    """支持 bytes=start-end 闭区间范围请求的模拟客户端，记录每次请求的 Range"""
+    ranges = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        range_header = request.headers.get("Range")
+        ranges.append(range_header)
+        if not range_header:
+            return httpx.Response(200, content=payload)
+        start, _, end = range_header.split("=")[1].partition("-")
+        start, end = int(start), int(end) if end else len(payload) - 1
+        return httpx.Response(206, content=payload[start:end + 1], headers={
+            "Content-Range": f"bytes {start}-{end}/{len(payload)}",
+        })
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), ranges
+
+
+def test_ranged_download_splits_large_files(tmp_path):
+    progress = []
+
+    async def run():
+        client, ranges = make_ranged_client(PAYLOAD)
+        target = str(tmp_path / "video.mp4")
+        async with client:
+            size = await ranged_download(
+                client, "https://v.douyin.com/a", target, connections=4, min_part_size=1024,
+                chunk_size=512, on_progress=lambda p: progress.append(p.downloaded),
+            )
+        assert size == len(PAYLOAD)
+        assert Path(target).read_bytes() == PAYLOAD
+        assert ranges == ["bytes=0-0", "bytes=0-4095", "bytes=4096-8191", "bytes=8192-12287", "bytes=12288-16383"]
+        assert progress[-1] == len(PAYLOAD)
+        assert not list(tmp_path.glob("*.part*"))
+
+    asyncio.run(run())
+
+
+def test_ranged_download_resumes_parts(tmp_path):
+    async def run():
+        client, ranges = make_ranged_client(PAYLOAD)
+        target = str(tmp_path / "video.mp4")
+        Path(target + PART_SUFFIX + "0").write_bytes(PAYLOAD[:4096])
+        Path(target + PART_SUFFIX + "1").write_bytes(PAYLOAD[4096:5000])
+        async with client:
+            await ranged_download(client, "https://v.douyin.com/a", target, connections=4, min_part_size=1024)
+        assert Path(target).read_bytes() == PAYLOAD
+        # 第一段已完整，不再请求；第二段从断点继续
+        assert "bytes=0-4095" not in ranges
+        assert "bytes=5000-8191" in ranges
+
+    asyncio.run(run())
+
+
+def test_ranged_download_falls_back_for_small_files(tmp_path):
+    async def run():
+        client, ranges = make_ranged_client(PAYLOAD)
+        target = str(tmp_path / "video.mp4")
+        async with client:
+            await ranged_download(client, "https://v.douyin.com/a", target, connections=4)
+        assert Path(target).read_bytes() == PAYLOAD
+        assert ranges == ["bytes=0-0", None]
+
+    asyncio.run(run())
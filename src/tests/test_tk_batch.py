@@ -0,0 +1,112 @@
+import sys
+import asyncio
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.services.tk_batch import run_video_batch
+
+URL_IDS = {
+    "https://v.douyin.com/a": "1",
+    "https://www.douyin.com/video/1": "1",
+    "https://v.douyin.com/b": "2",
+    "https://v.douyin.com/c": "3",
+    "https://v.douyin.com/bad": None,
+}
+
+
+class StubBackend:
+    def __init__(self, missing=(), delay=0.0):
+        self.missing = set(missing)
+        self.delay = delay
+        self.resolved = []
+        self.fetched = []
+        self.processed = []
+        self.active = 0
+        self.peak = 0
+
+    async def _track(self):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+
+    async def resolve(self, url):
+        self.resolved.append(url)
+        await self._track()
+        return URL_IDS.get(url)
+
+    async def fetch(self, video_id):
+        self.fetched.append(video_id)
+        await self._track()
+        return None if video_id in self.missing else {"aweme_id": video_id}
+
+    async def process(self, fetched):
+        self.processed.append(fetched)
+        return {data["aweme_id"]: {"id": data["aweme_id"]} for data in fetched}
+
+    def run(self, urls, concurrency=8):
+        return asyncio.run(run_video_batch(urls, self.resolve, self.fetch, self.process, concurrency))
+
+
+def test_duplicate_ids_are_fetched_once():
+    backend = StubBackend()
+    urls = ["https://v.douyin.com/a", "https://www.douyin.com/video/1", "https://v.douyin.com/b"]
+    results = backend.run(urls)
+    assert sorted(backend.fetched) == ["1", "2"]
+    # 全部详情只处理一次
+    assert len(backend.processed) == 1
+    assert [result[3] for result in results] == [{"id": "1"}, {"id": "1"}, {"id": "2"}]
+
+
+def test_results_map_back_to_input_urls_including_duplicates():
+    backend = StubBackend(missing={"3"})
+    urls = [
+        "https://v.douyin.com/b",
+        "https://v.douyin.com/bad",
+        "https://v.douyin.com/a",
+        "https://v.douyin.com/c",
+        "https://v.douyin.com/b",
+    ]
+    results = backend.run(urls)
+    assert [result[0] for result in results] == urls
+    assert [result[1] for result in results] == [True, False, True, False, True]
+    assert results[0][3] == results[4][3] == {"id": "2"}
+    assert results[1][2] == "无法从链接提取视频ID"
+    assert results[3][2] == "无法获取视频ID为 3 的详细信息"
+    # 重复链接只解析一次
+    assert backend.resolved.count("https://v.douyin.com/b") == 1
+
+
+def test_unprocessed_detail_is_reported_per_url():
+    backend = StubBackend()
+
+    async def process(fetched):
+        return {}
+
+    results = asyncio.run(run_video_batch(["https://v.douyin.com/a"], backend.resolve, backend.fetch, process))
+    assert results == [("https://v.douyin.com/a", False, "处理视频ID为 1 的详情失败", None)]
+
+
+def test_concurrency_is_bounded():
+    backend = StubBackend(delay=0.01)
+    urls = [f"https://v.douyin.com/{i}" for i in range(20)]
+    for i, url in enumerate(urls):
+        URL_IDS[url] = str(100 + i)
+    try:
+        results = backend.run(urls, concurrency=3)
+    finally:
+        for url in urls:
+            URL_IDS.pop(url)
+    assert all(result[1] for result in results)
+    assert len(backend.fetched) == 20
+    assert backend.peak == 3
+
+
+def test_empty_batch_skips_processing():
+    backend = StubBackend()
+    assert backend.run(["https://v.douyin.com/bad"]) == [
+        ("https://v.douyin.com/bad", False, "无法从链接提取视频ID", None),
+    ]
+    assert backend.fetched == [] and backend.processed == []
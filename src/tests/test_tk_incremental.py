@@ -0,0 +1,110 @@
+import sys
+import asyncio
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.services.tk_incremental import CursorStore, IncrementalCrawler, account_page_fetcher
+
+
+def make_posts(count, newest_time=10_000):
+    """按发布时间倒序排列的作品"""
+    return [{"aweme_id": str(newest_time - i), "create_time": newest_time - i} for i in range(count)]
+
+
+class FakeAccount:
+    """模拟 TikTokDownloader 的 Account：按游标（毫秒）返回一页作品"""
+    posts = []
+    calls = []
+
+    def __init__(self, parameter, sec_user_id, pages, cursor, count):
+        self.cursor = cursor
+        self.count = count
+        self.finished = False
+
+    async def run(self):
+        FakeAccount.calls.append(self.cursor)
+        posts = [p for p in self.posts if not self.cursor or p["create_time"] * 1000 < self.cursor]
+        page = posts[:self.count]
+        self.finished = len(posts) <= self.count
+        return page, None, None
+
+
+def run_crawl(store, sec_user_id="u1", **kwargs):
+    crawler = IncrementalCrawler(store, **kwargs)
+    fetch_page = account_page_fetcher(FakeAccount, None, sec_user_id, count=5)
+    return crawler, asyncio.run(crawler.crawl(sec_user_id, fetch_page))
+
+
+def test_incremental_crawl_stops_at_known_posts(tmp_path):
+    store = CursorStore(str(tmp_path / "cursor.db"))
+    FakeAccount.posts = make_posts(23)
+    crawler, first = run_crawl(store)
+    assert len(first) == 23
+    assert crawler.last_pages == 5
+
+    # 发布 3 个新作品后，只翻一页即可
+    FakeAccount.posts = make_posts(26, newest_time=10_003)
+    crawler, second = run_crawl(store)
+    assert [p["aweme_id"] for p in second] == ["10003", "10002", "10001"]
+    assert crawler.last_pages == 1
+
+    crawler, third = run_crawl(store)
+    assert third == []
+    assert crawler.last_pages == 1
+
+    async def newest():
+        cursor = await store.get("u1")
+        await store.close()
+        return cursor.newest_id
+
+    assert asyncio.run(newest()) == "10003"
+
+
+def test_pinned_posts_do_not_stop_paging(tmp_path):
+    store = CursorStore(str(tmp_path / "cursor.db"))
+    FakeAccount.posts = make_posts(10)
+    run_crawl(store)
+
+    pinned = {"aweme_id": "1", "create_time": 1, "is_top": 1}
+    FakeAccount.posts = [pinned] + make_posts(12, newest_time=10_002)
+    _, new_posts = run_crawl(store)
+    assert [p["aweme_id"] for p in new_posts] == ["10002", "10001"]
+
+
+def test_initial_pages_limits_first_crawl(tmp_path):
+    store = CursorStore(str(tmp_path / "cursor.db"))
+    FakeAccount.posts = make_posts(30)
+    crawler, first = run_crawl(store, initial_pages=2)
+    assert len(first) == 10
+    assert crawler.last_pages == 2
+
+
+def test_page_cap_resumes_instead_of_skipping(tmp_path):
+    store = CursorStore(str(tmp_path / "cursor.db"))
+    FakeAccount.posts = make_posts(10)
+    run_crawl(store)
+
+    # 发布 12 个新作品，每次只翻一页（5 个），游标不能越过尚未抓取的作品
+    FakeAccount.posts = make_posts(22, newest_time=10_012)
+    crawled = []
+    for _ in range(3):
+        _, new_posts = run_crawl(store, max_pages=1)
+        crawled.extend(p["aweme_id"] for p in new_posts)
+    assert sorted(crawled, reverse=True) == [str(t) for t in range(10_012, 10_000, -1)]
+
+    # 补齐期间又发布的作品在补齐后从首页抓取
+    FakeAccount.posts = make_posts(24, newest_time=10_014)
+    _, new_posts = run_crawl(store, max_pages=2)
+    assert [p["aweme_id"] for p in new_posts] == ["10014", "10013"]
+    _, new_posts = run_crawl(store, max_pages=1)
+    assert new_posts == []
+
+    async def newest():
+        cursor = await store.get("u1")
+        await store.close()
+        return cursor
+
+    cursor = asyncio.run(newest())
+    assert cursor.newest_id == "10014" and cursor.resume_cursor is None
@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.services.tk_link_cache import LinkResolutionCache, normalize_share_url
+
+
+def test_short_link_drops_query_and_share_text():
+    text = "7.43 复制打开抖音，看看【作品】 https://v.douyin.com/iRNBho6u/?from=share 去抖音看看"
+    assert normalize_share_url(text) == "https://v.douyin.com/iRNBho6u"
+    assert normalize_share_url("https://V.DOUYIN.COM/iRNBho6u/") == "https://v.douyin.com/iRNBho6u"
+
+
+def test_modal_links_keep_their_ids():
+    a = normalize_share_url("https://www.douyin.com/discover?modal_id=111&previous_page=app_code_link")
+    b = normalize_share_url("https://www.douyin.com/discover?modal_id=222")
+    assert a == "https://www.douyin.com/discover?modal_id=111"
+    assert a != b
+    assert normalize_share_url("https://www.douyin.com/user/MS4w?modal_id=333") != \
+        normalize_share_url("https://www.douyin.com/user/MS4w")
+
+
+def test_modal_links_do_not_collide_in_cache():
+    cache = LinkResolutionCache()
+    cache.set("https://www.douyin.com/discover?modal_id=111", ["111"])
+    cache.set("https://www.douyin.com/discover?modal_id=222&t=1", ["222"])
+    assert cache.get("https://www.douyin.com/discover?modal_id=111&from=web") == ["111"]
+    assert cache.get("https://www.douyin.com/discover?modal_id=222") == ["222"]
+
+
+def test_negative_entry_does_not_poison_modal_links():
+    cache = LinkResolutionCache()
+    cache.set("https://www.douyin.com/discover", [])
+    assert cache.get("https://www.douyin.com/discover?utm=x") == []
+    assert cache.get("https://www.douyin.com/discover?modal_id=111") is None
+    assert cache.stats == {"hits": 0, "negative_hits": 1, "misses": 1}
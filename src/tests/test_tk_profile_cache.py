@@ -0,0 +1,110 @@
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.services.tk_profile_cache import ProfileCache
+
+
+def make_fetch(calls, value="v", delay=0.0):
+    async def fetch():
+        calls.append(value)
+        await asyncio.sleep(delay)
+        return {"nickname": value}
+    return fetch
+
+
+def test_fresh_hit_and_hard_ttl_expiry():
+    cache = ProfileCache(soft_ttl=0.05, hard_ttl=0.05)
+    calls = []
+
+    async def run():
+        first = await cache.get_or_fetch("u1", make_fetch(calls, "a"))
+        again = await cache.get_or_fetch("u1", make_fetch(calls, "b"))
+        await asyncio.sleep(0.06)
+        # 超过 hard_ttl 视为未命中，等待回源
+        expired = await cache.get_or_fetch("u1", make_fetch(calls, "c"))
+        return first, again, expired
+
+    first, again, expired = asyncio.run(run())
+    assert first == again == {"nickname": "a"}
+    assert expired == {"nickname": "c"}
+    assert calls == ["a", "c"]
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 2
+
+
+def test_stale_value_returned_while_refreshing():
+    cache = ProfileCache(soft_ttl=0.05, hard_ttl=60)
+    calls = []
+
+    async def run():
+        await cache.get_or_fetch("u1", make_fetch(calls, "old"))
+        await asyncio.sleep(0.06)
+        stale = await cache.get_or_fetch("u1", make_fetch(calls, "fg"), make_fetch(calls, "new", delay=0.01))
+        # 刷新进行中的再次读取不重复刷新
+        stale_again = await cache.get_or_fetch("u1", make_fetch(calls, "fg"), make_fetch(calls, "dup"))
+        await asyncio.sleep(0.02)
+        fresh = await cache.get_or_fetch("u1", make_fetch(calls, "fg"))
+        return stale, stale_again, fresh
+
+    stale, stale_again, fresh = asyncio.run(run())
+    assert stale == stale_again == {"nickname": "old"}
+    assert fresh == {"nickname": "new"}
+    # 后台刷新使用 refresh 而不是 fetch
+    assert calls == ["old", "new"]
+    assert cache.stats["stale_hits"] == 2 and cache.stats["refreshes"] == 1
+
+
+def test_concurrent_misses_are_coalesced():
+    cache = ProfileCache()
+    calls = []
+
+    async def run():
+        fetch = make_fetch(calls, "a", delay=0.02)
+        return await asyncio.gather(*(cache.get_or_fetch("u1", fetch) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert results == [{"nickname": "a"}] * 5
+    assert calls == ["a"]
+    assert cache.stats["coalesced"] == 4
+
+
+def test_empty_result_is_not_cached():
+    cache = ProfileCache()
+
+    async def empty():
+        return None
+
+    async def run():
+        await cache.get_or_fetch("u1", empty)
+        return await cache.get_or_fetch("u1", make_fetch([], "a"))
+
+    assert asyncio.run(run()) == {"nickname": "a"}
+
+
+def test_inflight_fetches_are_separated_per_loop():
+    cache = ProfileCache()
+    calls = []
+
+    # 在一个事件循环中留下未完成的回源，然后关闭该循环
+    loop = asyncio.new_event_loop()
+
+    async def abandon():
+        loop.create_task(cache.get_or_fetch("u1", make_fetch(calls, "l1", delay=60)))
+        await asyncio.sleep(0)
+
+    loop.run_until_complete(abandon())
+    for task in asyncio.all_tasks(loop):
+        task.cancel()
+    loop.run_until_complete(asyncio.sleep(0))
+    loop.close()
+
+    # 另一个事件循环不会等待属于已关闭循环的任务
+    start = time.monotonic()
+    result = asyncio.run(asyncio.wait_for(cache.get_or_fetch("u1", make_fetch(calls, "l2")), 1))
+    assert result == {"nickname": "l2"}
+    assert time.monotonic() - start < 1
+    assert cache.stats["coalesced"] == 0
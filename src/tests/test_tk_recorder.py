@@ -0,0 +1,108 @@
+import sys
+import asyncio
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.services.tk_recorder import SQLiteRecorder
+
+FIELDS = ("id", "desc", "digg_count", "downloads")
+
+
+def read_rows(db_path):
+    with sqlite3.connect(db_path) as db:
+        return db.execute('SELECT id, "desc", digg_count, downloads FROM douyin_records ORDER BY id').fetchall()
+
+
+def test_batches_by_size_and_flushes_on_close(tmp_path):
+    db_path = str(tmp_path / "records.db")
+
+    async def run():
+        async with SQLiteRecorder(db_path, FIELDS, batch_size=50, flush_interval=60) as recorder:
+            for i in range(120):
+                await recorder.save([f"{i:03d}", f"作品{i}", i, ["https://a", "https://b"]])
+            # 让后台任务处理达到批量大小的写入
+            await asyncio.sleep(0.05)
+            assert recorder.stats["saved"] >= 50
+        return recorder.stats
+
+    stats = asyncio.run(run())
+    assert stats["saved"] == 120
+    assert stats["batches"] <= 3
+    rows = read_rows(db_path)
+    assert len(rows) == 120
+    assert rows[1] == ("001", "作品1", 1, '["https://a", "https://b"]')
+
+
+def test_flushes_on_interval_and_replaces_duplicates(tmp_path):
+    db_path = str(tmp_path / "records.db")
+
+    async def run():
+        async with SQLiteRecorder(db_path, FIELDS, batch_size=1000, flush_interval=0.02) as recorder:
+            await recorder.save(["1", "旧描述", 1, None])
+            await asyncio.sleep(0.1)
+            assert recorder.stats["saved"] == 1
+            await recorder.save_item({"id": "1", "desc": "新描述", "digg_count": 2})
+
+    asyncio.run(run())
+    assert read_rows(db_path) == [("1", "新描述", 2, None)]
+
+
+def test_save_does_not_wait_for_disk(tmp_path):
+    db_path = str(tmp_path / "records.db")
+
+    async def run():
+        async with SQLiteRecorder(db_path, FIELDS, batch_size=10_000, flush_interval=60) as recorder:
+            for i in range(1000):
+                await recorder.save([str(i), "", i, None])
+            # 未达到批量大小与时间间隔，全部仍在内存队列中
+            assert recorder.stats["batches"] == 0
+        return recorder.stats
+
+    assert asyncio.run(run())["batches"] == 1
+    assert len(read_rows(db_path)) == 1000
+
+
+def test_rows_failing_past_retry_limit_are_dropped(tmp_path):
+    db_path = str(tmp_path / "records.db")
+
+    async def run():
+        recorder = SQLiteRecorder(db_path, FIELDS, batch_size=1000, flush_interval=60, max_retries=2)
+        await recorder.open()
+        await recorder.save(["1", "正常", 1, None])
+        # 字段数不符的记录让整批写入失败
+        await recorder.save(["2", "缺少字段"])
+        await recorder.save(["3", "正常", 3, None])
+        with pytest.raises(sqlite3.Error):
+            await recorder.flush()
+        assert len(recorder._retries) == 3
+        # 达到重试上限后逐条写入，只丢弃无法写入的记录
+        with pytest.raises(sqlite3.Error):
+            await recorder.flush()
+        assert recorder._retries == [] and recorder._pending == []
+        await recorder.close()
+        return recorder.stats
+
+    stats = asyncio.run(run())
+    assert stats["dropped"] == 1 and stats["saved"] == 2
+    assert [row[0] for row in read_rows(db_path)] == ["1", "3"]
+
+
+def test_close_releases_connection_when_final_flush_fails(tmp_path):
+    db_path = str(tmp_path / "records.db")
+
+    async def run():
+        recorder = SQLiteRecorder(db_path, FIELDS, batch_size=1000, flush_interval=60, max_retries=10)
+        await recorder.open()
+        await recorder.save(["1", "缺少字段"])
+        with pytest.raises(sqlite3.Error):
+            await recorder.close()
+        return recorder
+
+    recorder = asyncio.run(run())
+    assert recorder._db is None
+    assert recorder.stats["dropped"] == 1
@@ -0,0 +1,165 @@
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.services.tk_session_pool import LoopPools, SessionPool
+from src.utils.loop_thread import close_on_shutdown
+
+
+class FakeSession:
+    def __init__(self, cookie):
+        self.cookie = cookie
+        self.last_refresh = time.monotonic()
+        self.refreshes = []
+        self.closed = False
+
+    def refresh(self, cookie=None):
+        self.refreshes.append(cookie)
+        self.last_refresh = time.monotonic()
+
+    async def close(self):
+        self.closed = True
+
+
+def make_pool(**kwargs):
+    created = []
+
+    async def factory(cookie):
+        session = FakeSession(cookie)
+        created.append(session)
+        return session
+
+    return SessionPool(factory, **kwargs), created
+
+
+def test_released_session_is_reused_per_cookie():
+    pool, created = make_pool()
+
+    async def run():
+        async with pool.session("c1") as first:
+            pass
+        async with pool.session("c1") as again:
+            pass
+        async with pool.session("c2") as other:
+            pass
+        return first, again, other
+
+    first, again, other = asyncio.run(run())
+    assert first is again
+    assert other is not first and other.cookie == "c2"
+    assert first.session_pool is pool
+    assert pool.stats["created"] == 2 and pool.stats["reused"] == 1
+
+
+def test_expired_session_is_refreshed_on_acquire():
+    pool, created = make_pool(refresh_interval=0.05)
+
+    async def run():
+        async with pool.session() as session:
+            pass
+        await asyncio.sleep(0.06)
+        async with pool.session() as again:
+            pass
+        return session, again
+
+    session, again = asyncio.run(run())
+    assert session is again
+    assert session.refreshes == [None]
+    assert pool.stats["refreshed"] == 1
+
+
+def test_broken_session_is_discarded():
+    pool, created = make_pool(max_sessions_per_cookie=1)
+
+    async def run():
+        with pytest.raises(ValueError):
+            async with pool.session() as broken:
+                raise ValueError("boom")
+        # 丢弃后名额归还，可以新建会话
+        async with pool.session() as fresh:
+            pass
+        return broken, fresh
+
+    broken, fresh = asyncio.run(run())
+    assert broken.closed and not fresh.closed
+    assert fresh is not broken
+    assert pool.stats["discarded"] == 1 and pool.stats["created"] == 2
+
+
+def test_cancelled_borrower_returns_session():
+    pool, created = make_pool()
+
+    async def run():
+        entered = asyncio.Event()
+
+        async def borrow():
+            async with pool.session():
+                entered.set()
+                await asyncio.sleep(60)
+
+        task = asyncio.create_task(borrow())
+        await entered.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        async with pool.session() as session:
+            return session
+
+    session = asyncio.run(run())
+    assert session is created[0] and not session.closed
+    assert pool.stats["discarded"] == 0
+
+
+def test_borrowers_wait_when_pool_is_full():
+    pool, created = make_pool(max_sessions_per_cookie=1)
+
+    async def run():
+        first = await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        await pool.release(first)
+        second = await asyncio.wait_for(waiter, 1)
+        await pool.release(second)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is second and len(created) == 1
+
+
+def test_shared_pool_is_closed_when_loop_ends():
+    pools = LoopPools(lambda: make_pool()[0], close_on_shutdown)
+
+    async def run():
+        pool = pools.get()
+        assert pools.get() is pool
+        async with pool.session() as session:
+            pass
+        return pool, session
+
+    pool, session = asyncio.run(run())
+    assert pool.closed and session.closed
+
+    # 新的事件循环获得新的会话池
+    other, _ = asyncio.run(run())
+    assert other is not pool
+
+
+def test_session_borrowed_during_close_is_closed_on_release():
+    pool, created = make_pool()
+
+    async def run():
+        session = await pool.acquire()
+        await pool.close()
+        with pytest.raises(RuntimeError):
+            await pool.acquire()
+        await pool.release(session)
+        return session
+
+    assert asyncio.run(run()).closed
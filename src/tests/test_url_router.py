@@ -0,0 +1,82 @@
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.url_router import URLRouter, classify
+
+
+@pytest.mark.parametrize("url, kind, item_id", [
+    ("https://www.xiaohongshu.com/explore/64674a91000000001301762e?xsec_token=abc", "xhs_note", "64674a91000000001301762e"),
+    ("https://www.xiaohongshu.com/discovery/item/64674a91000000001301762e", "xhs_note", "64674a91000000001301762e"),
+    ("http://xhslink.com/a/AbC123", "xhs_short", "AbC123"),
+    ("https://www.douyin.com/video/7475254041207950642", "douyin_video", "7475254041207950642"),
+    ("https://www.iesdouyin.com/share/video/7475254041207950642/", "douyin_video", "7475254041207950642"),
+    ("https://www.douyin.com/user/MS4wLjABAAAA-x_y", "douyin_user", "MS4wLjABAAAA-x_y"),
+    ("7.9 复制打开抖音 https://v.douyin.com/iRNBho6u/ 看看", "douyin_short", "iRNBho6u"),
+    ("https://www.tiktok.com/@some.user/video/7300000000000000000", "tiktok", "7300000000000000000"),
+    ("https://vm.tiktok.com/ZMabc123/", "tiktok", "ZMabc123"),
+])
+def test_classify(url, kind, item_id):
+    match = classify(url)
+    assert match.kind == kind
+    assert match.id == item_id
+
+
+def test_classify_keeps_query_and_strips_share_text():
+    assert classify("https://www.xiaohongshu.com/explore/64674a91000000001301762e?xsec_token=abc 复制").url == (
+        "https://www.xiaohongshu.com/explore/64674a91000000001301762e?xsec_token=abc"
+    )
+    assert classify("https://example.com/video/1") is None
+
+
+def test_falls_back_and_prefers_healthy_fast_backend():
+    calls = []
+
+    async def broken(url):
+        calls.append("broken")
+        raise RuntimeError("boom")
+
+    def slow(url):
+        calls.append("slow")
+        time.sleep(0.02)
+        return {"url": url}
+
+    async def fast(url):
+        calls.append("fast")
+        return True, "成功", {"url": url}
+
+    router = URLRouter(max_consecutive_failures=2)
+    router.register("broken", broken, ["douyin_video"])
+    router.register("slow", slow, ["douyin_video"])
+    router.register("fast", fast, ["douyin_video"])
+
+    async def run():
+        url = "https://www.douyin.com/video/1"
+        first = await router.route(url)
+        assert first[0] and first[1].startswith("slow")
+        # 未试用过的 fast 排在有失败记录的 broken 之前
+        assert [b.name for b in router.ranked("douyin_video")] == ["fast", "slow", "broken"]
+        await router.route(url)
+        await router.route(url)
+        return [b.name for b in router.ranked("douyin_video")]
+
+    assert asyncio.run(run()) == ["fast", "slow", "broken"]
+    assert calls == ["broken", "slow", "fast", "fast"]
+
+
+def test_all_backends_fail():
+    router = URLRouter()
+    router.register("empty", lambda url: None, ["xhs_note"])
+    router.register("failed", lambda url: (False, "风控", None), ["xhs_note"])
+
+    success, msg, data = asyncio.run(router.route("https://www.xiaohongshu.com/explore/64674a91000000001301762e"))
+    assert not success and data is None
+    assert "empty" in msg and "风控" in msg
+    assert asyncio.run(router.route("https://example.com"))[0] is False
+    assert [s["failures"] for s in router.stats()] == [1, 1]
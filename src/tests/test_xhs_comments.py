@@ -0,0 +1,97 @@
+import sys
+import asyncio
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.services.xhs_comments import CommentFetcher, build_tree, parse_count
+from src.utils.exceptions import CircuitOpenError
+from src.utils.pagination import iter_pages
+
+
+def raw_comment(comment_id, has_more=False, inline=(), target=None):
+    return {
+        "id": comment_id,
+        "content": f"内容{comment_id}",
+        "like_count": "1.5万" if comment_id == "r1" else "3",
+        "create_time": 1700000000000,
+        "user_info": {"user_id": f"u{comment_id}"},
+        "sub_comments": [raw_comment(sub) for sub in inline],
+        "sub_comment_has_more": has_more,
+        "sub_comment_cursor": "c0",
+        **({"target_comment": {"id": target}} if target else {}),
+    }
+
+
+class FakeService:
+    """模拟两页一级评论，其中两条评论需要继续展开子评论"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+
+    def iter_note_comments(self, note_url, limit=None, expand_sub_comments=True, proxies=None):
+        pages = {
+            "": ([raw_comment("r1", True, ["r1-s0"]), raw_comment("r2")], "p2", True),
+            "p2": ([raw_comment("r3", True)], "", False),
+        }
+
+        async def fetch(cursor):
+            return pages[cursor]
+
+        return iter_pages(fetch, "", limit)
+
+    def iter_sub_comments(self, note_url, root_comment_id, cursor="", limit=None, proxies=None):
+        async def fetch(cursor):
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            await asyncio.sleep(self.delay)
+            self.active -= 1
+            if cursor == "c0":
+                return [raw_comment(f"{root_comment_id}-s1", target=f"{root_comment_id}-s0")], "c1", True
+            return [raw_comment(f"{root_comment_id}-s2")], "", False
+
+        return iter_pages(fetch, cursor, limit)
+
+
+def test_comment_tree_order_and_parents():
+    service = FakeService()
+    nodes = asyncio.run(CommentFetcher(service, concurrency=4).fetch("https://www.xiaohongshu.com/explore/n1"))
+    assert [node.id for node in nodes] == ["r1", "r1-s0", "r1-s1", "r1-s2", "r2", "r3", "r3-s1", "r3-s2"]
+    tree = build_tree(nodes)
+    assert [node.id for node in tree[None]] == ["r1", "r2", "r3"]
+    assert [node.id for node in tree["r1"]] == ["r1-s0", "r1-s2"]
+    assert [node.id for node in tree["r1-s0"]] == ["r1-s1"]
+    assert nodes[0].like_count == 15000
+    # 两条子评论线程并发展开
+    assert service.max_active == 2
+
+
+def test_concurrency_is_bounded():
+    service = FakeService()
+    asyncio.run(CommentFetcher(service, concurrency=1).fetch("https://www.xiaohongshu.com/explore/n1"))
+    assert service.max_active == 1
+
+
+def test_parse_count():
+    assert parse_count("1.2万") == 12000
+    assert parse_count("") == 0
+    assert parse_count("赞") == 0
+
+
+def test_open_breaker_is_not_swallowed_by_thread_expansion():
+    class BreakerOpenService(FakeService):
+        def iter_sub_comments(self, note_url, root_comment_id, cursor="", limit=None, proxies=None):
+            async def fetch(cursor):
+                raise CircuitOpenError("xhs", 30)
+
+            return iter_pages(fetch, cursor, limit)
+
+    fetcher = CommentFetcher(BreakerOpenService(), concurrency=4)
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(fetcher.fetch("https://www.xiaohongshu.com/explore/n1"))
+    assert fetcher.errors == []
@@ -1,5 +1,6 @@
 import os
 import sys
+import asyncio
 from pathlib import Path
 
 
@@ -13,6 +14,10 @@ print(f"NODE_PATH 环境变量已设置为: {os.environ['NODE_PATH']}")
 sys.path.insert(0, str(ROOT_DIR))
 
 from src.services.xhs_service import XHSService
+from src.services.xhs_async_service import AsyncXHSService
+from src.services.xhs_service import PLATFORM
+from src.utils.circuit_breaker import BreakerRegistry
+from src.utils.exceptions import CircuitOpenError
 
 
 # 从根目录的cookies.txt获取Cookie
@@ -142,6 +147,46 @@ def test_download_note_media():
     print(f"媒体文件下载成功，保存路径: {save_path}")
 
 
+def test_async_get_note_info():
+    note_url = "https://www.xiaohongshu.com/explore/64674a91000000001301762e?xsec_token=ABAJcy_294mBZauFhAac6izmJvYB6yqm49MAtXSVU8XA4=&xsec_source=pc_feed"
+
+    async def run():
+        async with AsyncXHSService(cookie_file) as service:
+            # 同一事件循环中并发查询，共享一组连接
+            return await asyncio.gather(*(service.get_note_info(note_url) for _ in range(3)))
+
+    results = asyncio.run(run())
+    for success, msg, note_info in results:
+        assert success, f"获取笔记失败: {msg}"
+        assert "title" in note_info
+    print(f"并发获取 {len(results)} 次笔记成功")
+
+
+
+def test_async_open_breaker_reaches_caller():
+    import pytest
+
+    breakers = BreakerRegistry(window=2, min_calls=2, open_seconds=60)
+    breaker = breakers.get(PLATFORM, error_factory=CircuitOpenError)
+    breaker.record(False)
+    breaker.record(False)
+    note_url = "https://www.xiaohongshu.com/explore/64674a91000000001301762e"
+    user_url = "https://www.xiaohongshu.com/user/profile/5a1b2c3d4e5f6a7b8c9d0e1f"
+
+    async def run():
+        async with AsyncXHSService(cookie_file, breakers=breakers) as service:
+            # 熔断异常继承自 XHSExtractError，不能被当作普通提取失败吞掉
+            for call in (
+                lambda: service.search_notes("旅行", limit=5),
+                lambda: service.get_note_comments(note_url),
+                lambda: service.get_note_comment_tree(note_url),
+                lambda: service.get_user_notes(user_url),
+            ):
+                with pytest.raises(CircuitOpenError):
+                    await call()
+
+    asyncio.run(run())
+
 # 在 __main__ 中添加这些测试
 if __name__ == "__main__":
     verify_node_modules()
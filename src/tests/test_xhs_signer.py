@@ -0,0 +1,85 @@
+import sys
+import shutil
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.services.xhs_signer import NodeSignPool, SignWorkerError, install_sign_pool, uninstall_sign_pool
+
+needs_node = pytest.mark.skipif(shutil.which("node") is None, reason="需要 Node.js")
+
+BUNDLE = """
+var calls = 0;
+function get_request_headers_params(api, data, a1) {
+    calls += 1;
+    console.log('bundle log should not break the protocol');
+    return {xs: 'XYW_' + a1 + api, xt: 1700000000000, xs_common: String(calls)};
+}
+function crash() { process.exit(1); }
+function fail() { throw new Error('boom'); }
+function noisy() { process.stdout.write('not json\\n'); return 42; }
+"""
+
+
+@pytest.fixture
+def pool(tmp_path):
+    bundle = tmp_path / "bundle.js"
+    bundle.write_text(BUNDLE, encoding="utf-8")
+    pool = NodeSignPool(size=2, bundle_path=bundle, timeout=5)
+    yield pool
+    pool.close()
+
+
+@needs_node
+def test_sign_calls_reuse_preloaded_bundle(pool):
+    for _ in range(4):
+        ret = pool.call("get_request_headers_params", "/api/sns/web/v1/feed", "", "a1")
+        assert ret["xs"] == "XYW_a1/api/sns/web/v1/feed"
+    # 两个常驻进程各自累计调用次数，说明进程没有每次重建
+    assert int(ret["xs_common"]) >= 2
+    stats = pool.stats()
+    assert stats["count"] == 4
+    assert stats["p50_ms"] > 0
+
+
+@needs_node
+def test_script_error_is_reported(pool):
+    with pytest.raises(SignWorkerError, match="boom"):
+        pool.call("fail")
+    assert pool.call("get_request_headers_params", "/x", "", "a1")["xs"] == "XYW_a1/x"
+
+
+@needs_node
+def test_crashed_worker_is_restarted(pool):
+    with pytest.raises(SignWorkerError):
+        pool.call("crash")
+    assert pool.stats()["restarts"] >= 1
+    for _ in range(2):
+        assert pool.call("get_request_headers_params", "/x", "", "a1")["xs"] == "XYW_a1/x"
+
+
+@needs_node
+def test_non_json_stdout_lines_are_skipped(pool):
+    assert pool.call("noisy") == 42
+    assert pool.call("get_request_headers_params", "/x", "", "a1")["xs"] == "XYW_a1/x"
+
+
+def test_uninstall_restores_original_sign_context():
+    original = object()
+    module = types.SimpleNamespace(js=original)
+    first, second = object(), object()
+
+    install_sign_pool(first, module)
+    install_sign_pool(second, module)
+    assert module.js is second
+    uninstall_sign_pool(second, module)
+    assert module.js is first
+    # 未安装的进程池不影响当前绑定
+    uninstall_sign_pool(second, module)
+    assert module.js is first
+    uninstall_sign_pool(first, module)
+    assert module.js is original
@@ -3,20 +3,71 @@ import re
 import json
 import os
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Union
+import sys
+import importlib.util
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Tuple, Union
+from urllib.parse import urlparse
 
 import httpx
 from httpx import AsyncClient, HTTPStatusError, RequestError
 
+# 添加项目根目录以导入公共工具
+ROOT_DIR = Path(__file__).parent.parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.batch import note_id_from_url
+from src.utils.initial_state import extract_initial_state, first_note_detail
+from src.utils.media_store import MediaAsset, MediaStore, stable_name
+from src.utils.note_cache import NoteCache
+from src.utils.proxy_pool import ProxyPool
+from src.utils.stream_download import DEFAULT_CHUNK_SIZE, stream_download
+
+# 按主机划分的连接池：页面请求与 CDN 媒体请求各自复用长连接
+HOST_POOLS = (
+    ("page", ("xiaohongshu.com",)),
+    ("media", ("xhscdn.com",)),
+)
+
+
 @dataclass
 class XHSDownloader:
-    """小红书内容下载器"""
+    """
+    小红书内容下载器
+
+    内部按主机分组维护长期复用的 AsyncClient，建议通过 ``async with`` 使用，
+    或在结束时显式调用 ``aclose()`` 释放连接。
+    """
     
     # 网络请求配置
     headers: Dict[str, str] = field(default_factory=dict)
     proxy: Optional[str] = None
     timeout: int = 10
     cookie: Optional[str] = None
+
+    # 连接池配置
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+
+    # 流式下载配置
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    resume: bool = True
+    verify_size: bool = True
+
+    # 可选的笔记缓存，按 note_id 复用 extract_note_info 的结果
+    cache: Optional[NoteCache] = None
+
+    # 可选的内容寻址媒体存储，已下载过的资源不再重复请求
+    media_store: Optional[MediaStore] = None
+
+    # 可选的代理池，配置后每次请求选择最快的代理，优先于 proxy
+    proxy_pool: Optional[ProxyPool] = None
+
+    # 按 (连接池名称, 代理) 缓存的客户端
+    _clients: Dict[Tuple[str, Optional[str]], AsyncClient] = field(default_factory=dict, init=False, repr=False)
     
     def __post_init__(self):
         """初始化headers和cookie"""
@@ -43,16 +94,39 @@ class XHSDownloader:
         if self.cookie:
             self.headers["Cookie"] = self.cookie
 
-    async def _create_client(self) -> AsyncClient:
+    async def __aenter__(self) -> "XHSDownloader":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """关闭所有连接池"""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    def _http2_enabled(self) -> bool:
+        """HTTP/2 依赖 h2 包，未安装时回退到 HTTP/1.1"""
+        if self.http2 and importlib.util.find_spec("h2") is None:
+            print("未安装 h2，HTTP/2 已禁用")
+            self.http2 = False
+        return self.http2
+
+    async def _create_client(self, proxy: Optional[str] = None) -> AsyncClient:
         """创建异步HTTP客户端"""
-        transport = None
-        if self.proxy:
-            transport = httpx.AsyncHTTPTransport(
-                proxy=httpx.Proxy(
-                    url=self.proxy,
-                    mode="TUNNEL"
-                )
-            )
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+        http2 = self._http2_enabled()
+        transport = httpx.AsyncHTTPTransport(
+            proxy=httpx.Proxy(url=proxy) if proxy else None,
+            limits=limits,
+            http2=http2,
+            verify=False,
+        )
         
         return AsyncClient(
             headers=self.headers,
@@ -62,6 +136,24 @@ class XHSDownloader:
             verify=False
         )
 
+    @staticmethod
+    def _pool_name(url: str) -> str:
+        """根据主机名确定所属连接池"""
+        host = (urlparse(url).hostname or "").lower()
+        for name, suffixes in HOST_POOLS:
+            if any(host == suffix or host.endswith("." + suffix) for suffix in suffixes):
+                return name
+        return "default"
+
+    async def _get_client(self, url: str, proxy: Optional[str] = None) -> AsyncClient:
+        """获取（必要时创建）目标主机与代理对应的共享客户端"""
+        key = (self._pool_name(url), proxy or self.proxy)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = await self._create_client(key[1])
+            self._clients[key] = client
+        return client
+
     def _clean_url(self, url: str) -> str:
         """清理URL，移除token等参数"""
         return re.sub(r'\?.*', '', url)
@@ -71,10 +163,17 @@ class XHSDownloader:
         clean_url = self._clean_url(url)
         
         try:
-            async with await self._create_client() as client:
+            if self.proxy_pool is None:
+                client = await self._get_client(clean_url)
                 response = await client.request(method, clean_url)
                 response.raise_for_status()
-                return response
+            else:
+                # 状态码检查放在 track 块内，403/5xx 计为代理失败
+                with self.proxy_pool.track() as tracker:
+                    client = await self._get_client(clean_url, tracker.proxy)
+                    response = await client.request(method, clean_url)
+                    response.raise_for_status()
+            return response
         except (HTTPStatusError, RequestError) as e:
             print(f"请求错误: {e}")
             # 打印响应内容以便调试
@@ -84,6 +183,15 @@ class XHSDownloader:
 
     async def extract_note_info(self, url: str) -> Dict[str, Any]:
         """提取作品详细信息"""
+        if self.cache is not None:
+            return await self.cache.aget_or_fetch(
+                f"downloader:{note_id_from_url(url)}",
+                lambda: self._extract_note_info(url),
+            )
+        return await self._extract_note_info(url)
+
+    async def _extract_note_info(self, url: str) -> Dict[str, Any]:
+        """请求页面并提取作品详细信息，不经过缓存"""
         try:
             response = await self._request(url)
             html = response.text
@@ -91,23 +199,20 @@ class XHSDownloader:
             # 打印HTML以便调试
             print("响应HTML长度:", len(html))
             
-            # 使用正则提取JSON数据
-            match = re.search(r'window\.__INITIAL_STATE__=({.*?});', html, re.DOTALL)
-            if not match:
-                # 如果没有匹配到，打印HTML内容
-                print("未找到 __INITIAL_STATE__ 数据")
-                print("HTML预览:", html[:1000])  # 打印前1000个字符
-                raise ValueError("未找到作品数据")
-            
+            # 线性扫描提取状态数据，避免正则回溯与截断
             try:
-                data = json.loads(match.group(1))
+                data = extract_initial_state(html)
             except json.JSONDecodeError as e:
                 print(f"JSON解析错误: {e}")
-                print("解析失败的JSON片段:", match.group(1)[:500])
                 raise
+            if data is None:
+                # 如果没有找到，打印HTML内容
+                print("未找到 __INITIAL_STATE__ 数据")
+                print("HTML预览:", html[:1000])  # 打印前1000个字符
+                raise ValueError("未找到作品数据")
             
             # 提取关键信息
-            note_data = data.get('noteDetailMap', {}).get('note', {})
+            note_data = first_note_detail(data)
             
             # 如果note_data为空，打印调试信息
             if not note_data:
@@ -167,6 +272,75 @@ class XHSDownloader:
         
         return None
 
+    async def _stream_to_file(self, url: str, filepath: str) -> int:
+        """流式写盘，支持断点续传与大小校验"""
+        if self.proxy_pool is None:
+            return await self._stream_with_client(await self._get_client(url), url, filepath)
+        # 下载耗时取决于文件大小，只统计成败，不计入代理延迟
+        with self.proxy_pool.track(measure_latency=False) as tracker:
+            client = await self._get_client(url, tracker.proxy)
+            return await self._stream_with_client(client, url, filepath)
+
+    async def _stream_with_client(self, client: AsyncClient, url: str, filepath: str) -> int:
+        return await stream_download(
+            client,
+            url,
+            filepath,
+            chunk_size=self.chunk_size,
+            resume=self.resume,
+            verify_size=self.verify_size,
+        )
+
+    async def fetch_media(self, url: str, save_path: str, filename: str) -> MediaAsset:
+        """
+        下载单个媒体文件到 save_path/filename
+
+        配置了 media_store 时先查存储，命中则直接硬链接，未命中下载入库后再链接。
+
+        :return: 媒体清单条目，path 为 save_path 下的文件路径
+        """
+        filepath = os.path.join(save_path, filename)
+        if self.media_store is None:
+            size = await self._stream_to_file(url, filepath)
+            return MediaAsset(url, filepath, size, "", False)
+
+        ext = os.path.splitext(filename)[1]
+        asset = await self.media_store.fetch(url, lambda tmp_path: self._stream_to_file(url, tmp_path), ext)
+        self.media_store.link(asset, filepath)
+        return MediaAsset(url, filepath, asset.size, asset.digest, asset.cache_hit)
+
+    async def download_note_media(
+        self,
+        note_info: Dict[str, Any],
+        save_path: str = './downloads',
+        max_concurrent: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        下载作品的全部图片与视频
+
+        :param note_info: extract_note_info 的返回值
+        :param save_path: 保存路径
+        :param max_concurrent: 最大并发数
+        :return: 媒体清单，每项包含 url、path、size、digest、cache_hit
+        """
+        os.makedirs(save_path, exist_ok=True)
+        media = [(url, f"{stable_name(url)}.png") for url in note_info.get('images') or []]
+        if note_info.get('video'):
+            media.append((note_info['video'], f"{stable_name(note_info['video'])}.mp4"))
+
+        sem = asyncio.Semaphore(max_concurrent)
+
+        async def bounded_fetch(url, filename):
+            async with sem:
+                try:
+                    return await self.fetch_media(url, save_path, filename)
+                except Exception as e:
+                    print(f"下载 {url} 失败: {e}")
+                    return None
+
+        assets = await asyncio.gather(*(bounded_fetch(url, filename) for url, filename in media))
+        return [asset.as_dict() for asset in assets if asset]
+
     async def download_images(
         self, 
         images: List[str], 
@@ -185,17 +359,9 @@ class XHSDownloader:
         
         async def download_single_image(url: str) -> Optional[str]:
             try:
-                async with await self._create_client() as client:
-                    response = await client.get(url)
-                    response.raise_for_status()
-                    
-                    # 使用hash值作为文件名，避免重复
-                    filename = os.path.join(save_path, f"{hash(url)}.png")
-                    
-                    with open(filename, 'wb') as f:
-                        f.write(response.content)
-                    
-                    return filename
+                # 使用稳定的URL摘要作为文件名，跨进程一致
+                asset = await self.fetch_media(url, save_path, f"{stable_name(url)}.png")
+                return asset.path
             except Exception as e:
                 print(f"下载图片 {url} 失败: {e}")
                 return None
@@ -231,20 +397,12 @@ class XHSDownloader:
         os.makedirs(save_path, exist_ok=True)
         
         try:
-            async with await self._create_client() as client:
-                response = await client.get(video_url)
-                response.raise_for_status()
-                
-                # 如果没有提供文件名，使用URL的hash值
-                if not filename:
-                    filename = f"{hash(video_url)}.mp4"
-                
-                filepath = os.path.join(save_path, filename)
-                
-                with open(filepath, 'wb') as f:
-                    f.write(response.content)
-                
-                return filepath
+            # 如果没有提供文件名，使用稳定的URL摘要
+            if not filename:
+                filename = f"{stable_name(video_url)}.mp4"
+            
+            asset = await self.fetch_media(video_url, save_path, filename)
+            return asset.path
         except Exception as e:
             print(f"下载视频失败: {e}")
             return None
@@ -263,6 +421,11 @@ async def main():
     # 替换为实际的小红书作品链接
     url = "https://www.xiaohongshu.com/explore/64674a91000000001301762e"
     
+    async with downloader:
+        await _run_example(downloader, url)
+
+
+async def _run_example(downloader: XHSDownloader, url: str):
     try:
         # 提取作品信息
         note_info = await downloader.extract_note_info(url)
@@ -32,6 +32,14 @@ async def test_xhs_downloader():
     # 测试结果
     test_results = []
 
+    async with downloader:
+        await _run_urls(downloader, test_urls, download_dir, test_results)
+
+    _print_summary(test_results)
+
+
+async def _run_urls(downloader, test_urls, download_dir, test_results):
+
     # 逐个测试链接
     for url in test_urls:
         print(f"\n🔍 正在测试链接: {url}")
@@ -86,6 +94,8 @@ async def test_xhs_downloader():
         
         test_results.append(test_result)
 
+
+def _print_summary(test_results):
     # 打印测试总结
     print("\n🏁 测试总结:")
     for result in test_results:
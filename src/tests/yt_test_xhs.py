@@ -55,5 +55,6 @@ def get_xhs_stats(url, cookie_file='cookies.txt'):
         return f"解析失败: {type(e).__name__} - {str(e)}"
 
 # 示例使用
-url = "https://www.xiaohongshu.com/explore/64674a91000000001301762e?xsec_token=ABAJcy_294mBZauFhAac6izmJvYB6yqm49MAtXSVU8XA4=&xsec_source=pc_feed"
-print(get_xhs_stats(url))
\ No newline at end of file
+if __name__ == "__main__":
+    url = "https://www.xiaohongshu.com/explore/64674a91000000001301762e?xsec_token=ABAJcy_294mBZauFhAac6izmJvYB6yqm49MAtXSVU8XA4=&xsec_source=pc_feed"
+    print(get_xhs_stats(url))
\ No newline at end of file
@@ -0,0 +1,40 @@
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+
+def note_id_from_url(url: str) -> str:
+    """从笔记链接中提取 note_id，用于批量请求去重"""
+    return urlparse(url.strip()).path.rstrip("/").split("/")[-1]
+
+
+@dataclass
+class BatchStats:
+    """批量请求统计"""
+    total: int = 0
+    unique: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    elapsed: float = 0.0
+
+    def record(self, success: bool):
+        if success:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+    def finish(self) -> "BatchStats":
+        self.elapsed = time.monotonic() - self.started_at
+        return self
+
+    @property
+    def throughput(self) -> float:
+        """每秒完成的去重后请求数"""
+        return (self.succeeded + self.failed) / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"共{self.total}个链接，去重后{self.unique}个，成功{self.succeeded}，失败{self.failed}，"
+            f"耗时{self.elapsed:.2f}s，吞吐{self.throughput:.2f}个/秒"
+        )
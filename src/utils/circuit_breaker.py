@@ -0,0 +1,215 @@
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+# 本模块只依赖标准库，tk_329 通过文件路径加载
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# 默认的慢调用阈值（秒）：平台接口正常耗时在 1~2 秒内，持续超过该值通常意味着被限流或代理异常
+DEFAULT_SLOW_CALL_SECONDS = 5.0
+
+
+def _default_error(name: str, retry_after: float) -> Exception:
+    return RuntimeError(f"{name} 熔断中，{retry_after:.0f} 秒后重试")
+
+
+class CircuitBreaker:
+    """
+    熔断器
+
+    - closed：正常放行，最近 window 次调用中失败（含慢调用）比例达到 failure_threshold
+      且样本不少于 min_calls 时打开；
+    - open：直接拒绝，抛出 error_factory 构造的异常，open_seconds 秒后进入 half_open；
+    - half_open：放行 half_open_calls 次试探调用，全部成功则关闭，任一失败重新打开。
+
+    线程安全，同步与异步代码都通过 ``with breaker.guard() as call`` 使用。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 10,
+        failure_threshold: float = 0.5,
+        slow_call_seconds: Optional[float] = DEFAULT_SLOW_CALL_SECONDS,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 1,
+        error_factory: Callable[[str, float], Exception] = _default_error,
+    ):
+        """
+        :param name: 名称，如平台名或后端名
+        :param window: 统计的最近调用数
+        :param min_calls: 至少多少次调用后才可能打开
+        :param failure_threshold: 打开熔断的失败比例
+        :param slow_call_seconds: 超过该耗时（秒）的调用计为失败，None 表示不按耗时判断
+        :param open_seconds: 打开后多久进入半开状态（秒）
+        :param half_open_calls: 半开状态下的试探调用数
+        :param error_factory: 接收 (名称, 剩余秒数) 返回拒绝时抛出的异常
+        """
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.error_factory = error_factory
+        self.stats = {"calls": 0, "failures": 0, "slow_calls": 0, "rejected": 0, "opened": 0}
+        # 最近调用是否失败
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+            self._probe_successes = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    @property
+    def failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def retry_after(self) -> float:
+        """距离进入半开状态的秒数，未打开时为 0"""
+        if self._state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def allow(self):
+        """放行一次调用，熔断中时抛出异常"""
+        with self._lock:
+            self._refresh()
+            if self._state == CLOSED:
+                return
+            if self._state == HALF_OPEN and self._probes < self.half_open_calls:
+                self._probes += 1
+                return
+            self.stats["rejected"] += 1
+            error = self.error_factory(self.name, self.retry_after())
+        raise error
+
+    def record(self, success: bool, elapsed: Optional[float] = None):
+        """
+        上报一次已放行调用的结果
+
+        :param success: 调用是否成功
+        :param elapsed: 耗时（秒），用于识别慢调用
+        """
+        slow = self.slow_call_seconds is not None and elapsed is not None and elapsed > self.slow_call_seconds
+        failed = not success or slow
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["failures"] += not success
+            self.stats["slow_calls"] += slow
+            if self._state == HALF_OPEN:
+                if failed:
+                    self._open()
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_calls:
+                        self._state = CLOSED
+                        self._outcomes.clear()
+            elif self._state == CLOSED:
+                self._outcomes.append(failed)
+                if len(self._outcomes) >= self.min_calls and self.failure_rate >= self.failure_threshold:
+                    self._open()
+
+    def release(self):
+        """放行后被取消、未产生结果的调用，归还半开状态的试探名额"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self.stats["opened"] += 1
+
+    @contextmanager
+    def guard(self):
+        """
+        放行并统计一次调用
+
+        块内抛出异常记为失败；块内可调用 ``call.fail()`` 标记业务层识别出的失败（如风控）。
+        """
+        self.allow()
+        call = BreakerCall()
+        start = time.monotonic()
+        try:
+            yield call
+        except Exception:
+            self.record(False)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        else:
+            self.record(not call.failed, time.monotonic() - start)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """状态、失败率、剩余熔断时间与调用计数"""
+        with self._lock:
+            self._refresh()
+            return {
+                "name": self.name,
+                "state": self._state,
+                "failure_rate": round(self.failure_rate, 4),
+                "retry_after": round(self.retry_after(), 1),
+                **self.stats,
+            }
+
+
+class BreakerCall:
+    """一次被放行的调用"""
+
+    def __init__(self):
+        self.failed = False
+
+    def fail(self):
+        self.failed = True
+
+
+class BreakerRegistry:
+    """按名称管理熔断器，同名熔断器在共用注册表的服务实例之间共享"""
+
+    def __init__(self, **defaults: Any):
+        """
+        :param defaults: 新建熔断器的默认参数，见 CircuitBreaker
+        """
+        self.defaults = defaults
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, **options: Any) -> CircuitBreaker:
+        """获取熔断器，不存在时以 defaults 与 options 创建；已存在时 options 被忽略"""
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(name, **{**self.defaults, **options})
+            return breaker
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """全部熔断器的状态，用于监控"""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return [breaker.snapshot() for breaker in breakers]
+
+
+# 进程内共享的熔断器注册表
+shared_breakers = BreakerRegistry()
@@ -0,0 +1,211 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from src.utils.exceptions import NoCookieAvailableError
+
+# 小红书登录失效或触发风控时返回的错误码与提示
+RISK_CODES = {-100, -101, -104, 300011, 300012, 300013, 461}
+RISK_KEYWORDS = ("登录", "账号", "频次", "验证", "风控", "login", "captcha")
+
+
+def is_risk_error(msg: Any = "", code: Any = None) -> bool:
+    """判断失败是否由账号失效或风控引起（这类失败需要隔离账号）"""
+    try:
+        if code is not None and int(code) in RISK_CODES:
+            return True
+    except (TypeError, ValueError):
+        pass
+    text = str(msg or "").lower()
+    return any(keyword in text for keyword in RISK_KEYWORDS)
+
+
+@dataclass
+class CookieAccount:
+    """Cookie池中的单个账号及其统计"""
+    name: str
+    cookies: str
+    requests: int = 0
+    errors: int = 0
+    risk_errors: int = 0
+    # 健康分，成功趋向 1，失败趋向 0
+    health: float = 1.0
+    last_used: float = 0.0
+    # 连续被隔离的次数，用于计算退避冷却时间
+    strikes: int = 0
+    quarantined_until: float = 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    def available(self, now: float) -> bool:
+        return now >= self.quarantined_until
+
+    def as_dict(self, now: Optional[float] = None) -> Dict[str, Any]:
+        now = time.monotonic() if now is None else now
+        return {
+            "name": self.name,
+            "requests": self.requests,
+            "errors": self.errors,
+            "risk_errors": self.risk_errors,
+            "error_rate": round(self.error_rate, 4),
+            "health": round(self.health, 4),
+            "quarantined": not self.available(now),
+            "cooldown_remaining": round(max(0.0, self.quarantined_until - now), 1),
+        }
+
+
+class CookiePool:
+    """
+    多账号 Cookie 池
+
+    - 选择账号：在健康分接近最高分的账号中取最久未使用的一个，请求均摊到各账号；
+    - 返回登录失效、风控等错误的账号被隔离，冷却时间随连续隔离次数翻倍；
+    - 冷却结束后账号自动回到候选中，成功一次即清零隔离次数。
+
+    线程安全，XHSService 的线程池与 AsyncXHSService 的事件循环可共用同一个池。
+    """
+
+    def __init__(
+        self,
+        accounts: Iterable[Tuple[str, str]],
+        cooldown=600.0,
+        max_cooldown=6 * 3600.0,
+        health_decay=0.2,
+        health_tolerance=0.25,
+    ):
+        """
+        :param accounts: (账号名, cookie字符串) 序列
+        :param cooldown: 首次隔离的冷却时间（秒）
+        :param max_cooldown: 冷却时间上限（秒）
+        :param health_decay: 每次请求对健康分的影响权重
+        :param health_tolerance: 与最高健康分相差不超过该值的账号按最久未使用轮换
+        """
+        self.accounts: List[CookieAccount] = [
+            CookieAccount(name, cookies.strip()) for name, cookies in accounts if cookies and cookies.strip()
+        ]
+        if not self.accounts:
+            raise ValueError("Cookie池至少需要一个账号")
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.health_decay = health_decay
+        self.health_tolerance = health_tolerance
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_path(cls, path: str, **kwargs) -> "CookiePool":
+        """
+        从文件或目录加载账号
+
+        目录：每个文件一个账号，文件名为账号名；
+        文件：每个非空行一个账号，以 # 开头的行忽略，可写作 "账号名|cookie字符串" 形式。
+        """
+        accounts = []
+        if os.path.isdir(path):
+            for filename in sorted(os.listdir(path)):
+                filepath = os.path.join(path, filename)
+                if filename.startswith(".") or not os.path.isfile(filepath):
+                    continue
+                with open(filepath, "r", encoding="utf-8") as f:
+                    accounts.append((os.path.splitext(filename)[0], f.read()))
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                for index, line in enumerate(f):
+                    line = line.strip()
+                    if not line or line.startswith("#"):
+                        continue
+                    name, sep, cookies = line.partition("|")
+                    if sep:
+                        accounts.append((name.strip(), cookies))
+                    else:
+                        accounts.append((f"account-{index}", line))
+        return cls(accounts, **kwargs)
+
+    def acquire(self) -> CookieAccount:
+        """选出一个可用账号，全部处于冷却中时抛出 NoCookieAvailableError"""
+        with self._lock:
+            now = time.monotonic()
+            candidates = [account for account in self.accounts if account.available(now)]
+            if not candidates:
+                wait = min(account.quarantined_until for account in self.accounts) - now
+                raise NoCookieAvailableError(f"所有账号均处于冷却中，最早 {wait:.0f} 秒后恢复")
+            best = max(account.health for account in candidates)
+            candidates = [a for a in candidates if a.health >= best - self.health_tolerance]
+            account = min(candidates, key=lambda a: a.last_used)
+            account.last_used = now
+            account.requests += 1
+            return account
+
+    def report(self, account: CookieAccount, success: bool, msg: Any = "", code: Any = None):
+        """
+        上报请求结果
+
+        :param account: acquire 返回的账号
+        :param success: 请求是否成功
+        :param msg: 失败时的错误信息，用于识别风控
+        :param code: 失败时接口返回的错误码
+        """
+        with self._lock:
+            target = 1.0 if success else 0.0
+            account.health += (target - account.health) * self.health_decay
+            if success:
+                account.strikes = 0
+                return
+            account.errors += 1
+            if is_risk_error(msg, code):
+                account.risk_errors += 1
+                account.strikes += 1
+                cooldown = min(self.cooldown * 2 ** (account.strikes - 1), self.max_cooldown)
+                account.quarantined_until = time.monotonic() + cooldown
+                logger.warning(f"账号 {account.name} 触发风控，隔离 {cooldown:.0f} 秒: {msg}")
+
+    @contextmanager
+    def lease(self):
+        """
+        借出账号，调用方通过 lease.report 上报结果；
+        块内抛出异常且未上报时按普通失败计入
+        """
+        lease = CookieLease(self, self.acquire())
+        try:
+            yield lease
+        except Exception as e:
+            if not lease.reported:
+                lease.report(False, str(e))
+            raise
+        except BaseException:
+            # 被取消的请求（如落败的对冲请求）不计入统计
+            lease.reported = True
+            raise
+        finally:
+            if not lease.reported:
+                lease.report(True)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """各账号的请求数、错误率、健康分与隔离状态"""
+        with self._lock:
+            now = time.monotonic()
+            return [account.as_dict(now) for account in self.accounts]
+
+
+class CookieLease:
+    """一次借出的账号"""
+
+    def __init__(self, pool: CookiePool, account: CookieAccount):
+        self.pool = pool
+        self.account = account
+        self.reported = False
+
+    @property
+    def cookies(self) -> str:
+        return self.account.cookies
+
+    def report(self, success: bool, msg: Any = "", code: Any = None):
+        if not self.reported:
+            self.reported = True
+            self.pool.report(self.account, success, msg, code)
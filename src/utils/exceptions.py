@@ -8,4 +8,15 @@ class XHSExtractError(Exception):
 class ContentNotFoundError(XHSExtractError):
     """内容未找到异常"""
     def __init__(self, url):
-        super().__init__(f"未能提取链接内容: {url}", error_code=10002)
\ No newline at end of file
+        super().__init__(f"未能提取链接内容: {url}", error_code=10002)
+
+class NoCookieAvailableError(XHSExtractError):
+    """Cookie池中没有可用账号"""
+    def __init__(self, message="所有账号均处于冷却中"):
+        super().__init__(message, error_code=10003)
+
+class CircuitOpenError(XHSExtractError):
+    """熔断器打开，请求被直接拒绝"""
+    def __init__(self, name, retry_after=0.0):
+        super().__init__(f"{name} 熔断中，{retry_after:.0f} 秒后重试", error_code=10004)
+        self.retry_after = retry_after
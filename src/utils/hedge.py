@@ -0,0 +1,214 @@
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Deque, Optional
+
+# 本模块只依赖标准库，tk_329 通过文件路径加载
+
+
+def succeeded(result: Any) -> bool:
+    """默认的成功判断：(success, msg, data) 取 success，其余结果非 None 即成功"""
+    if isinstance(result, tuple) and result and isinstance(result[0], bool):
+        return result[0]
+    return result is not None
+
+
+class HedgeBudget:
+    """
+    对冲请求预算
+
+    令牌桶：每个主请求存入 ratio 个令牌，每次对冲消耗 1 个，令牌最多积累 burst 个。
+    长期来看对冲请求数不超过主请求数的 ratio 倍，上游变慢时对冲不会成倍放大压力。
+    """
+
+    def __init__(self, ratio: float = 0.05, burst: float = 10.0):
+        """
+        :param ratio: 对冲请求占主请求的最大比例
+        :param burst: 令牌上限，允许短时间内集中对冲的次数
+        """
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+
+# 进程内共享的对冲预算，未显式指定预算的 Hedger 共用
+global_hedge_budget = HedgeBudget()
+
+
+class Hedger:
+    """
+    对冲请求
+
+    主请求超过最近耗时的 percentile 分位仍未返回时，再发起一次相同的请求（调用方的 attempt
+    每次调用会重新选择账号与代理），取先成功的结果并取消另一个。样本不足 min_samples 时不对冲；
+    预算不足时继续等待主请求。
+
+    同步调用方使用 run_sync（请求在内部线程池中执行），异步调用方使用 run。
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        budget: Optional[HedgeBudget] = None,
+        window: int = 200,
+        min_samples: int = 20,
+        min_delay: float = 0.01,
+        max_workers: int = 32,
+    ):
+        """
+        :param percentile: 触发对冲的耗时分位，如 0.95 表示超过 p95 时对冲
+        :param budget: 对冲预算，默认为进程内共享的 global_hedge_budget
+        :param window: 统计耗时的样本数
+        :param min_samples: 至少积累多少个样本后才开始对冲
+        :param min_delay: 对冲等待时间的下限（秒）
+        :param max_workers: run_sync 使用的线程数
+        """
+        if not 0 < percentile < 1:
+            raise ValueError("percentile 必须在 0 与 1 之间")
+        self.percentile = percentile
+        self.budget = budget or global_hedge_budget
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_workers = max_workers
+        self.stats = {"requests": 0, "hedged": 0, "hedge_wins": 0, "budget_denied": 0}
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def record(self, elapsed: float):
+        with self._lock:
+            self._latencies.append(elapsed)
+
+    def delay(self) -> Optional[float]:
+        """当前的对冲等待时间（秒），样本不足时为 None"""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            values = sorted(self._latencies)
+        index = min(len(values) - 1, int(len(values) * self.percentile))
+        return max(self.min_delay, values[index])
+
+    def _start(self) -> Optional[float]:
+        self.budget.deposit()
+        with self._lock:
+            self.stats["requests"] += 1
+        return self.delay()
+
+    def _allow_hedge(self) -> bool:
+        allowed = self.budget.try_spend()
+        with self._lock:
+            self.stats["hedged" if allowed else "budget_denied"] += 1
+        return allowed
+
+    def _count_win(self):
+        with self._lock:
+            self.stats["hedge_wins"] += 1
+
+    def _observer(self, start: float, is_success: Callable[[Any], bool]):
+        """
+        主请求结束时记录耗时
+
+        失败的主请求不计入（快速失败会拉低分位）；被取消的主请求按取消时的耗时计入，
+        否则慢请求总被对冲取消，分位会越统计越低。
+        """
+        def observe(future):
+            if future.cancelled() or (future.exception() is None and is_success(future.result())):
+                self.record(time.monotonic() - start)
+        return observe
+
+    async def run(self, attempt: Callable[[], Awaitable[Any]], is_success: Callable[[Any], bool] = succeeded) -> Any:
+        """
+        执行一次可能被对冲的异步请求
+
+        :param attempt: 无参数的协程函数，每次调用发起一次独立请求
+        :param is_success: 判断结果是否成功，失败的结果不会被采用，除非两次请求都失败
+        :return: 先成功的结果；都失败时返回主请求的结果（或抛出主请求的异常）
+        """
+        delay = self._start()
+        start = time.monotonic()
+        primary = asyncio.ensure_future(attempt())
+        primary.add_done_callback(self._observer(start, is_success))
+        tasks = [primary]
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=delay)
+                if not done and self._allow_hedge():
+                    tasks.append(asyncio.ensure_future(attempt()))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and is_success(task.result()):
+                        if task is not primary:
+                            self._count_win()
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def run_sync(self, attempt: Callable[[], Any], is_success: Callable[[Any], bool] = succeeded) -> Any:
+        """
+        执行一次可能被对冲的同步请求
+
+        线程无法中断，落败的请求在未开始时取消，已开始的继续执行但结果被丢弃。
+        参数与返回值同 run。
+        """
+        delay = self._start()
+        start = time.monotonic()
+        if delay is None:
+            result = attempt()
+            if is_success(result):
+                self.record(time.monotonic() - start)
+            return result
+
+        executor = self._get_executor()
+        primary = executor.submit(attempt)
+        primary.add_done_callback(self._observer(start, is_success))
+        futures = [primary]
+        try:
+            done, _ = wait(futures, timeout=delay)
+            if not done and self._allow_hedge():
+                futures.append(executor.submit(attempt))
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None and is_success(future.result()):
+                        if future is not primary:
+                            self._count_win()
+                        return future.result()
+            return primary.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="hedge")
+            return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,88 @@
+import json
+import re
+from typing import Any, Dict, Optional
+
+# 小红书页面内嵌状态数据的起始标记
+INITIAL_STATE_MARKER = "window.__INITIAL_STATE__"
+
+# 一次匹配吞掉下一个大括号之前的全部内容（含完整字符串），只在大括号处回到 Python。
+# 采用展开循环写法：普通字符段之后必须跟转义或字符串，各分支首字符互斥，
+# 对象不完整时匹配失败也是线性的，不会在截断的页面上发生回溯爆炸
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"' + "|" + r"'[^'\\]*(?:\\.[^'\\]*)*'"
+_PLAIN = r"[^{}\"'\\]*"
+_UNTIL_BRACE = re.compile(_PLAIN + r"(?:(?:\\.|" + _STRING + r")" + _PLAIN + r")*([{}])")
+_ASSIGNMENT = re.compile(r"\s*=\s*")
+
+# 第一组尽量长地吞掉非 undefined 的内容（含完整字符串），让替换回调只在 undefined 附近触发
+_JS_TOKENS = re.compile(
+    r'((?:[^"u]+|"[^"\\]*(?:\\.[^"\\]*)*"|\Bu|u(?!ndefined\b))+)|\bundefined\b'
+)
+
+
+def find_initial_state(html: str) -> Optional[str]:
+    """
+    定位 ``window.__INITIAL_STATE__=`` 之后的对象字面量
+
+    从标记处开始做一次线性扫描，配对大括号并跳过字符串内容，
+    因此字符串中的 ``}`` 或 ``};`` 不会导致截断。
+
+    :param html: 页面HTML
+    :return: 对象字面量原文，未找到或不完整时返回 None
+    """
+    marker = html.find(INITIAL_STATE_MARKER)
+    if marker == -1:
+        return None
+
+    assignment = _ASSIGNMENT.match(html, marker + len(INITIAL_STATE_MARKER))
+    if not assignment or html[assignment.end():assignment.end() + 1] != "{":
+        return None
+    start = assignment.end()
+
+    depth = 0
+    pos = start
+    while True:
+        match = _UNTIL_BRACE.match(html, pos)
+        if not match:
+            # 字符串未闭合或对象不完整
+            return None
+        pos = match.end()
+        if match.group(1) == "{":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return html[start:pos]
+
+
+def normalize_js_literal(literal: str) -> str:
+    """将 JSON 不支持的 JS 专有值（undefined）替换为 null，字符串内容保持不变"""
+    if "undefined" not in literal:
+        return literal
+    return _JS_TOKENS.sub(lambda m: m.group(1) if m.group(1) is not None else "null", literal)
+
+
+def extract_initial_state(html: str) -> Optional[Dict[str, Any]]:
+    """
+    提取并解析页面中的 ``__INITIAL_STATE__``
+
+    :param html: 页面HTML
+    :return: 解析后的状态字典，页面中不存在时返回 None
+    :raises json.JSONDecodeError: 状态数据无法解析时抛出
+    """
+    literal = find_initial_state(html)
+    if literal is None:
+        return None
+    return json.loads(normalize_js_literal(literal))
+
+
+def first_note_detail(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    从状态数据中取出第一条作品详情
+
+    新版页面将 ``noteDetailMap`` 放在 ``note`` 下，旧版位于顶层，两种结构都兼容。
+    """
+    note_map = (state.get("note") or {}).get("noteDetailMap") or state.get("noteDetailMap") or {}
+    for detail in note_map.values():
+        if isinstance(detail, dict) and detail.get("note"):
+            return detail["note"]
+    return {}
@@ -0,0 +1,410 @@
+import json
+import time
+import uuid
+import random
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+import aiosqlite
+from loguru import logger
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    run_after REAL NOT NULL,
+    lease_until REAL,
+    progress REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+_INDEX = "CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (type, status, priority, run_after)"
+
+# 任务状态
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+_COLUMNS = (
+    "id, type, payload, priority, status, attempts, max_attempts, run_after, "
+    "lease_until, progress, result, error, created_at, updated_at"
+)
+
+
+@dataclass
+class Job:
+    """一条任务记录"""
+    id: str
+    type: str
+    payload: Dict[str, Any]
+    priority: int
+    status: str
+    attempts: int
+    max_attempts: int
+    run_after: float
+    lease_until: Optional[float]
+    progress: Optional[float]
+    result: Any
+    error: Optional[str]
+    created_at: float
+    updated_at: float
+
+    @classmethod
+    def from_row(cls, row) -> "Job":
+        values = list(row)
+        values[2] = json.loads(values[2])
+        values[10] = json.loads(values[10]) if values[10] is not None else None
+        return cls(*values)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class JobQueue:
+    """
+    基于 aiosqlite 的持久化任务队列
+
+    - 按优先级（数值大者优先）、入队时间取出任务；
+    - 取出的任务在可见性超时内归该执行者所有，超时未完成（如进程崩溃）时重新可被取出；
+    - 失败的任务按指数退避重试，达到最大尝试次数后标记为失败；
+    - 完成、失败、续约都校验尝试次数，超时后被重新取出的任务，旧执行者的结果不会覆盖新执行者。
+
+    数据库使用 WAL 模式，多个进程可以共用同一个队列文件。
+    """
+
+    def __init__(self, db_path: str, base_backoff: float = 5.0, max_backoff: float = 300.0):
+        """
+        :param db_path: SQLite 文件路径
+        :param base_backoff: 第一次重试前的等待时间（秒），之后每次翻倍
+        :param max_backoff: 重试等待时间上限（秒）
+        """
+        self.db_path = db_path
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._db: Optional[aiosqlite.Connection] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def __aenter__(self) -> "JobQueue":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def open(self):
+        if self._db is not None:
+            return
+        self._db = await aiosqlite.connect(self.db_path)
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.execute("PRAGMA busy_timeout=5000")
+        await self._db.execute(_SCHEMA)
+        await self._db.execute(_INDEX)
+        await self._db.commit()
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+
+    async def close(self):
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    async def _write(self, sql: str, params: Tuple = ()) -> Tuple[int, Optional[tuple]]:
+        """执行写语句并提交，返回 (影响行数, RETURNING 的第一行)"""
+        if self._db is None:
+            await self.open()
+        async with self._lock:
+            async with self._db.execute(sql, params) as cursor:
+                row = await cursor.fetchone() if "RETURNING" in sql else None
+                rowcount = cursor.rowcount
+            await self._db.commit()
+        return rowcount, row
+
+    async def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        priority: int = 0,
+        max_attempts: int = 3,
+        delay: float = 0.0,
+    ) -> str:
+        """
+        提交任务
+
+        :param job_type: 任务类型，对应 JobRunner 中注册的处理函数
+        :param payload: 任务参数，需可 JSON 序列化
+        :param priority: 优先级，数值大者优先
+        :param max_attempts: 最大尝试次数
+        :param delay: 延迟多少秒后才可被取出
+        :return: 任务ID
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        await self._write(
+            f"INSERT INTO jobs ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, 0, ?, ?, NULL, NULL, NULL, NULL, ?, ?)",
+            (job_id, job_type, json.dumps(payload, ensure_ascii=False), priority, QUEUED, max_attempts,
+             now + delay, now, now),
+        )
+        self._wakeup.set()
+        return job_id
+
+    async def claim(self, job_type: str, visibility_timeout: float) -> Optional[Job]:
+        """
+        取出一个可执行的任务
+
+        :param job_type: 任务类型
+        :param visibility_timeout: 可见性超时（秒），超时前需完成或续约
+        :return: 任务，没有可执行的任务时返回 None
+        """
+        now = time.time()
+        # 超时且已无重试次数的任务直接标记为失败
+        await self._write(
+            "UPDATE jobs SET status = ?, error = '处理超时', lease_until = NULL, updated_at = ? "
+            "WHERE type = ? AND status = ? AND lease_until < ? AND attempts >= max_attempts",
+            (FAILED, now, job_type, RUNNING, now),
+        )
+        _, row = await self._write(
+            f"UPDATE jobs SET status = ?, attempts = attempts + 1, lease_until = ?, updated_at = ? "
+            f"WHERE id = (SELECT id FROM jobs WHERE type = ? AND ("
+            f"(status = ? AND run_after <= ?) OR (status = ? AND lease_until < ?)"
+            f") ORDER BY priority DESC, created_at LIMIT 1) RETURNING {_COLUMNS}",
+            (RUNNING, now + visibility_timeout, now, job_type, QUEUED, now, RUNNING, now),
+        )
+        return Job.from_row(row) if row else None
+
+    async def _update_owned(self, job: Job, assignments: str, params: Tuple) -> bool:
+        """只更新仍由该执行者持有的任务"""
+        rowcount, _ = await self._write(
+            f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ? AND status = ? AND attempts = ?",
+            (*params, time.time(), job.id, RUNNING, job.attempts),
+        )
+        return rowcount > 0
+
+    async def heartbeat(self, job: Job, visibility_timeout: float) -> bool:
+        """续约，返回 False 表示任务已超时并被他人取出"""
+        return await self._update_owned(job, "lease_until = ?", (time.time() + visibility_timeout,))
+
+    async def set_progress(self, job: Job, progress: float) -> bool:
+        return await self._update_owned(job, "progress = ?", (progress,))
+
+    async def complete(self, job: Job, result: Any = None) -> bool:
+        return await self._update_owned(
+            job,
+            "status = ?, result = ?, progress = 1.0, lease_until = NULL, error = NULL",
+            (SUCCEEDED, json.dumps(result, ensure_ascii=False)),
+        )
+
+    async def fail(self, job: Job, error: str, retry: bool = True) -> str:
+        """
+        记录一次失败
+
+        :param job: claim 返回的任务
+        :param error: 错误信息
+        :param retry: 是否允许重试
+        :return: 任务的新状态，queued 表示将在退避后重试
+        """
+        if retry and job.attempts < job.max_attempts:
+            backoff = min(self.max_backoff, self.base_backoff * 2 ** (job.attempts - 1))
+            # 加入抖动，避免同时失败的任务同时重试
+            run_after = time.time() + backoff * random.uniform(0.5, 1.0)
+            await self._update_owned(
+                job, "status = ?, run_after = ?, lease_until = NULL, error = ?", (QUEUED, run_after, error)
+            )
+            return QUEUED
+        await self._update_owned(job, "status = ?, lease_until = NULL, error = ?", (FAILED, error))
+        return FAILED
+
+    async def release(self, job: Job) -> bool:
+        """放回执行中被中断的任务，不计入尝试次数"""
+        return await self._update_owned(
+            job, "status = ?, attempts = attempts - 1, lease_until = NULL, run_after = ?", (QUEUED, time.time())
+        )
+
+    async def cancel(self, job_id: str) -> bool:
+        """取消尚未开始执行的任务"""
+        rowcount, _ = await self._write(
+            "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+            (CANCELLED, time.time(), job_id, QUEUED),
+        )
+        return rowcount > 0
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        if self._db is None:
+            await self.open()
+        async with self._db.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)) as cursor:
+            row = await cursor.fetchone()
+        return Job.from_row(row) if row else None
+
+    async def watch(self, job_id: str, interval: float = 0.5) -> AsyncIterator[Job]:
+        """
+        跟踪任务状态，状态或进度变化时产出一次，任务结束后停止
+
+        :param job_id: 任务ID
+        :param interval: 轮询间隔（秒）
+        """
+        last = None
+        while True:
+            job = await self.get(job_id)
+            if job is None:
+                raise KeyError(job_id)
+            snapshot = (job.status, job.attempts, job.progress)
+            if snapshot != last:
+                last = snapshot
+                yield job
+            if job.finished:
+                return
+            await asyncio.sleep(interval)
+
+    async def wait_for_work(self, timeout: float):
+        """等待新任务入队，最多等待 timeout 秒"""
+        if self._wakeup is None:
+            await self.open()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def counts(self) -> Dict[str, Dict[str, int]]:
+        """各任务类型按状态统计的任务数"""
+        if self._db is None:
+            await self.open()
+        result: Dict[str, Dict[str, int]] = {}
+        async with self._db.execute("SELECT type, status, COUNT(*) FROM jobs GROUP BY type, status") as cursor:
+            async for job_type, status, count in cursor:
+                result.setdefault(job_type, {})[status] = count
+        return result
+
+
+# handler(payload, context) -> 可 JSON 序列化的结果
+JobHandler = Callable[[Dict[str, Any], "JobContext"], Awaitable[Any]]
+
+
+class JobContext:
+    """传给处理函数的任务上下文"""
+
+    def __init__(self, queue: JobQueue, job: Job):
+        self.queue = queue
+        self.job = job
+
+    async def progress(self, value: float):
+        """上报进度（0~1）"""
+        await self.queue.set_progress(self.job, value)
+
+
+class JobRunner:
+    """
+    按任务类型划分的执行器
+
+    每个任务类型有独立的并发数与可见性超时，互不占用：耗时的转写任务不会阻塞下载任务。
+    执行期间每隔可见性超时的三分之一续约一次；处理函数抛出 permanent_errors 中的异常时不再重试。
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        poll_interval: float = 1.0,
+        permanent_errors: Tuple[Type[BaseException], ...] = (ValueError, FileNotFoundError),
+    ):
+        """
+        :param queue: 任务队列
+        :param poll_interval: 队列为空时的轮询间隔（秒）
+        :param permanent_errors: 不重试的异常类型
+        """
+        self.queue = queue
+        self.poll_interval = poll_interval
+        self.permanent_errors = permanent_errors
+        self._handlers: Dict[str, Tuple[JobHandler, int, float]] = {}
+        self._workers: List[asyncio.Task] = []
+        self.stats = {"succeeded": 0, "failed": 0, "retried": 0, "released": 0}
+
+    def register(self, job_type: str, handler: JobHandler, concurrency: int = 1, visibility_timeout: float = 300.0):
+        """
+        注册任务类型
+
+        :param job_type: 任务类型
+        :param handler: 异步处理函数，接收 (payload, JobContext)，返回可 JSON 序列化的结果
+        :param concurrency: 该类型同时执行的任务数
+        :param visibility_timeout: 可见性超时（秒）
+        """
+        self._handlers[job_type] = (handler, concurrency, visibility_timeout)
+        return self
+
+    async def start(self):
+        """启动所有已注册类型的执行协程"""
+        await self.queue.open()
+        for job_type, (_, concurrency, _) in self._handlers.items():
+            for index in range(concurrency):
+                self._workers.append(asyncio.create_task(self._work(job_type), name=f"job-{job_type}-{index}"))
+
+    async def stop(self):
+        """停止执行，执行中的任务放回队列"""
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    async def __aenter__(self) -> "JobRunner":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    async def _work(self, job_type: str):
+        _, _, visibility_timeout = self._handlers[job_type]
+        while True:
+            try:
+                job = await self.queue.claim(job_type, visibility_timeout)
+            except Exception as e:
+                logger.warning(f"取出 {job_type} 任务失败: {e}")
+                job = None
+            if job is None:
+                await self.queue.wait_for_work(self.poll_interval)
+                continue
+            await self.run_job(job)
+
+    async def run_job(self, job: Job):
+        """执行一个已取出的任务并记录结果"""
+        handler, _, visibility_timeout = self._handlers[job.type]
+        heartbeat = asyncio.create_task(self._heartbeat(job, visibility_timeout))
+        try:
+            result = await handler(job.payload, JobContext(self.queue, job))
+        except asyncio.CancelledError:
+            await asyncio.shield(self.queue.release(job))
+            self.stats["released"] += 1
+            raise
+        except Exception as e:
+            retry = not isinstance(e, self.permanent_errors)
+            status = await self.queue.fail(job, f"{type(e).__name__}: {e}", retry)
+            self.stats["retried" if status == QUEUED else "failed"] += 1
+            logger.warning(f"任务 {job.id}（{job.type}）第 {job.attempts} 次执行失败: {e}")
+        else:
+            if await self.queue.complete(job, result):
+                self.stats["succeeded"] += 1
+            else:
+                logger.warning(f"任务 {job.id} 已超时并被重新取出，本次结果被丢弃")
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job: Job, visibility_timeout: float):
+        while True:
+            await asyncio.sleep(visibility_timeout / 3)
+            if not await self.queue.heartbeat(job, visibility_timeout):
+                return
@@ -0,0 +1,130 @@
+import atexit
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, AsyncGenerator, Awaitable, Callable, Coroutine, List, Optional
+
+# 本模块只依赖标准库，tk_329 通过文件路径加载
+
+
+class BackgroundLoop:
+    """
+    常驻后台线程的事件循环
+
+    同步调用方通过 submit 提交协程并获得 concurrent.futures.Future，或用 run 阻塞等待结果。
+    所有协程运行在同一个事件循环中，异步客户端、会话池等绑定事件循环的资源可以跨调用复用，
+    不再像每次 asyncio.run 那样新建并销毁事件循环。
+    """
+
+    def __init__(self, name: str = "background-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._cleanups: List[Callable[[], Awaitable[Any]]] = []
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """后台事件循环，首次访问时启动线程"""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                ready = threading.Event()
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._run, args=(self._loop, ready), name=self.name, daemon=True)
+                self._thread.start()
+                ready.wait()
+            return self._loop
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop, ready: threading.Event):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+
+    def submit(self, coro: Coroutine) -> Future:
+        """提交协程，立即返回 Future"""
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("不能在后台事件循环线程中同步提交协程，请直接 await")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """提交协程并阻塞等待结果，超时时取消该协程"""
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def add_cleanup(self, cleanup: Callable[[], Awaitable[Any]]):
+        """注册关闭时在事件循环中执行的清理协程函数（如关闭客户端）"""
+        self._cleanups.append(cleanup)
+
+    def close(self, timeout: Optional[float] = 10.0):
+        """执行清理函数，停止事件循环并等待线程退出"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or loop.is_closed():
+            return
+        cleanups, self._cleanups = self._cleanups, []
+
+        async def shutdown():
+            for cleanup in reversed(cleanups):
+                try:
+                    await cleanup()
+                except Exception:
+                    pass
+            await asyncio.get_running_loop().shutdown_asyncgens()
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            loop.close()
+
+
+def close_on_shutdown(close: Callable[[], Awaitable[Any]]) -> AsyncGenerator:
+    """
+    在当前事件循环关闭前执行 await close()，须在事件循环中调用
+
+    asyncio.run 结束时会关闭尚未结束的异步生成器（loop.shutdown_asyncgens），
+    这里启动一个停在 yield 处的异步生成器，借此在事件循环上挂一个关闭钩子。
+    返回的生成器需由调用方持有；手动 loop.close() 且未调用 shutdown_asyncgens 时不会触发。
+    """
+    async def hook():
+        try:
+            yield
+        finally:
+            await close()
+
+    generator = hook()
+    # 首次调用 __anext__ 时事件循环登记该生成器，随后同步运行到 yield 处
+    try:
+        generator.__anext__().send(None)
+    except StopIteration:
+        pass
+    return generator
+
+
+_shared_loop: Optional[BackgroundLoop] = None
+_shared_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """获取进程内共享的后台事件循环，进程退出时自动关闭"""
+    global _shared_loop
+    with _shared_lock:
+        if _shared_loop is None:
+            _shared_loop = BackgroundLoop("shared-background-loop")
+            atexit.register(_shared_loop.close)
+        return _shared_loop
@@ -0,0 +1,193 @@
+import os
+import json
+import shutil
+import asyncio
+import hashlib
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+# 小红书 CDN 的不同边缘节点对相同路径返回相同内容
+CDN_SUFFIXES = ("xhscdn.com",)
+
+# 签名、过期时间与来源统计参数不影响返回的内容，不计入缓存键；
+# 其余参数保留，如 imageView2/format/png 等图片处理指令会返回不同格式、尺寸的文件
+IGNORED_QUERY_PARAMS = frozenset({
+    "sign", "t", "e", "expires", "token", "xsec_token", "xsec_source", "source", "spm",
+})
+IGNORED_QUERY_PREFIXES = ("utm_", "x-oss-", "x-amz-", "x-expires", "x-signature")
+
+
+def _keep_query_param(component: str) -> bool:
+    name = component.split("=", 1)[0].lower()
+    return name not in IGNORED_QUERY_PARAMS and not name.startswith(IGNORED_QUERY_PREFIXES)
+
+
+def normalize_media_url(url: str) -> str:
+    """
+    规范化媒体URL：去掉签名与统计类查询参数和锚点、主机名转小写，CDN 边缘节点统一为根域名
+
+    图片处理等其余查询参数按原顺序保留，不同处理结果各自缓存。
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    for suffix in CDN_SUFFIXES:
+        if host == suffix or host.endswith("." + suffix):
+            host = suffix
+            break
+    path = "/".join(segment for segment in parts.path.split("/") if segment)
+    query = "&".join(component for component in parts.query.split("&") if component and _keep_query_param(component))
+    return urlunsplit(("https", host, "/" + path, query, ""))
+
+
+def media_key(url: str) -> str:
+    """稳定的URL摘要，跨进程一致（不受 hash 随机化影响）"""
+    return hashlib.sha256(normalize_media_url(url).encode("utf-8")).hexdigest()
+
+
+def stable_name(url: str, length: int = 16) -> str:
+    """用于文件命名的短摘要"""
+    return media_key(url)[:length]
+
+
+def file_digest(path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class MediaAsset:
+    """媒体文件清单条目"""
+    url: str
+    path: str
+    size: int
+    digest: str
+    cache_hit: bool
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class MediaStore:
+    """
+    内容寻址的媒体存储
+
+    目录结构::
+
+        root/objects/ab/<内容sha256><扩展名>   实际文件，相同内容只保存一份
+        root/index/cd/<URL摘要>.json           规范化URL -> 内容摘要、大小
+        root/tmp/                              下载中的临时文件（支持续传）
+
+    已存在的资源直接命中，不再请求网络；取出时硬链接到调用方目录。
+    """
+
+    def __init__(self, root: str, verify_digest: bool = False):
+        """
+        :param root: 存储根目录
+        :param verify_digest: 命中时是否重新计算内容摘要校验（默认只校验大小）
+        """
+        self.root = root
+        self.verify_digest = verify_digest
+        for name in ("objects", "index", "tmp"):
+            os.makedirs(os.path.join(root, name), exist_ok=True)
+        # URL摘要 -> [锁, 使用者数]，最后一个使用者离开时删除，下载失败的URL不会残留
+        self._locks: Dict[str, List[Any]] = {}
+
+    def _index_path(self, key: str) -> str:
+        return os.path.join(self.root, "index", key[:2], f"{key}.json")
+
+    def object_path(self, digest: str, ext: str = "") -> str:
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}{ext}")
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """查找已保存的资源，文件缺失或校验失败时返回 None"""
+        index_path = self._index_path(media_key(url))
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        path = self.object_path(record["digest"], record.get("ext", ""))
+        try:
+            if os.path.getsize(path) != record["size"]:
+                return None
+        except OSError:
+            return None
+        if self.verify_digest and file_digest(path) != record["digest"]:
+            os.remove(path)
+            return None
+        return {**record, "path": path}
+
+    def _write_index(self, key: str, record: Dict[str, Any]):
+        index_path = self._index_path(key)
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp_path, index_path)
+
+    async def fetch(
+        self,
+        url: str,
+        download: Callable[[str], Awaitable[Any]],
+        ext: str = "",
+    ) -> MediaAsset:
+        """
+        获取资源：命中则直接返回，否则调用 download(临时路径) 下载后入库
+
+        :param url: 资源URL
+        :param download: 下载函数，负责把 url 的内容写到给定路径
+        :param ext: 保存的扩展名
+        :return: 资源清单条目，path 为存储内的路径
+        """
+        key = media_key(url)
+        entry = self._locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                record = await asyncio.to_thread(self.lookup, url)
+                if record is not None:
+                    return MediaAsset(url, record["path"], record["size"], record["digest"], True)
+
+                tmp_path = os.path.join(self.root, "tmp", f"{key}{ext}")
+                await download(tmp_path)
+                digest = await asyncio.to_thread(file_digest, tmp_path)
+                size = os.path.getsize(tmp_path)
+
+                path = self.object_path(digest, ext)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if os.path.exists(path) and os.path.getsize(path) == size:
+                    # 其他URL已保存过相同内容
+                    os.remove(tmp_path)
+                else:
+                    os.replace(tmp_path, path)
+
+                self._write_index(key, {
+                    "url": normalize_media_url(url),
+                    "digest": digest,
+                    "size": size,
+                    "ext": ext,
+                })
+                return MediaAsset(url, path, size, digest, False)
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                self._locks.pop(key, None)
+
+    @staticmethod
+    def link(asset: MediaAsset, dest_path: str) -> str:
+        """将存储内的文件硬链接到目标路径，跨设备时退化为复制"""
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+        if os.path.exists(dest_path):
+            if os.path.samefile(asset.path, dest_path):
+                return dest_path
+            os.remove(dest_path)
+        try:
+            os.link(asset.path, dest_path)
+        except OSError:
+            shutil.copyfile(asset.path, dest_path)
+        return dest_path
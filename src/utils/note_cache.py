@@ -0,0 +1,266 @@
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+import aiosqlite
+from loguru import logger
+
+from src.utils.lru_cache import CacheEntry, TTLCache
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS note_cache (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    stored_at REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class NoteCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    def as_dict(self) -> Dict[str, int]:
+        return {**asdict(self), "hits": self.hits}
+
+
+class NoteCache:
+    """
+    笔记元数据两级缓存：内存 LRU + SQLite 持久化
+
+    - 存入不足 ttl 秒的条目直接返回；
+    - 超过 ttl 但不足 stale_ttl 的条目先返回旧值，同时在后台刷新；
+    - 超过 stale_ttl 视为未命中，同步回源。
+
+    同步调用方（XHSService 等）使用 ``get_or_fetch``，持久层走 sqlite3；
+    异步调用方使用 ``aget_or_fetch``，持久层走 aiosqlite，两者共用同一个数据库文件。
+    回源函数返回假值（None、空字典）时不写入缓存。
+    """
+
+    def __init__(self, db_path: Optional[str] = None, maxsize=1024, ttl=300.0, stale_ttl=3600.0):
+        """
+        :param db_path: SQLite 文件路径，None 表示只使用内存缓存
+        :param maxsize: 内存缓存条目上限
+        :param ttl: 新鲜期（秒）
+        :param stale_ttl: 可返回旧值的最长期限（秒），不小于 ttl
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.memory: TTLCache[Any] = TTLCache(maxsize=maxsize, ttl=self.stale_ttl)
+        self.stats = NoteCacheStats()
+
+        self._sync_db: Optional[sqlite3.Connection] = None
+        self._sync_lock = threading.Lock()
+        self._async_db: Optional[aiosqlite.Connection] = None
+        self._async_lock: Optional[asyncio.Lock] = None
+
+        self._refreshing: Set[str] = set()
+        self._refresh_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    # ---------- 同步接口 ----------
+
+    def _db(self) -> sqlite3.Connection:
+        if self._sync_db is None:
+            self._sync_db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._sync_db.execute("PRAGMA journal_mode=WAL")
+            self._sync_db.execute(_SCHEMA)
+            self._sync_db.commit()
+        return self._sync_db
+
+    def _load(self, key: str) -> Tuple[Optional[CacheEntry], bool]:
+        """返回 (条目, 是否来自持久层)"""
+        entry = self.memory.get_entry(key)
+        if entry is not None:
+            return entry, False
+        if not self.db_path:
+            return None, False
+        with self._sync_lock:
+            row = self._db().execute(
+                "SELECT data, stored_at FROM note_cache WHERE key = ?", (key,)
+            ).fetchone()
+        return self._promote(key, row)
+
+    def _save(self, key: str, value: Any):
+        stored_at = time.time()
+        self.memory.set(key, value, stored_at)
+        if self.db_path:
+            with self._sync_lock:
+                db = self._db()
+                db.execute(
+                    "INSERT OR REPLACE INTO note_cache (key, data, stored_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), stored_at),
+                )
+                db.commit()
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """读取缓存，未命中时调用 fetch 回源并写入缓存"""
+        entry, from_disk = self._load(key)
+        if entry is not None and entry.age < self.ttl:
+            self._count_hit(from_disk)
+            return entry.value
+        if entry is not None:
+            self.stats.stale_hits += 1
+            self._refresh_in_thread(key, fetch)
+            return entry.value
+
+        self.stats.misses += 1
+        value = fetch()
+        if value:
+            self._save(key, value)
+        return value
+
+    def _refresh_in_thread(self, key: str, fetch: Callable[[], Any]):
+        if not self._begin_refresh(key):
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="note-cache-refresh")
+
+        def refresh():
+            try:
+                value = fetch()
+                if value:
+                    self._save(key, value)
+            except Exception as e:
+                self.stats.refresh_errors += 1
+                logger.warning(f"后台刷新缓存失败 {key}: {e}")
+            finally:
+                self._end_refresh(key)
+
+        self._executor.submit(refresh)
+
+    # ---------- 异步接口 ----------
+
+    async def _adb(self) -> aiosqlite.Connection:
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            if self._async_db is None:
+                self._async_db = await aiosqlite.connect(self.db_path)
+                await self._async_db.execute("PRAGMA journal_mode=WAL")
+                await self._async_db.execute(_SCHEMA)
+                await self._async_db.commit()
+        return self._async_db
+
+    async def _aload(self, key: str) -> Tuple[Optional[CacheEntry], bool]:
+        """返回 (条目, 是否来自持久层)"""
+        entry = self.memory.get_entry(key)
+        if entry is not None:
+            return entry, False
+        if not self.db_path:
+            return None, False
+        db = await self._adb()
+        async with db.execute("SELECT data, stored_at FROM note_cache WHERE key = ?", (key,)) as cursor:
+            row = await cursor.fetchone()
+        return self._promote(key, row)
+
+    async def _asave(self, key: str, value: Any):
+        stored_at = time.time()
+        self.memory.set(key, value, stored_at)
+        if self.db_path:
+            db = await self._adb()
+            await db.execute(
+                "INSERT OR REPLACE INTO note_cache (key, data, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), stored_at),
+            )
+            await db.commit()
+
+    async def aget_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """异步读取缓存，未命中时 await fetch() 回源并写入缓存"""
+        entry, from_disk = await self._aload(key)
+        if entry is not None and entry.age < self.ttl:
+            self._count_hit(from_disk)
+            return entry.value
+        if entry is not None:
+            self.stats.stale_hits += 1
+            self._refresh_in_task(key, fetch)
+            return entry.value
+
+        self.stats.misses += 1
+        value = await fetch()
+        if value:
+            await self._asave(key, value)
+        return value
+
+    def _refresh_in_task(self, key: str, fetch: Callable[[], Awaitable[Any]]):
+        if not self._begin_refresh(key):
+            return
+
+        async def refresh():
+            try:
+                value = await fetch()
+                if value:
+                    await self._asave(key, value)
+            except Exception as e:
+                self.stats.refresh_errors += 1
+                logger.warning(f"后台刷新缓存失败 {key}: {e}")
+            finally:
+                self._end_refresh(key)
+
+        task = asyncio.create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # ---------- 公共部分 ----------
+
+    def _promote(self, key: str, row) -> Tuple[Optional[CacheEntry], bool]:
+        """将持久层命中的条目放回内存缓存"""
+        if row is None:
+            return None, False
+        data, stored_at = row
+        if time.time() - stored_at >= self.stale_ttl:
+            return None, False
+        value = json.loads(data)
+        self.memory.set(key, value, stored_at)
+        return CacheEntry(value, stored_at), True
+
+    def _count_hit(self, from_disk: bool):
+        """只统计新鲜条目的命中，过期条目计入 stale_hits"""
+        if from_disk:
+            self.stats.disk_hits += 1
+        else:
+            self.stats.memory_hits += 1
+
+    def _begin_refresh(self, key: str) -> bool:
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self.stats.refreshes += 1
+            return True
+
+    def _end_refresh(self, key: str):
+        with self._refresh_lock:
+            self._refreshing.discard(key)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._sync_db is not None:
+            self._sync_db.close()
+            self._sync_db = None
+
+    async def aclose(self):
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._async_db is not None:
+            await self._async_db.close()
+            self._async_db = None
+        self.close()
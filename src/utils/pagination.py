@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class Page:
+    """
+    分页结果
+
+    cursor 为续传令牌：把它传回产生该页的 iter_* 方法即可从下一页继续。
+    因 limit 截断的页面，令牌指向该页本身，续传时会重新获取这一页。
+    """
+    items: List[Dict[str, Any]]
+    cursor: str
+    has_more: bool
+
+
+PageFetcher = Callable[[str], Awaitable[Tuple[List[Dict[str, Any]], str, bool]]]
+
+
+async def iter_items(pages: AsyncIterator[Page]) -> AsyncIterator[Dict[str, Any]]:
+    """将分页迭代器展开为逐条迭代"""
+    async for page in pages:
+        for item in page.items:
+            yield item
+
+
+async def iter_pages(fetch: PageFetcher, cursor: str, limit: Optional[int]) -> AsyncIterator[Page]:
+    """
+    按游标逐页获取，达到 limit 后提前结束
+
+    :param fetch: 分页函数，接收游标，返回 (本页条目, 下一页游标, 是否还有更多)
+    :param cursor: 起始游标
+    :param limit: 最多返回的条目数，None 表示不限
+    """
+    count = 0
+    has_more = True
+    while has_more:
+        items, next_cursor, has_more = await fetch(cursor)
+        if limit is not None and count + len(items) >= limit:
+            trimmed = len(items) > limit - count
+            yield Page(items[:limit - count], cursor if trimmed else next_cursor, has_more or trimmed)
+            return
+        count += len(items)
+        yield Page(items, next_cursor, has_more)
+        cursor = next_cursor
@@ -0,0 +1,38 @@
+import time
+import asyncio
+import threading
+from typing import Dict, Optional
+
+
+class HostRateLimiter:
+    """
+    按主机限速：同一主机的请求间隔不小于 1/rate 秒
+
+    同步与异步调用共用一份调度状态，可同时用于线程池和事件循环。
+    rate 为 None 或 0 时不限速。
+    """
+
+    def __init__(self, rate: Optional[float] = None):
+        self.rate = rate
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _reserve(self, host: str) -> float:
+        """预约下一个可用时间点，返回需要等待的秒数"""
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + 1.0 / self.rate
+            return slot - now
+
+    def wait(self, host: str):
+        delay = self._reserve(host)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, host: str):
+        delay = self._reserve(host)
+        if delay > 0:
+            await asyncio.sleep(delay)
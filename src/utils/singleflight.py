@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+# 本模块只依赖标准库，tk_329 通过文件路径加载
+
+
+class _Call:
+    """一次进行中的同步调用"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    同步请求合并
+
+    同一 key 同时只执行一次 fn，执行期间到达的相同请求等待并共享其结果或异常；
+    执行结束后 key 即被释放，下一次请求重新执行，不做缓存。线程安全。
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        执行或加入一次请求
+
+        :param key: 合并的键，如规范化后的内容ID
+        :param fn: 无参数的函数
+        :return: fn 的返回值；fn 抛出的异常会传给所有等待者
+        """
+        with self._lock:
+            self.stats["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats["executions"] += 1
+            else:
+                call.waiters += 1
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    异步请求合并
+
+    与 SingleFlight 相同，但 fn 为协程函数，在独立任务中执行：发起请求的调用方被取消时
+    不影响其他等待者。进行中的任务按事件循环分别记录，可在多个事件循环间共用一个实例。
+    """
+
+    def __init__(self):
+        self._calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+
+    def start(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """
+        返回 key 对应的进行中任务，没有时创建，适合不等待结果的后台刷新
+
+        :param key: 合并的键
+        :param fn: 无参数的协程函数
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.stats["calls"] += 1
+            calls = self._calls.setdefault(loop, {})
+            task = calls.get(key)
+            if task is not None:
+                self.stats["coalesced"] += 1
+                return task
+            self.stats["executions"] += 1
+            task = calls[key] = loop.create_task(fn())
+        task.add_done_callback(lambda t: self._finish(calls, key, t))
+        return task
+
+    def _finish(self, calls: Dict[Hashable, asyncio.Task], key: Hashable, task: asyncio.Task):
+        with self._lock:
+            if calls.get(key) is task:
+                del calls[key]
+            if not task.cancelled() and task.exception() is not None:
+                self.stats["errors"] += 1
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """执行或加入一次请求，参数与返回值同 SingleFlight.do"""
+        # shield：单个调用方被取消时不影响其他等待者
+        return await asyncio.shield(self.start(key, fn))
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return sum(len(calls) for calls in self._calls.values())
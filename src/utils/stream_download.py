@@ -0,0 +1,259 @@
+import os
+import re
+import time
+import shutil
+import asyncio
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import aiofiles
+import httpx
+
+# 默认分块大小，限制单次写盘前驻留内存的数据量
+DEFAULT_CHUNK_SIZE = 512 * 1024
+
+PART_SUFFIX = ".part"
+
+_CONTENT_RANGE_TOTAL = re.compile(r"bytes\s+(?:\d+-\d+|\*)/(\d+)")
+
+
+class DownloadSizeMismatch(IOError):
+    """下载文件大小与 Content-Length 不一致"""
+    def __init__(self, url: str, expected: int, actual: int):
+        self.url = url
+        self.expected = expected
+        self.actual = actual
+        super().__init__(f"下载文件大小不一致: {url} 期望 {expected} 字节，实际 {actual} 字节")
+
+
+@dataclass
+class DownloadProgress:
+    """下载进度，total 未知时为 None"""
+    url: str
+    total: Optional[int] = None
+    downloaded: int = 0
+    # 本次运行之前已存在于磁盘上的字节数（续传部分），不计入速度
+    resumed: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def speed(self) -> float:
+        """本次运行的平均下载速度（字节/秒）"""
+        elapsed = self.elapsed
+        return (self.downloaded - self.resumed) / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def percent(self) -> Optional[float]:
+        return self.downloaded * 100.0 / self.total if self.total else None
+
+
+ProgressCallback = Callable[[DownloadProgress], None]
+
+
+def _expected_size(response: httpx.Response, offset: int) -> Optional[int]:
+    """根据响应头推算完整文件大小，无法确定时返回 None"""
+    if response.headers.get("Content-Encoding", "identity") != "identity":
+        return None
+    if response.status_code in (206, 416):
+        match = _CONTENT_RANGE_TOTAL.match(response.headers.get("Content-Range", ""))
+        return int(match.group(1)) if match else None
+    length = response.headers.get("Content-Length")
+    return offset + int(length) if length and length.isdigit() else None
+
+
+async def stream_download(
+    client: httpx.AsyncClient,
+    url: str,
+    filepath: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resume: bool = True,
+    verify_size: bool = True,
+    headers: Optional[Dict[str, str]] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> int:
+    """
+    以流式方式下载文件到磁盘
+
+    数据先写入 ``filepath + '.part'`` 临时文件，完成后原子重命名为目标文件；
+    若临时文件已存在且 ``resume`` 为 True，则通过 Range 请求续传。
+
+    :param client: 复用的异步HTTP客户端
+    :param url: 文件URL
+    :param filepath: 目标文件路径
+    :param chunk_size: 分块大小（字节）
+    :param resume: 是否续传已有的临时文件
+    :param verify_size: 是否按 Content-Length 校验文件大小
+    :param headers: 额外请求头
+    :param on_progress: 进度回调，每写入一个分块调用一次
+    :return: 最终文件大小（字节）
+    """
+    part_path = filepath + PART_SUFFIX
+    offset = os.path.getsize(part_path) if resume and os.path.exists(part_path) else 0
+
+    request_headers = dict(headers or {})
+    if offset:
+        request_headers["Range"] = f"bytes={offset}-"
+
+    expected = None
+    async with client.stream("GET", url, headers=request_headers) as response:
+        if offset and response.status_code == 416:
+            # 临时文件已不小于完整文件，服务器拒绝范围请求，交由下方大小校验确认
+            expected = _expected_size(response, offset)
+        else:
+            response.raise_for_status()
+            if offset and response.status_code != 206:
+                # 服务器忽略了 Range 头，只能从头下载
+                offset = 0
+            expected = _expected_size(response, offset)
+
+            progress = DownloadProgress(url, expected, offset, offset)
+            mode = "ab" if offset else "wb"
+            async with aiofiles.open(part_path, mode) as f:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    await f.write(chunk)
+                    if on_progress is not None:
+                        progress.downloaded += len(chunk)
+                        on_progress(progress)
+
+    size = os.path.getsize(part_path)
+    if verify_size and expected is not None and size != expected:
+        if size > expected:
+            # 内容已损坏，无法续传
+            os.remove(part_path)
+        raise DownloadSizeMismatch(url, expected, size)
+
+    os.replace(part_path, filepath)
+    return size
+
+
+# 小于该大小的文件不拆分，单连接下载
+DEFAULT_MIN_PART_SIZE = 8 * 1024 * 1024
+
+
+async def _probe_size(client: httpx.AsyncClient, url: str, headers: Dict[str, str]) -> Optional[int]:
+    """请求首字节探测文件大小，服务器不支持范围请求时返回 None"""
+    async with client.stream("GET", url, headers={**headers, "Range": "bytes=0-0"}) as response:
+        if response.status_code != 206:
+            return None
+        return _expected_size(response, 0)
+
+
+def _split_ranges(total: int, parts: int) -> List[Tuple[int, int]]:
+    """将 [0, total) 均分为 parts 段闭区间"""
+    step = -(-total // parts)
+    return [(start, min(start + step, total) - 1) for start in range(0, total, step)]
+
+
+async def _download_range(
+    client: httpx.AsyncClient,
+    url: str,
+    part_path: str,
+    start: int,
+    end: int,
+    chunk_size: int,
+    headers: Dict[str, str],
+    progress: DownloadProgress,
+    on_progress: Optional[ProgressCallback],
+):
+    """下载 [start, end] 区间到分段文件，已有分段文件时从断点续传"""
+    length = end - start + 1
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    if offset > length:
+        os.remove(part_path)
+        offset = 0
+    if offset == length:
+        return
+
+    request_headers = {**headers, "Range": f"bytes={start + offset}-{end}"}
+    async with client.stream("GET", url, headers=request_headers) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise IOError(f"服务器未按范围返回数据: {url}")
+        async with aiofiles.open(part_path, "ab" if offset else "wb") as f:
+            async for chunk in response.aiter_bytes(chunk_size):
+                await f.write(chunk)
+                progress.downloaded += len(chunk)
+                if on_progress is not None:
+                    on_progress(progress)
+
+    size = os.path.getsize(part_path)
+    if size != length:
+        raise DownloadSizeMismatch(url, length, size)
+
+
+async def ranged_download(
+    client: httpx.AsyncClient,
+    url: str,
+    filepath: str,
+    connections: int = 4,
+    min_part_size: int = DEFAULT_MIN_PART_SIZE,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resume: bool = True,
+    headers: Optional[Dict[str, str]] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> int:
+    """
+    多连接分段下载大文件
+
+    先用 ``Range: bytes=0-0`` 探测文件大小；服务器支持范围请求且文件不小于
+    ``2 * min_part_size`` 时拆成最多 ``connections`` 段并发下载，各段写入
+    ``filepath + '.part<序号>'`` 并支持断点续传，全部完成后按顺序合并并原子重命名。
+    其余情况退回单连接的 ``stream_download``。
+
+    :param client: 复用的异步HTTP客户端，连接数上限应不小于 connections
+    :param url: 文件URL
+    :param filepath: 目标文件路径
+    :param connections: 最大并发连接数
+    :param min_part_size: 每段的最小字节数
+    :param chunk_size: 分块大小（字节）
+    :param resume: 是否续传已有的分段文件
+    :param headers: 额外请求头
+    :param on_progress: 进度回调，每写入一个分块调用一次
+    :return: 最终文件大小（字节）
+    """
+    headers = dict(headers or {})
+    total = await _probe_size(client, url, headers) if connections > 1 else None
+    if total is None or total < 2 * min_part_size:
+        return await stream_download(
+            client, url, filepath, chunk_size=chunk_size, resume=resume,
+            headers=headers, on_progress=on_progress,
+        )
+
+    ranges = _split_ranges(total, min(connections, total // min_part_size))
+    part_paths = [f"{filepath}{PART_SUFFIX}{index}" for index in range(len(ranges))]
+    if not resume:
+        for part_path in part_paths:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+
+    resumed = sum(
+        min(os.path.getsize(path), end - start + 1)
+        for path, (start, end) in zip(part_paths, ranges) if os.path.exists(path)
+    )
+    progress = DownloadProgress(url, total, resumed, resumed)
+    await asyncio.gather(*(
+        _download_range(client, url, part_path, start, end, chunk_size, headers, progress, on_progress)
+        for part_path, (start, end) in zip(part_paths, ranges)
+    ))
+
+    merged_path = filepath + PART_SUFFIX
+    await asyncio.to_thread(_merge_parts, part_paths, merged_path)
+    size = os.path.getsize(merged_path)
+    if size != total:
+        os.remove(merged_path)
+        raise DownloadSizeMismatch(url, total, size)
+    os.replace(merged_path, filepath)
+    return size
+
+
+def _merge_parts(part_paths: List[str], merged_path: str):
+    with open(merged_path, "wb") as merged:
+        for part_path in part_paths:
+            with open(part_path, "rb") as part:
+                shutil.copyfileobj(part, merged, 1024 * 1024)
+    for part_path in part_paths:
+        os.remove(part_path)
@@ -13,4 +13,10 @@ class VideoNotFoundError(TikTokDownloadError):
 class DownloadLimitError(TikTokDownloadError):
     """下载限制异常"""
     def __init__(self, reason):
-        super().__init__(f"视频下载受限: {reason}", error_code=20003)
\ No newline at end of file
+        super().__init__(f"视频下载受限: {reason}", error_code=20003)
+
+class TikTokCircuitOpenError(TikTokDownloadError):
+    """熔断器打开，请求被直接拒绝"""
+    def __init__(self, name, retry_after=0.0):
+        super().__init__(f"{name} 熔断中，{retry_after:.0f} 秒后重试", error_code=20004)
+        self.retry_after = retry_after
\ No newline at end of file
@@ -0,0 +1,275 @@
+import re
+import time
+import asyncio
+import inspect
+import threading
+from collections import deque
+from dataclasses import dataclass
+from statistics import median
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+# 链接类型
+XHS_NOTE = "xhs_note"
+XHS_SHORT = "xhs_short"
+DOUYIN_VIDEO = "douyin_video"
+DOUYIN_USER = "douyin_user"
+DOUYIN_SHORT = "douyin_short"
+TIKTOK = "tiktok"
+
+URL_KINDS = (XHS_NOTE, XHS_SHORT, DOUYIN_VIDEO, DOUYIN_USER, DOUYIN_SHORT, TIKTOK)
+
+# 所有链接类型合并为一个预编译正则，一次扫描完成分类；短链分支放在长链之前
+URL_PATTERN = re.compile(
+    r"https?://(?:"
+    r"(?P<xhs_short>xhslink\.com/(?:[a-z]/)?(?P<xhs_short_id>[A-Za-z0-9]+))"
+    r"|(?P<xhs_note>(?:www\.)?xiaohongshu\.com/(?:explore|discovery/item)/(?P<xhs_note_id>[0-9a-fA-F]{24}))"
+    r"|(?P<douyin_short>v\.douyin\.com/(?P<douyin_short_id>[A-Za-z0-9_-]+))"
+    r"|(?P<douyin_video>(?:www\.)?(?:douyin|iesdouyin)\.com/(?:video|note|share/video)/(?P<douyin_video_id>\d+))"
+    r"|(?P<douyin_user>(?:www\.)?douyin\.com/user/(?P<douyin_user_id>[A-Za-z0-9_-]+))"
+    r"|(?P<tiktok>(?:(?:vm|vt)\.tiktok\.com/(?P<tiktok_short_id>[A-Za-z0-9]+)"
+    r"|(?:www\.|m\.)?tiktok\.com/@[\w.-]+/(?:video|photo)/(?P<tiktok_id>\d+)))"
+    r")"
+)
+_URL_TAIL = re.compile(r"[^\s，。！]+")
+
+
+@dataclass(frozen=True)
+class URLMatch:
+    """链接分类结果"""
+    kind: str
+    id: str
+    url: str
+
+
+def classify(url: str) -> Optional[URLMatch]:
+    """
+    识别链接类型，分享文案中夹带的链接也可识别
+
+    :param url: 链接或包含链接的分享文本
+    :return: 分类结果，不支持的链接返回 None
+    """
+    text = url or ""
+    match = URL_PATTERN.search(text)
+    if match is None:
+        return None
+    # 保留查询参数（如小红书的 xsec_token），截取到下一个空白字符为止
+    full_url = _URL_TAIL.match(text, match.start()).group(0)
+    for kind in URL_KINDS:
+        if match.group(kind):
+            item_id = match.group(f"{kind}_id") if kind != TIKTOK else (
+                match.group("tiktok_id") or match.group("tiktok_short_id")
+            )
+            return URLMatch(kind, item_id or "", full_url)
+    return None
+
+
+class BackendStats:
+    """单个后端的滚动统计"""
+
+    def __init__(self, window: int):
+        # 最近 window 次调用的 (是否成功, 耗时)
+        self.samples: Deque[Tuple[bool, float]] = deque(maxlen=window)
+        self.calls = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+    @property
+    def success_rate(self) -> float:
+        """滚动成功率，尚无样本时视为 1"""
+        if not self.samples:
+            return 1.0
+        return sum(1 for ok, _ in self.samples if ok) / len(self.samples)
+
+    @property
+    def p50(self) -> Optional[float]:
+        """最近成功调用耗时的中位数（秒），尚无样本时为 None"""
+        values = [elapsed for ok, elapsed in self.samples if ok]
+        return median(values) if values else None
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+
+@dataclass
+class Backend:
+    """已注册的提取后端"""
+    name: str
+    func: Callable[[str], Any]
+    kinds: Tuple[str, ...]
+    order: int
+    stats: BackendStats
+    breaker: Any = None
+
+
+def _normalize(result: Any) -> Tuple[bool, str, Any]:
+    """
+    统一后端返回值
+
+    XHSService 返回 (success, msg, data)；其余后端返回数据或 None，None 与空结果视为失败。
+    """
+    if isinstance(result, tuple) and len(result) == 3 and isinstance(result[0], bool):
+        success, msg, data = result
+        return success and data is not None, msg, data
+    if not result:
+        return False, "未提取到内容", None
+    return True, "成功", result
+
+
+class URLRouter:
+    """
+    按链接类型分发到最快的健康后端
+
+    - 同一链接类型可注册多个后端，每次按滚动成功率（精度 0.1）从高到低、
+      p50 耗时从低到高排序，尚无样本的后端按注册顺序优先试用；
+    - 首选后端失败（返回失败、返回空结果或抛出异常）时依次尝试下一个；
+    - 连续失败 max_consecutive_failures 次的后端冷却 cooldown 秒，冷却期间排在最后，
+      只在其他后端都失败时兜底；
+    - 提供熔断器注册表时，每个后端另有一个熔断器（名称为 router:后端名称），
+      熔断中的后端直接跳过，不再兜底调用。
+
+    后端可以是同步或异步函数，接收链接，同步函数在线程池中执行。线程安全。
+    """
+
+    def __init__(self, window=50, max_consecutive_failures=3, cooldown=60.0, timeout=None, breakers=None):
+        """
+        :param window: 滚动统计的样本数
+        :param max_consecutive_failures: 连续失败多少次后冷却
+        :param cooldown: 冷却时长（秒）
+        :param timeout: 单个后端的超时（秒），None 表示不限
+        :param breakers: 可选的 BreakerRegistry，为每个后端创建熔断器
+        """
+        self.window = window
+        self.max_consecutive_failures = max_consecutive_failures
+        self.cooldown = cooldown
+        self.timeout = timeout
+        self.breakers = breakers
+        self._backends: List[Backend] = []
+        self._lock = threading.Lock()
+
+    def register(self, name: str, func: Callable[[str], Any], kinds: Iterable[str]) -> "URLRouter":
+        """
+        注册后端
+
+        :param name: 后端名称，需唯一
+        :param func: 提取函数，接收链接，返回数据、None 或 (success, msg, data)
+        :param kinds: 支持的链接类型
+        """
+        kinds = tuple(kinds)
+        unknown = set(kinds) - set(URL_KINDS)
+        if unknown:
+            raise ValueError(f"不支持的链接类型: {sorted(unknown)}，可选: {URL_KINDS}")
+        with self._lock:
+            if any(backend.name == name for backend in self._backends):
+                raise ValueError(f"后端已注册: {name}")
+            # 后端耗时差异大（如 yt-dlp），慢调用由排序与 timeout 处理，熔断只看失败
+            breaker = (
+                self.breakers.get(f"router:{name}", slow_call_seconds=None) if self.breakers is not None else None
+            )
+            self._backends.append(Backend(name, func, kinds, len(self._backends), BackendStats(self.window), breaker))
+        return self
+
+    @staticmethod
+    def _rank_key(backend: Backend):
+        stats = backend.stats
+        p50 = stats.p50
+        return (
+            not stats.healthy,
+            -round(stats.success_rate, 1),
+            p50 is not None,
+            p50 or 0.0,
+            backend.order,
+        )
+
+    def ranked(self, kind: str) -> List[Backend]:
+        """支持该链接类型的后端，按当前优先级排序"""
+        with self._lock:
+            candidates = [backend for backend in self._backends if kind in backend.kinds]
+            return sorted(candidates, key=self._rank_key)
+
+    def record(self, name: str, success: bool, elapsed: float):
+        """上报一次调用结果"""
+        with self._lock:
+            stats = next(backend.stats for backend in self._backends if backend.name == name)
+            stats.calls += 1
+            stats.samples.append((success, elapsed))
+            if success:
+                stats.consecutive_failures = 0
+                stats.cooldown_until = 0.0
+                return
+            stats.failures += 1
+            stats.consecutive_failures += 1
+            if stats.consecutive_failures >= self.max_consecutive_failures:
+                stats.cooldown_until = time.monotonic() + self.cooldown
+
+    async def _call(self, backend: Backend, url: str) -> Tuple[bool, str, Any]:
+        if inspect.iscoroutinefunction(backend.func):
+            call = backend.func(url)
+        else:
+            call = asyncio.to_thread(backend.func, url)
+        result = await asyncio.wait_for(call, self.timeout) if self.timeout else await call
+        if inspect.isawaitable(result):
+            result = await result
+        return _normalize(result)
+
+    async def route(self, url: str) -> Tuple[bool, str, Any]:
+        """
+        分类链接并依次调用后端，直到某个后端成功
+
+        Returns:
+            (success, msg, data)：成功时 msg 为 "后端名称: 信息"，全部失败时 msg 汇总各后端的错误
+        """
+        match = classify(url)
+        if match is None:
+            return False, f"不支持的链接: {url}", None
+        backends = self.ranked(match.kind)
+        if not backends:
+            return False, f"没有可处理 {match.kind} 链接的后端", None
+
+        errors = []
+        for backend in backends:
+            if backend.breaker is not None:
+                try:
+                    backend.breaker.allow()
+                except Exception as e:
+                    errors.append(f"{backend.name}: {e}")
+                    continue
+            start = time.monotonic()
+            try:
+                success, msg, data = await self._call(backend, match.url)
+            except asyncio.TimeoutError:
+                success, msg, data = False, "超时", None
+            except Exception as e:
+                success, msg, data = False, str(e) or type(e).__name__, None
+            except BaseException:
+                if backend.breaker is not None:
+                    backend.breaker.release()
+                raise
+            elapsed = time.monotonic() - start
+            self.record(backend.name, success, elapsed)
+            if backend.breaker is not None:
+                backend.breaker.record(success, elapsed)
+            if success:
+                return True, f"{backend.name}: {msg}", data
+            errors.append(f"{backend.name}: {msg}")
+        return False, "; ".join(errors), None
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """各后端的调用数、成功率、p50 耗时、冷却与熔断状态"""
+        with self._lock:
+            result = []
+            for backend in self._backends:
+                stats = backend.stats
+                p50 = stats.p50
+                result.append({
+                    "backend": backend.name,
+                    "kinds": list(backend.kinds),
+                    "calls": stats.calls,
+                    "failures": stats.failures,
+                    "success_rate": round(stats.success_rate, 4),
+                    "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                    "healthy": stats.healthy,
+                    "breaker": backend.breaker.state if backend.breaker is not None else None,
+                })
+            return result